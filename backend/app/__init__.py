@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import logging
 import os
 import struct
 import sys
@@ -15,7 +16,14 @@ from flask import Flask, Response
 from .config import load_config
 from .database import init_app as init_db, session_scope
 from .routes import register_blueprints
+from .services.assets import get_bundle, init_app as init_assets
+from .services.audit import install_pipeline, stop_pipeline
+from .services.compression import init_app as init_compression
 from .services.configuration import bootstrap_defaults
+from .services.events import init_app as init_events
+from .services.export_jobs import init_app as init_export_jobs
+from .services.group_commit import init_app as init_group_commit
+from .services.metrics import init_app as init_metrics
 
 
 def _resolve_frontend_dir() -> Path:
@@ -52,14 +60,23 @@ def create_app(config_name: str | None = None) -> Flask:
     config_object = load_config(config_name)
     app.config.from_object(config_object)
 
-    _configure_logging()
+    _configure_logging(app.config)
+    init_metrics(app)
     init_db(app)
     with session_scope() as session:
         bootstrap_defaults(session)
+    init_export_jobs(app)
+    init_group_commit(app)
+    init_events(app)
     register_blueprints(app)
+    init_assets(app, FRONTEND_DIR)
+    init_compression(app)
 
     @app.get("/")
     def index():
+        bundle = get_bundle()
+        if bundle is not None and bundle.index is not None:
+            return bundle.index.response()
         return app.send_static_file("index.html")
 
     @app.get("/favicon.ico")
@@ -71,9 +88,13 @@ def create_app(config_name: str | None = None) -> Flask:
     return app
 
 
-def _configure_logging() -> None:
-    """Configure structured logging for console output."""
+def _configure_logging(config) -> None:
+    """Configure console logging and the queued JSON-lines audit file.
+
+    Handlers run on a listener thread; request threads only enqueue records.
+    """
     log_level = os.getenv("APP_LOG_LEVEL", "INFO").upper()
+    stop_pipeline()
     dictConfig(
         {
             "version": 1,
@@ -96,6 +117,7 @@ def _configure_logging() -> None:
             },
         }
     )
+    install_pipeline(config, logging.getLogger().handlers[0])
 
 
 __all__ = ["create_app"]
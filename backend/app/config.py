@@ -45,6 +45,64 @@ def _default_sql_echo() -> bool:
     return os.getenv("SQL_ECHO", "0") not in {"0", "false", "False", "FALSE"}
 
 
+def _env_flag(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value not in {"0", "false", "False", "FALSE", ""}
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _env_str(name: str, default: str) -> str:
+    return os.getenv(name, default).strip()
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _default_audit_log_file() -> str:
+    override = os.getenv("AUDIT_LOG_FILE")
+    if override is not None:
+        return str(Path(override).expanduser().resolve()) if override.strip() else ""
+
+    return str((_default_database_path().parent / "logs" / "audit.jsonl").resolve())
+
+
+def _default_export_cache_dir() -> str:
+    override = os.getenv("EXPORT_CACHE_DIR")
+    if override:
+        return str(Path(override).expanduser().resolve())
+
+    return str((_default_database_path().parent / "exports").resolve())
+
+
+def _default_metrics_dir() -> str:
+    override = os.getenv("METRICS_DIR")
+    if override is not None:
+        return str(Path(override).expanduser().resolve()) if override.strip() else ""
+
+    return str((_default_database_path().parent / "metrics").resolve())
+
+
+def _default_archive_database_path() -> str:
+    override = os.getenv("ARCHIVE_DATABASE_PATH")
+    if override is not None:
+        return str(Path(override).expanduser().resolve()) if override.strip() else ""
+
+    database_path = _default_database_path()
+    return str(database_path.with_name(f"{database_path.stem}_archive{database_path.suffix}"))
+
+
 @dataclass
 class BaseConfig:
     """Base configuration shared across environments."""
@@ -57,6 +115,48 @@ class BaseConfig:
     PREFERRED_URL_SCHEME: str = "https"
     DATABASE_URL: str = field(default_factory=_default_database_url)
     SQL_ECHO: bool = field(default_factory=_default_sql_echo)
+    DATABASE_MODE: str = field(default_factory=lambda: _env_str("DATABASE_MODE", "shared"))
+    DATABASE_READ_POOL_SIZE: int = field(default_factory=lambda: _env_int("DATABASE_READ_POOL_SIZE", 4))
+    SQLITE_JOURNAL_MODE: str = field(default_factory=lambda: _env_str("SQLITE_JOURNAL_MODE", "WAL"))
+    SQLITE_SYNCHRONOUS: str = field(default_factory=lambda: _env_str("SQLITE_SYNCHRONOUS", "NORMAL"))
+    SQLITE_MMAP_SIZE: int = field(default_factory=lambda: _env_int("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))
+    # Negative values are KiB, so the default keeps a 64 MiB page cache per connection.
+    SQLITE_CACHE_SIZE: int = field(default_factory=lambda: _env_int("SQLITE_CACHE_SIZE", -64 * 1024))
+    SQLITE_TEMP_STORE: str = field(default_factory=lambda: _env_str("SQLITE_TEMP_STORE", "MEMORY"))
+    SQLITE_BUSY_TIMEOUT_MS: int = field(default_factory=lambda: _env_int("SQLITE_BUSY_TIMEOUT_MS", 5000))
+    # Cold rows live in a second SQLite file attached as "archive"; empty disables it.
+    ARCHIVE_DATABASE_PATH: str = field(default_factory=_default_archive_database_path)
+    ARCHIVE_AFTER_DAYS: int = field(default_factory=lambda: _env_int("ARCHIVE_AFTER_DAYS", 180))
+    ARCHIVE_BATCH_SIZE: int = field(default_factory=lambda: _env_int("ARCHIVE_BATCH_SIZE", 1000))
+    GROUP_COMMIT_ENABLED: bool = field(default_factory=lambda: _env_flag("GROUP_COMMIT_ENABLED", False))
+    GROUP_COMMIT_WINDOW_MS: int = field(default_factory=lambda: _env_int("GROUP_COMMIT_WINDOW_MS", 10))
+    GROUP_COMMIT_MAX_BATCH: int = field(default_factory=lambda: _env_int("GROUP_COMMIT_MAX_BATCH", 64))
+    AUDIT_LOG_FILE: str = field(default_factory=_default_audit_log_file)
+    AUDIT_LOG_LEVEL: str = field(default_factory=lambda: _env_str("AUDIT_LOG_LEVEL", "INFO"))
+    AUDIT_LOG_SAMPLE_RATE: float = field(default_factory=lambda: _env_float("AUDIT_LOG_SAMPLE_RATE", 1.0))
+    AUDIT_LOG_MAX_BYTES: int = field(default_factory=lambda: _env_int("AUDIT_LOG_MAX_BYTES", 10 * 1024 * 1024))
+    AUDIT_LOG_BACKUPS: int = field(default_factory=lambda: _env_int("AUDIT_LOG_BACKUPS", 5))
+    AUDIT_LOG_CONSOLE: bool = field(default_factory=lambda: _env_flag("AUDIT_LOG_CONSOLE", False))
+    BATCH_MAX_ITEMS: int = field(default_factory=lambda: _env_int("BATCH_MAX_ITEMS", 5000))
+    # Journal entries are compacted to the latest per record after CHANGES_COMPACT_AFTER_HOURS
+    # and purged after CHANGES_RETENTION_DAYS (manage.py compact-changes); 0 disables a step.
+    CHANGES_RETENTION_DAYS: int = field(default_factory=lambda: _env_int("CHANGES_RETENTION_DAYS", 30))
+    CHANGES_COMPACT_AFTER_HOURS: int = field(default_factory=lambda: _env_int("CHANGES_COMPACT_AFTER_HOURS", 24))
+    # How often each process polls the journal for /api/events subscribers.
+    EVENTS_POLL_MS: int = field(default_factory=lambda: _env_int("EVENTS_POLL_MS", 500))
+    EVENTS_HEARTBEAT_SECONDS: int = field(default_factory=lambda: _env_int("EVENTS_HEARTBEAT_SECONDS", 15))
+    EXPORT_WORKERS: int = field(default_factory=lambda: _env_int("EXPORT_WORKERS", 2))
+    EXPORT_CACHE_DIR: str = field(default_factory=_default_export_cache_dir)
+    EXPORT_CACHE_MAX_BYTES: int = field(default_factory=lambda: _env_int("EXPORT_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+    EXPORT_CACHE_MAX_FILES: int = field(default_factory=lambda: _env_int("EXPORT_CACHE_MAX_FILES", 64))
+    # Workers share /api/metrics samples through files here; empty keeps them per process.
+    METRICS_DIR: str = field(default_factory=_default_metrics_dir)
+    METRICS_FLUSH_SECONDS: int = field(default_factory=lambda: _env_int("METRICS_FLUSH_SECONDS", 5))
+    ASSET_PIPELINE_ENABLED: bool = field(default_factory=lambda: _env_flag("ASSET_PIPELINE_ENABLED", True))
+    ASSET_MINIFY: bool = field(default_factory=lambda: _env_flag("ASSET_MINIFY", True))
+    COMPRESSION_ENABLED: bool = field(default_factory=lambda: _env_flag("COMPRESSION_ENABLED", True))
+    COMPRESSION_MIN_SIZE: int = field(default_factory=lambda: _env_int("COMPRESSION_MIN_SIZE", 1024))
+    COMPRESSION_LEVEL: int = field(default_factory=lambda: _env_int("COMPRESSION_LEVEL", 6))
 
 
 @dataclass
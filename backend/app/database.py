@@ -2,41 +2,188 @@
 
 from __future__ import annotations
 
+import logging
+import os
+import threading
+import time
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Iterator
+from typing import Any, Dict, Iterator
 
 from flask import current_app
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
+_logger = logging.getLogger("integration.database")
+
+DATABASE_MODES = ("shared", "single_writer")
+
+# Schema name of the attached archive database.
+ARCHIVE_SCHEMA = "archive"
+
 _engine = None
 _SessionFactory: sessionmaker[Session] | None = None
+_read_engine = None
+_ReadSessionFactory: sessionmaker[Session] | None = None
+_writer_gate: "WriterGate | None" = None
+_archive_file: Path | None = None
+_database_file: Path | None = None
 
 
 class Base(DeclarativeBase):
     """Declarative base for ORM models."""
 
 
+class WriterGate:
+    """FIFO queue in front of the single writer connection.
+
+    Threads are served in arrival order; the gate records how many were
+    waiting and for how long so the writer can be sized from real traffic.
+    """
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._next_ticket = 0
+        self._serving = 0
+        self._owner: int | None = None
+        self._acquired_at = 0.0
+        self._max_queue_depth = 0
+        self._acquisitions = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._hold_total = 0.0
+        self._hold_max = 0.0
+
+    def acquire(self) -> None:
+        started = time.perf_counter()
+        with self._condition:
+            if self._owner == threading.get_ident():
+                raise RuntimeError("Sessão de escrita aninhada na mesma thread.")
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            self._max_queue_depth = max(self._max_queue_depth, ticket - self._serving)
+            while self._serving != ticket:
+                self._condition.wait()
+            self._owner = threading.get_ident()
+            self._acquired_at = time.perf_counter()
+            waited = self._acquired_at - started
+            self._acquisitions += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+
+    def release(self) -> None:
+        with self._condition:
+            held = time.perf_counter() - self._acquired_at
+            self._hold_total += held
+            self._hold_max = max(self._hold_max, held)
+            self._owner = None
+            self._serving += 1
+            self._condition.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            in_flight = self._next_ticket - self._serving
+            acquisitions = self._acquisitions or 1
+            return {
+                "queue_depth": max(in_flight - 1, 0),
+                "max_queue_depth": self._max_queue_depth,
+                "busy": in_flight > 0,
+                "acquisitions": self._acquisitions,
+                "wait_ms_avg": round(self._wait_total / acquisitions * 1000, 3),
+                "wait_ms_max": round(self._wait_max * 1000, 3),
+                "hold_ms_avg": round(self._hold_total / acquisitions * 1000, 3),
+                "hold_ms_max": round(self._hold_max * 1000, 3),
+            }
+
+
 def init_app(app) -> None:
-    """Initialise SQLAlchemy engine and session factory for the Flask app."""
-    global _engine, _SessionFactory
+    """Initialise SQLAlchemy engine and session factory for the Flask app.
+
+    In ``single_writer`` mode (SQLite files only) every :func:`session_scope`
+    queues for one dedicated writer connection, while :func:`read_scope`
+    uses a pool of read-only connections that never take the write lock.
+    """
+    global _engine, _SessionFactory, _read_engine, _ReadSessionFactory, _writer_gate, _archive_file, _database_file
 
     database_url: str = app.config["DATABASE_URL"]
     sql_echo: bool = bool(app.config.get("SQL_ECHO", False))
+    mode = str(app.config.get("DATABASE_MODE", "shared")).lower()
+    if mode not in DATABASE_MODES:
+        raise ValueError(f"DATABASE_MODE inválido: {mode}")
 
-    if database_url.startswith("sqlite"):
+    sqlite_file = _sqlite_file_path(database_url)
+    _database_file = sqlite_file
+    if sqlite_file is not None:
         _ensure_sqlite_path(database_url)
+    if mode == "single_writer" and sqlite_file is None:
+        _logger.warning("database_mode_fallback mode=shared reason=not_a_sqlite_file")
+        mode = "shared"
 
-    _engine = create_engine(database_url, echo=sql_echo, future=True)
+    archive_path = str(app.config.get("ARCHIVE_DATABASE_PATH") or "").strip()
+    _archive_file = Path(archive_path) if archive_path and sqlite_file is not None else None
+    if _archive_file is not None:
+        _archive_file.parent.mkdir(parents=True, exist_ok=True)
+
+    engine_options: Dict[str, Any] = {}
+    if mode == "single_writer":
+        engine_options = {"pool_size": 1, "max_overflow": 0}
+
+    _engine = create_engine(database_url, echo=sql_echo, future=True, **engine_options)
+    if _engine.dialect.name == "sqlite":
+        attachments = {ARCHIVE_SCHEMA: str(_archive_file)} if _archive_file is not None else {}
+        _install_sqlite_pragmas(_engine, _sqlite_pragmas(app.config), attachments)
     _SessionFactory = sessionmaker(bind=_engine, autoflush=False, expire_on_commit=False, future=True)
 
+    _read_engine = None
+    _ReadSessionFactory = None
+    _writer_gate = None
+    if mode == "single_writer":
+        _writer_gate = WriterGate()
+
     # Ensure models are imported so metadata is populated before create_all.
     from . import models  # noqa: F401
 
     Base.metadata.create_all(_engine)
     _run_schema_upgrades(_engine)
 
+    if mode == "single_writer":
+        # Created after the schema exists: read-only connections cannot create the file.
+        read_pragmas = {name: value for name, value in _sqlite_pragmas(app.config).items() if name != "journal_mode"}
+        read_pragmas["query_only"] = 1
+        _read_engine = create_engine(
+            f"sqlite:///file:{sqlite_file.as_posix()}?mode=ro&uri=true",
+            echo=sql_echo,
+            future=True,
+            pool_size=max(int(app.config.get("DATABASE_READ_POOL_SIZE", 4)), 1),
+            max_overflow=0,
+        )
+        read_attachments = {}
+        if _archive_file is not None:
+            read_attachments[ARCHIVE_SCHEMA] = f"file:{_archive_file.as_posix()}?mode=ro"
+        _install_sqlite_pragmas(_read_engine, read_pragmas, read_attachments)
+        _ReadSessionFactory = sessionmaker(bind=_read_engine, autoflush=False, expire_on_commit=False, future=True)
+
+    _logger.info("database_mode mode=%s", mode)
+
+
+def archive_attached() -> bool:
+    """Whether every connection has the archive database attached as ``archive``."""
+    return _archive_file is not None
+
+
+def archive_file() -> Path | None:
+    return _archive_file
+
+
+def database_files() -> Dict[tuple[str, str], Path]:
+    """The SQLite files in use with their write-ahead logs, keyed by ``(database, file)``."""
+    files: Dict[tuple[str, str], Path] = {}
+    for database, path in (("main", _database_file), (ARCHIVE_SCHEMA, _archive_file)):
+        if path is not None:
+            files[(database, "db")] = path
+            files[(database, "wal")] = path.with_name(f"{path.name}-wal")
+    return files
+
 
 def get_engine():
     if _engine is None:
@@ -54,6 +201,9 @@ def get_session_factory() -> sessionmaker[Session]:
 def session_scope() -> Iterator[Session]:
     """Provide a transactional scope for database operations."""
     session_factory = get_session_factory()
+    gate = _writer_gate
+    if gate is not None:
+        gate.acquire()
     session = session_factory()
     try:
         yield session
@@ -63,6 +213,59 @@ def session_scope() -> Iterator[Session]:
         raise
     finally:
         session.close()
+        if gate is not None:
+            gate.release()
+
+
+@contextmanager
+def read_scope() -> Iterator[Session]:
+    """Provide a session for queries that never write.
+
+    Uses the read-only pool in ``single_writer`` mode and behaves like
+    :func:`session_scope` otherwise.
+    """
+    if _ReadSessionFactory is None:
+        with session_scope() as session:
+            yield session
+        return
+
+    session = _ReadSessionFactory()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def database_stats() -> Dict[str, Any]:
+    """Expose writer queue and read pool usage for diagnostics."""
+    stats: Dict[str, Any] = {"mode": "single_writer" if _writer_gate is not None else "shared"}
+    if _writer_gate is not None:
+        stats["writer"] = _writer_gate.stats()
+    if _read_engine is not None:
+        pool = _read_engine.pool
+        stats["read_pool"] = {"size": pool.size(), "checked_out": pool.checkedout()}
+    return stats
+
+
+def _dispose_after_fork() -> None:
+    """Drop pooled connections inherited from the parent without closing them."""
+    for engine in (_engine, _read_engine):
+        if engine is not None:
+            engine.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_dispose_after_fork)
+
+
+def _sqlite_file_path(database_url: str) -> Path | None:
+    """Return the database file of a ``sqlite:///`` URL, ``None`` for memory or other backends."""
+    if not database_url.startswith("sqlite:///"):
+        return None
+    path = database_url.replace("sqlite:///", "", 1).split("?", 1)[0]
+    if not path or path == ":memory:" or path.startswith("file:"):
+        return None
+    return Path(path)
 
 
 def _ensure_sqlite_path(database_url: str) -> None:
@@ -79,8 +282,45 @@ def _ensure_sqlite_path(database_url: str) -> None:
         db_path.parent.mkdir(parents=True, exist_ok=True)
 
 
+def _sqlite_pragmas(config) -> Dict[str, Any]:
+    """Collect the per-connection pragmas from config; empty values are left at SQLite's default."""
+    pragmas = {
+        "busy_timeout": config.get("SQLITE_BUSY_TIMEOUT_MS"),
+        "journal_mode": config.get("SQLITE_JOURNAL_MODE"),
+        "synchronous": config.get("SQLITE_SYNCHRONOUS"),
+        "cache_size": config.get("SQLITE_CACHE_SIZE"),
+        "mmap_size": config.get("SQLITE_MMAP_SIZE"),
+        "temp_store": config.get("SQLITE_TEMP_STORE"),
+    }
+    return {name: value for name, value in pragmas.items() if value not in (None, "")}
+
+
+def _install_sqlite_pragmas(engine, pragmas: Dict[str, Any], attachments: Dict[str, str] | None = None) -> None:
+    """Apply ``pragmas`` and ``ATTACH`` each ``attachments`` file on every new pooled connection."""
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, _connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            # busy_timeout goes first so the journal_mode switch waits on a locked file.
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            for schema, filename in (attachments or {}).items():
+                cursor.execute(f"ATTACH DATABASE ? AS {schema}", (filename,))
+        finally:
+            cursor.close()
+
+    with engine.connect() as connection:
+        effective = {name: connection.exec_driver_sql(f"PRAGMA {name}").scalar() for name in pragmas}
+    _logger.info("sqlite_pragmas %s", " ".join(f"{name}={value}" for name, value in effective.items()))
+
+
 def _run_schema_upgrades(engine) -> None:
     """Apply idempotent schema tweaks required for newer releases."""
+    from .services.archive import install_archive
+    from .services.rollups import install_rollups
+    from .services.search import install_search_index
+
     if engine.dialect.name != "sqlite":
         return
 
@@ -91,3 +331,70 @@ def _run_schema_upgrades(engine) -> None:
             connection.execute(text("ALTER TABLE occurrence_records ADD COLUMN grau_label VARCHAR(128)"))
         if "motivo" not in column_names:
             connection.execute(text("ALTER TABLE occurrence_records ADD COLUMN motivo VARCHAR(64)"))
+        # Superseded by change_journal, which now feeds /api/events.
+        connection.execute(text("DROP TABLE IF EXISTS record_events"))
+
+        _ensure_autoincrement(connection)
+        _ensure_indexes(connection)
+        install_archive(connection)
+        install_rollups(connection)
+        install_search_index(connection)
+
+
+def _ensure_autoincrement(connection) -> None:
+    """Rebuild tables created before their model asked for ``AUTOINCREMENT``.
+
+    SQLite cannot add the keyword in place: the table is renamed, recreated
+    from the model and refilled with the same ids, all in one transaction.
+    Triggers on it are dropped with the old table and restored afterwards.
+    """
+    for table in Base.metadata.sorted_tables:
+        if not table.dialect_options["sqlite"]["autoincrement"]:
+            continue
+        sql = connection.execute(
+            text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": table.name}
+        ).scalar()
+        if sql is None or "AUTOINCREMENT" in sql.upper():
+            continue
+
+        if not connection.connection.dbapi_connection.in_transaction:
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+        triggers = connection.execute(
+            text("SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = :name"),
+            {"name": table.name},
+        ).all()
+        indexes = connection.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :name AND sql IS NOT NULL"),
+            {"name": table.name},
+        ).scalars().all()
+        for name, _ in triggers:
+            connection.exec_driver_sql(f'DROP TRIGGER "{name}"')
+        for name in indexes:
+            connection.exec_driver_sql(f'DROP INDEX "{name}"')
+        legacy = f"{table.name}_legacy"
+        connection.exec_driver_sql(f'ALTER TABLE "{table.name}" RENAME TO "{legacy}"')
+        table.create(connection)
+        columns = ", ".join(f'"{column.name}"' for column in table.columns)
+        connection.exec_driver_sql(f'INSERT INTO "{table.name}" ({columns}) SELECT {columns} FROM "{legacy}"')
+        connection.exec_driver_sql(f'DROP TABLE "{legacy}"')
+        for _, trigger_sql in triggers:
+            connection.exec_driver_sql(trigger_sql)
+        connection.execute(text(f'ANALYZE "{table.name}"'))
+        _logger.info("schema_table_rebuilt table=%s reason=autoincrement", table.name)
+
+
+def _ensure_indexes(connection) -> None:
+    """Create model indexes missing from tables that predate them.
+
+    ``create_all`` skips tables that already exist, indexes included.
+    """
+    created = []
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            if not connection.dialect.has_index(connection, table.name, index.name):
+                index.create(connection)
+                created.append(index.name)
+    if created:
+        # New indexes are invisible to the planner until the statistics are refreshed.
+        connection.execute(text("ANALYZE"))
+        _logger.info("schema_indexes_created %s", " ".join(created))
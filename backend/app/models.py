@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from datetime import date, datetime
 
-from sqlalchemy import Date, DateTime, Integer, String, Text
+from sqlalchemy import Date, DateTime, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .database import Base
@@ -25,6 +25,23 @@ class IntegrationRecord(Base):
     observacao: Mapped[str | None] = mapped_column(Text, nullable=True)
     submitted_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
 
+    # Date-leading and dimension+date indexes back the stats GROUP BY queries
+    # and the typed filters; matricula+submitted_at serves the collaborator
+    # history, equality+submitted_at the filtered listings in their default order.
+    # AUTOINCREMENT: archived rows keep their ids, which must never be reissued.
+    __table_args__ = (
+        Index("ix_integration_records_matricula_submitted_at", "matricula", "submitted_at"),
+        Index("ix_integration_records_data", "data"),
+        Index("ix_integration_records_submitted_at", "submitted_at"),
+        Index("ix_integration_records_setor_data", "setor", "data"),
+        Index("ix_integration_records_turno_data", "turno", "data"),
+        Index("ix_integration_records_supervisor_data", "supervisor", "data"),
+        Index("ix_integration_records_integracao_data", "integracao", "data"),
+        Index("ix_integration_records_setor_turno_submitted_at", "setor", "turno", "submitted_at"),
+        Index("ix_integration_records_cargo_submitted_at", "cargo", "submitted_at"),
+        {"sqlite_autoincrement": True},
+    )
+
 
 class OccurrenceRecord(Base):
     __tablename__ = "occurrence_records"
@@ -43,6 +60,81 @@ class OccurrenceRecord(Base):
     observacao: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
 
+    # Date-leading and dimension+date indexes back the stats GROUP BY queries
+    # and the typed filters (equality columns first, the range column last);
+    # matricula+created_at serves the collaborator history in time order.
+    # AUTOINCREMENT: archived rows keep their ids, which must never be reissued.
+    __table_args__ = (
+        Index("ix_occurrence_records_matricula_created_at", "matricula", "created_at"),
+        Index("ix_occurrence_records_created_at", "created_at"),
+        Index("ix_occurrence_records_setor_created_at", "setor", "created_at"),
+        Index("ix_occurrence_records_motivo_created_at", "motivo", "created_at"),
+        Index("ix_occurrence_records_grau_created_at", "grau", "created_at"),
+        Index("ix_occurrence_records_turno_created_at", "turno", "created_at"),
+        Index("ix_occurrence_records_supervisor_created_at", "supervisor", "created_at"),
+        Index("ix_occurrence_records_cargo_created_at", "cargo", "created_at"),
+        Index("ix_occurrence_records_setor_turno_created_at", "setor", "turno", "created_at"),
+        Index("ix_occurrence_records_setor_turno_grau", "setor", "turno", "grau"),
+        Index("ix_occurrence_records_volumes", "volumes"),
+        {"sqlite_autoincrement": True},
+    )
+
+
+class OccurrenceDailyRollup(Base):
+    """Occurrences counted per day and key dimensions; maintained by every write."""
+
+    __tablename__ = "occurrence_daily_rollups"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    setor: Mapped[str] = mapped_column(String(64), nullable=False)
+    turno: Mapped[str] = mapped_column(String(32), nullable=False)
+    motivo: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    grau: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    record_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    volume_sum: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_occurrence_daily_rollups_key", "day", "setor", "turno", "motivo", "grau"),
+    )
+
+
+class IntegrationDailyRollup(Base):
+    """Integrations counted per integration date, setor and status; maintained by every write."""
+
+    __tablename__ = "integration_daily_rollups"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    day: Mapped[date | None] = mapped_column(Date, nullable=True)
+    setor: Mapped[str] = mapped_column(String(64), nullable=False)
+    integracao: Mapped[str] = mapped_column(String(32), nullable=False)
+    record_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_integration_daily_rollups_key", "day", "setor", "integracao"),
+    )
+
+
+class ChangeJournalEntry(Base):
+    """One insert, update or delete of a record; appended in the transaction that made it."""
+
+    __tablename__ = "change_journal"
+
+    seq: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    dataset: Mapped[str] = mapped_column(String(32), nullable=False)
+    action: Mapped[str] = mapped_column(String(16), nullable=False)
+    record_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    data: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # AUTOINCREMENT: seq values are consumer cursors and must never be reused
+    # after purges. The record index serves compaction, created_at the purge.
+    __table_args__ = (
+        Index("ix_change_journal_record", "dataset", "record_id", "seq"),
+        Index("ix_change_journal_created_at", "created_at"),
+        {"sqlite_autoincrement": True},
+    )
+
 
 class ConfigEntry(Base):
     __tablename__ = "config_entries"
@@ -55,3 +147,11 @@ class ConfigEntry(Base):
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
 
     __table_args__ = ({"sqlite_autoincrement": True},)
+
+
+class DataVersion(Base):
+    __tablename__ = "data_versions"
+
+    scope: Mapped[str] = mapped_column(String(32), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
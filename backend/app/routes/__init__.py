@@ -4,7 +4,11 @@ from __future__ import annotations
 
 from flask import Flask
 
+from .changes import changes_bp
+from .collaborators import collaborators_bp
 from .configuration import configuration_bp
+from .events import events_bp
+from .exports import exports_bp
 from .integration import integration_bp
 from .occurrence import occurrence_bp
 from .system import system_bp
@@ -16,6 +20,10 @@ def register_blueprints(app: Flask) -> None:
     app.register_blueprint(integration_bp)
     app.register_blueprint(occurrence_bp)
     app.register_blueprint(configuration_bp)
+    app.register_blueprint(exports_bp)
+    app.register_blueprint(collaborators_bp)
+    app.register_blueprint(events_bp)
+    app.register_blueprint(changes_bp)
 
 
 __all__ = [
@@ -24,4 +32,8 @@ __all__ = [
     "system_bp",
     "occurrence_bp",
     "configuration_bp",
+    "exports_bp",
+    "collaborators_bp",
+    "events_bp",
+    "changes_bp",
 ]
@@ -0,0 +1,58 @@
+"""Delta sync over the change journal."""
+
+from __future__ import annotations
+
+from http import HTTPStatus
+from typing import Any
+
+from flask import Blueprint, jsonify, request
+
+from ..database import read_scope
+from ..services.http_cache import conditional
+from ..services.journal import JOURNAL_DATASETS, JournalGap, read_changes
+from ..services.versioning import INTEGRATION_SCOPE, JOURNAL_SCOPE, OCCURRENCE_SCOPE
+
+changes_bp = Blueprint("changes", __name__, url_prefix="/api/changes")
+
+_DATASETS = tuple(JOURNAL_DATASETS.values())
+
+
+@changes_bp.get("")
+@conditional(INTEGRATION_SCOPE, OCCURRENCE_SCOPE, JOURNAL_SCOPE)
+def list_changes() -> Any:
+    """Net changes after ``since`` in journal order.
+
+    Follow ``next_since`` while ``has_more`` is true. A ``since`` older than
+    the retained journal answers 410 with ``horizon``: reload the tables
+    (e.g. an export) and continue from the ``seq`` read before it.
+    """
+    since_param = request.args.get("since", default="0")
+    limit_param = request.args.get("limit", default="100")
+    datasets = [value.strip().lower() for value in request.args.getlist("dataset") if value.strip()]
+
+    try:
+        since = max(int(since_param), 0)
+    except (TypeError, ValueError):
+        return jsonify({"error": "Parâmetro 'since' inválido."}), HTTPStatus.BAD_REQUEST
+
+    try:
+        limit = max(min(int(limit_param), 1000), 1)
+    except (TypeError, ValueError):
+        limit = 100
+
+    if any(dataset not in _DATASETS for dataset in datasets):
+        return jsonify({"error": "Conjunto de dados inválido. Use: integration, occurrence."}), HTTPStatus.BAD_REQUEST
+
+    with read_scope() as session:
+        try:
+            page = read_changes(session, since, limit, datasets or _DATASETS)
+        except JournalGap as gap:
+            return jsonify({"error": str(gap), "horizon": gap.horizon}), HTTPStatus.GONE
+
+    payload = {
+        "since": since,
+        "next_since": page.next_since,
+        "has_more": page.has_more,
+        "changes": page.changes,
+    }
+    return jsonify(payload), HTTPStatus.OK
@@ -0,0 +1,156 @@
+"""Collaborator history across integrations and occurrences."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from http import HTTPStatus
+from math import ceil
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from flask import Blueprint, jsonify, request
+from sqlalchemy import func, literal, null, select, type_coerce, union_all
+
+from ..database import read_scope
+from ..models import IntegrationRecord, OccurrenceRecord
+from ..services.archive import archive_enabled, archive_table
+from ..services.http_cache import conditional
+from ..services.pagination import parse_flag
+from ..services.projection import Projection, execute_rows
+from ..services.records import (
+    INTEGRATION_COLUMNS,
+    OCCURRENCE_COLUMNS,
+    serialize_integration_record,
+    serialize_occurrence_record,
+)
+from ..services.versioning import INTEGRATION_SCOPE, OCCURRENCE_SCOPE
+
+collaborators_bp = Blueprint("collaborators", __name__, url_prefix="/api/collaborators")
+
+
+@dataclass(frozen=True)
+class _HistorySource:
+    dataset: str
+    projection: Projection
+    timestamp: Any
+    serialize: Callable[[Sequence[Any]], Dict[str, Any]]
+
+
+# Integrations are placed in time by when they were registered, like occurrences.
+_SOURCES = (
+    _HistorySource("integration", INTEGRATION_COLUMNS, IntegrationRecord.submitted_at, serialize_integration_record),
+    _HistorySource("occurrence", OCCURRENCE_COLUMNS, OccurrenceRecord.created_at, serialize_occurrence_record),
+)
+
+# Both UNION ALL arms select every field of either table in this order, padding
+# the ones their table lacks with typed NULLs so results convert uniformly.
+_HISTORY_FIELDS = tuple(dict.fromkeys(name for source in _SOURCES for name in source.projection.fields))
+
+_FIELD_TYPES: Dict[str, Any] = {}
+for _source in _SOURCES:
+    for _name, _column in zip(_source.projection.fields, _source.projection.columns):
+        _FIELD_TYPES.setdefault(_name, _column.type)
+
+# Row layout: dataset, timestamp, then ``_HISTORY_FIELDS``.
+_POSITIONS: Dict[str, Tuple[int, ...]] = {
+    source.dataset: tuple(2 + _HISTORY_FIELDS.index(name) for name in source.projection.fields) for source in _SOURCES
+}
+_SERIALIZERS = {source.dataset: source.serialize for source in _SOURCES}
+
+
+def _tables(source: _HistorySource, include_archive: bool) -> List[Any]:
+    model = source.projection.model
+    return [model.__table__, archive_table(model)] if include_archive else [model.__table__]
+
+
+def _branch(source: _HistorySource, rows, matricula: str):
+    present = {name: rows.c[name] for name in source.projection.fields}
+    return select(
+        literal(source.dataset).label("dataset"),
+        rows.c[source.timestamp.key].label("timestamp"),
+        *(
+            present[name].label(name) if name in present else type_coerce(null(), _FIELD_TYPES[name]).label(name)
+            for name in _HISTORY_FIELDS
+        ),
+    ).where(rows.c.matricula == matricula)
+
+
+def _history_item(row: Sequence[Any]) -> Dict[str, Any]:
+    dataset = row[0]
+    document = _SERIALIZERS[dataset](tuple(row[index] for index in _POSITIONS[dataset]))
+    return {"dataset": dataset, "timestamp": row[1].isoformat() if row[1] else None, **document}
+
+
+@collaborators_bp.get("/<matricula>/history")
+@conditional(INTEGRATION_SCOPE, OCCURRENCE_SCOPE)
+def collaborator_history(matricula: str) -> Any:
+    """Integrations and occurrences of one matricula, newest first, in one paginated query.
+
+    ``include_archive=true`` adds the archived rows of both tables to the same UNION ALL.
+    """
+    matricula = matricula.strip()
+    page_param = request.args.get("page", default="1")
+    size_param = request.args.get("page_size", default="10")
+    dataset_param = request.args.get("dataset", default="").strip().lower()
+    with_total = parse_flag(request.args.get("with_total"), default=True)
+    include_archive = parse_flag(request.args.get("include_archive"), default=False) and archive_enabled()
+
+    try:
+        page = max(int(page_param), 1)
+    except (TypeError, ValueError):
+        page = 1
+
+    try:
+        page_size = max(min(int(size_param), 50), 1)
+    except (TypeError, ValueError):
+        page_size = 10
+
+    sources = [source for source in _SOURCES if not dataset_param or source.dataset == dataset_param]
+    if not matricula:
+        return jsonify({"error": "Matrícula não informada."}), HTTPStatus.BAD_REQUEST
+    if not sources:
+        return jsonify({"error": "Conjunto de dados inválido. Use: integration, occurrence."}), HTTPStatus.BAD_REQUEST
+
+    with read_scope() as session:
+        total_items = None
+        total_pages = 0
+        if with_total:
+            counts_stmt = select(
+                *(
+                    select(func.count()).select_from(rows).where(rows.c.matricula == matricula).scalar_subquery()
+                    for source in sources
+                    for rows in _tables(source, include_archive)
+                )
+            )
+            total_items = sum(session.execute(counts_stmt).one())
+
+            total_pages = ceil(total_items / page_size) if total_items else 0
+            if total_pages:
+                page = min(page, total_pages)
+            else:
+                page = 1
+
+        offset = (page - 1) * page_size
+
+        branches = [
+            _branch(source, rows, matricula) for source in sources for rows in _tables(source, include_archive)
+        ]
+        data_stmt = union_all(*branches) if len(branches) > 1 else branches[0]
+        columns = data_stmt.selected_columns
+        data_stmt = data_stmt.order_by(columns.timestamp.desc(), columns.dataset, columns.id.desc())
+        data_stmt = data_stmt.offset(offset).limit(page_size + (0 if with_total else 1))
+        rows = execute_rows(session, data_stmt).all()
+
+    pagination: Dict[str, Any] = {"page": page, "page_size": page_size}
+    if with_total:
+        pagination["total_items"] = total_items
+        pagination["total_pages"] = total_pages or 1
+    else:
+        pagination["has_more"] = len(rows) > page_size
+        rows = rows[:page_size]
+
+    payload = {
+        "matricula": matricula,
+        "items": [_history_item(row) for row in rows],
+        "pagination": pagination,
+    }
+    return jsonify(payload), HTTPStatus.OK
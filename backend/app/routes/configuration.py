@@ -8,17 +8,23 @@ from typing import Any
 from flask import Blueprint, jsonify, request
 from sqlalchemy.exc import SQLAlchemyError
 
-from ..database import session_scope
-from ..services.configuration import get_snapshot, save_snapshot
+from ..database import read_scope, session_scope
+from ..services.configuration import get_config_version, get_snapshot, save_snapshot
+from ..services.http_cache import conditional
+from ..services.versioning import CONFIGURATION_SCOPE
 
 configuration_bp = Blueprint("configuration", __name__, url_prefix="/api/configuration")
 
 
 @configuration_bp.get("")
+@conditional(CONFIGURATION_SCOPE, cache_control="private, max-age=10, must-revalidate")
 def read_configuration() -> Any:
-    with session_scope() as session:
-        snapshot = get_snapshot(session)
-    return jsonify(snapshot), HTTPStatus.OK
+    with read_scope() as session:
+        version = get_config_version(session)
+        snapshot = get_snapshot(session, version)
+    response = jsonify(snapshot)
+    response.headers["X-Config-Version"] = str(version)
+    return response, HTTPStatus.OK
 
 
 @configuration_bp.post("")
@@ -33,6 +39,9 @@ def update_configuration() -> Any:
     try:
         with session_scope() as session:
             snapshot = save_snapshot(session, payload)
-        return jsonify(snapshot), HTTPStatus.OK
+            version = get_config_version(session)
+        response = jsonify(snapshot)
+        response.headers["X-Config-Version"] = str(version)
+        return response, HTTPStatus.OK
     except SQLAlchemyError:
         return jsonify({"error": "Erro ao atualizar configurações."}), HTTPStatus.INTERNAL_SERVER_ERROR
\ No newline at end of file
@@ -0,0 +1,63 @@
+"""Server-Sent Events stream of record changes."""
+
+from __future__ import annotations
+
+from http import HTTPStatus
+from typing import Any, Iterator
+
+from flask import Blueprint, Response, jsonify, request
+
+from ..serving import STREAM_HANDOFF
+from ..services.events import QueueSubscriber, SocketSubscriber, get_hub, replay
+from ..services.journal import JOURNAL_DATASETS
+
+events_bp = Blueprint("events", __name__, url_prefix="/api/events")
+
+_DATASETS = tuple(JOURNAL_DATASETS.values())
+
+# Reconnection delay suggested to EventSource, in milliseconds.
+_RETRY = b"retry: 3000\n\n"
+
+_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+@events_bp.get("")
+def stream_events() -> Any:
+    """Push ``created``/``updated``/``deleted`` events of both datasets as ``text/event-stream``.
+
+    ``dataset`` (repeatable) narrows the stream. A reconnecting client sends
+    ``Last-Event-ID`` (or ``last_event_id``) and first receives what it missed,
+    or a ``reset`` event when those events are no longer kept.
+    """
+    datasets = [value.strip().lower() for value in request.args.getlist("dataset") if value.strip()]
+    if any(dataset not in _DATASETS for dataset in datasets):
+        return jsonify({"error": "Conjunto de dados inválido. Use: integration, occurrence."}), HTTPStatus.BAD_REQUEST
+    datasets = datasets or list(_DATASETS)
+
+    raw_cursor = (request.headers.get("Last-Event-ID") or request.args.get("last_event_id") or "").strip()
+    try:
+        last_event_id = int(raw_cursor) if raw_cursor else None
+    except ValueError:
+        return jsonify({"error": "Last-Event-ID inválido."}), HTTPStatus.BAD_REQUEST
+
+    cursor, frames = replay(last_event_id, datasets)
+    opening = _RETRY + b"".join(frames)
+    hub = get_hub()
+
+    handoff = request.environ.get(STREAM_HANDOFF)
+    if handoff is not None:
+        handoff(lambda sock: hub.subscribe(SocketSubscriber(sock, cursor, datasets)))
+        # An iterable body: a bytes body would get a Content-Length and end the stream.
+        return Response(iter([opening]), mimetype="text/event-stream", headers=_HEADERS)
+
+    subscriber = QueueSubscriber(cursor, datasets)
+    hub.subscribe(subscriber)
+
+    def generate() -> Iterator[bytes]:
+        try:
+            yield opening
+            yield from subscriber.frames(timeout=1.0)
+        finally:
+            hub.unsubscribe(subscriber)
+
+    return Response(generate(), mimetype="text/event-stream", headers=_HEADERS)
@@ -0,0 +1,87 @@
+"""Background export job endpoints."""
+
+from __future__ import annotations
+
+from http import HTTPStatus
+from typing import Any
+
+from flask import Blueprint, jsonify, request, send_file
+from werkzeug.datastructures import MultiDict
+
+from ..services.export import STREAM_MIMETYPES, XLSX_MIMETYPE
+from ..services.export_jobs import get_manager
+from ..services.pagination import parse_flag
+
+exports_bp = Blueprint("exports", __name__, url_prefix="/api/exports")
+
+
+@exports_bp.post("")
+def create_export() -> Any:
+    """Queue an export, or return the cached result when nothing changed."""
+    payload = request.get_json(silent=True) if request.is_json else None
+    if not isinstance(payload, dict):
+        payload = request.form or request.args
+
+    dataset = str(payload.get("dataset") or "").strip().lower()
+    fmt = str(payload.get("format") or "xlsx").strip().lower()
+    search = str(payload.get("search") or "").strip()
+    default_sort = "submitted_at" if dataset == "integration" else "created_at"
+    sort_by = str(payload.get("sort_by") or default_sort)
+    sort_order = "asc" if str(payload.get("sort_order") or "desc").lower() == "asc" else "desc"
+    include_archive = parse_flag(str(payload.get("include_archive", "")), default=False)
+
+    try:
+        job = get_manager().submit(
+            dataset, fmt, search, sort_by, sort_order, _filter_args(payload), include_archive=include_archive
+        )
+    except ValueError as error:
+        return jsonify({"error": str(error)}), HTTPStatus.BAD_REQUEST
+    except RuntimeError as error:
+        return jsonify({"error": str(error)}), HTTPStatus.SERVICE_UNAVAILABLE
+
+    status_code = HTTPStatus.OK if job.status == "done" else HTTPStatus.ACCEPTED
+    return jsonify(_describe(job)), status_code
+
+
+@exports_bp.get("/<job_id>")
+def export_status(job_id: str) -> Any:
+    job = get_manager().get(job_id)
+    if job is None:
+        return jsonify({"error": "Exportação não encontrada."}), HTTPStatus.NOT_FOUND
+    return jsonify(_describe(job)), HTTPStatus.OK
+
+
+@exports_bp.get("/<job_id>/download")
+def download_export(job_id: str) -> Any:
+    manager = get_manager()
+    job = manager.get(job_id)
+    if job is None:
+        return jsonify({"error": "Exportação não encontrada."}), HTTPStatus.NOT_FOUND
+    if job.status != "done":
+        return jsonify({"error": "Exportação ainda não concluída.", "status": job.status}), HTTPStatus.CONFLICT
+
+    path = manager.open_result(job)
+    if not path.exists():
+        return jsonify({"error": "Arquivo de exportação expirou. Solicite novamente."}), HTTPStatus.GONE
+
+    mimetype = XLSX_MIMETYPE if job.fmt == "xlsx" else STREAM_MIMETYPES[job.fmt]
+    return send_file(path, mimetype=mimetype, as_attachment=True, download_name=job.filename)
+
+
+def _filter_args(payload: dict) -> MultiDict:
+    """Field filters may arrive as JSON lists (``{"setor": ["A", "B"]}``) or repeated keys."""
+    if isinstance(payload, MultiDict):
+        return payload
+    pairs = []
+    for key, value in payload.items():
+        for item in value if isinstance(value, list) else [value]:
+            if item is not None:
+                pairs.append((key, str(item)))
+    return MultiDict(pairs)
+
+
+def _describe(job) -> dict:
+    document = job.to_dict()
+    document["status_url"] = f"/api/exports/{job.job_id}"
+    document["download_url"] = f"/api/exports/{job.job_id}/download" if job.status == "done" else None
+    return document
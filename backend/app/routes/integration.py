@@ -2,31 +2,57 @@
 
 from __future__ import annotations
 
+import logging
 from datetime import datetime
-from io import BytesIO
 from http import HTTPStatus
 from math import ceil
-from typing import Any, Dict, List
+from typing import IO, Any, Dict, Iterable, List, Sequence, Tuple
 
-from flask import Blueprint, jsonify, request, send_file
-from openpyxl import Workbook
-from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
-from openpyxl.utils import get_column_letter
-from sqlalchemy import func, or_, select
+from flask import Blueprint, current_app, jsonify, request
+from sqlalchemy import func, select
 from sqlalchemy.exc import SQLAlchemyError
 
-from ..database import session_scope
-from ..services.configuration import get_snapshot
+from ..database import read_scope, session_scope
+from ..services.archive import archive_enabled, archived_select, with_archive
+from ..services.configuration import get_config_version, get_snapshot, options_payload
+from ..services.export import (
+    EXPORT_CHUNK_SIZE,
+    STREAM_MIMETYPES,
+    SheetLayout,
+    send_spreadsheet,
+    stream_records,
+    write_workbook,
+)
+from ..services.export_jobs import ExportDataset, register_dataset
+from ..services.filters import NO_FILTERS, FilterSet, RecordFilters
+from ..services.group_commit import GroupCommitTimeout, get_committer
+from ..services.http_cache import conditional
+from ..services.importer import import_file
+from ..services.metrics import observe_export
+from ..services.pagination import KeysetCursor, apply_keyset, parse_flag
+from ..services.projection import execute_rows
+from ..services.records import INTEGRATION_COLUMNS, INTEGRATION_FIELDS, serialize_integration_record
+from ..services.search import SEARCH_INDEXES, build_search_filters, order_by_relevance
+from ..services.stats import StatsDataset, aggregate, parse_query
+from ..services.versioning import CONFIGURATION_SCOPE, INTEGRATION_SCOPE
 from ..services.ingestion import (
+    BatchValidationError,
     build_envelope,
+    delete_integration_record,
     log_envelope,
     persist_integration,
+    persist_integration_batch,
     update_integration_record,
 )
-from ..models import IntegrationRecord
+from ..models import IntegrationDailyRollup, IntegrationRecord
+
+_batch_logger = logging.getLogger("integration.batch")
 
 integration_bp = Blueprint("integration", __name__, url_prefix="/api/integration")
 
+# Option lists change rarely; let browsers reuse them briefly before revalidating.
+_OPTIONS_CACHE_CONTROL = "private, max-age=10, must-revalidate"
+
 
 _SORTABLE_FIELDS = {
     "id": IntegrationRecord.id,
@@ -42,22 +68,43 @@ _SORTABLE_FIELDS = {
 }
 
 
-def _build_integration_filters(search_term: str) -> List[Any]:
-    filters: List[Any] = []
-    if search_term:
-        like_pattern = f"%{search_term}%"
-        filters.append(
-            or_(
-                IntegrationRecord.matricula.ilike(like_pattern),
-                IntegrationRecord.nome.ilike(like_pattern),
-                IntegrationRecord.setor.ilike(like_pattern),
-                IntegrationRecord.cargo.ilike(like_pattern),
-                IntegrationRecord.turno.ilike(like_pattern),
-                IntegrationRecord.integracao.ilike(like_pattern),
-                IntegrationRecord.supervisor.ilike(like_pattern),
-            )
-        )
-    return filters
+# The ILIKE fallback (no FTS5, archived rows) searches exactly the indexed columns.
+_SEARCH_FALLBACK_COLUMNS = tuple(
+    getattr(IntegrationRecord, name) for name in SEARCH_INDEXES[IntegrationRecord.__tablename__]
+)
+
+
+_FILTERS = FilterSet(
+    exact={
+        "setor": IntegrationRecord.setor,
+        "cargo": IntegrationRecord.cargo,
+        "turno": IntegrationRecord.turno,
+        "supervisor": IntegrationRecord.supervisor,
+        "integracao": IntegrationRecord.integracao,
+    },
+    dates={
+        "data": IntegrationRecord.data,
+        "submitted_at": IntegrationRecord.submitted_at,
+    },
+    normalize={"supervisor": str.upper},
+)
+
+
+def _build_integration_filters(
+    search_term: str, record_filters: RecordFilters = NO_FILTERS, *, indexed: bool = True
+) -> List[Any]:
+    filters = build_search_filters(IntegrationRecord, search_term, _SEARCH_FALLBACK_COLUMNS, indexed=indexed)
+    return filters + _FILTERS.clauses(record_filters)
+
+
+def _apply_sort(stmt, sort_by: str, sort_order: str, search_term: str, default_column):
+    if sort_by == "relevance" and search_term:
+        ranked = order_by_relevance(stmt, IntegrationRecord, search_term)
+        if ranked is not None:
+            return ranked
+    sort_column = _SORTABLE_FIELDS.get(sort_by, default_column)
+    order_clause = sort_column.asc() if sort_order.lower() == "asc" else sort_column.desc()
+    return stmt.order_by(order_clause)
 
 
 def _format_date(value) -> str:
@@ -72,23 +119,25 @@ def _format_datetime(value) -> str:
     return value.strftime("%d/%m/%Y %H:%M")
 
 
-def _auto_fit_columns(sheet) -> None:
-    for index, column in enumerate(sheet.columns, start=1):
-        max_length = 0
-        for cell in column:
-            value = cell.value
-            length = len(str(value)) if value is not None else 0
-            max_length = max(max_length, length)
-        adjusted = min(max_length + 4, 48)
-        sheet.column_dimensions[get_column_letter(index)].width = max(adjusted, 12)
+def _isoformat(value) -> str | None:
+    return value.isoformat() if value else None
 
 
-def _build_integration_workbook(records: List[IntegrationRecord]) -> BytesIO:
-    workbook = Workbook()
-    sheet = workbook.active
-    sheet.title = "Integrações"
+def _or_blank(value) -> Any:
+    return value or ""
 
-    headers = [
+
+_integration_record_values = INTEGRATION_COLUMNS.row_mapper(
+    *INTEGRATION_FIELDS[:8],
+    ("data", _isoformat),
+    "observacao",
+    ("submitted_at", _isoformat),
+)
+
+
+_INTEGRATION_SHEET = SheetLayout(
+    title="Integrações",
+    headers=(
         "ID",
         "Matrícula",
         "Colaborador",
@@ -100,68 +149,37 @@ def _build_integration_workbook(records: List[IntegrationRecord]) -> BytesIO:
         "Data integração",
         "Observação",
         "Registrado em",
-    ]
-    sheet.append(headers)
-
-    for record in records:
-        sheet.append(
-            [
-                record.id,
-                record.matricula or "",
-                record.nome,
-                record.setor,
-                record.cargo,
-                record.turno,
-                record.integracao,
-                record.supervisor,
-                _format_date(record.data),
-                record.observacao or "",
-                _format_datetime(record.submitted_at),
-            ]
-        )
-
-    header_font = Font(bold=True, color="FFFFFFFF")
-    header_fill = PatternFill(fill_type="solid", fgColor="2563EB")
-    header_alignment = Alignment(vertical="center", horizontal="left")
-    thin = Side(style="thin", color="D1D5DB")
-    border = Border(left=thin, right=thin, top=thin, bottom=thin)
-
-    for cell in sheet[1]:
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = header_alignment
-        cell.border = border
-
-    for row in sheet.iter_rows(min_row=2):
-        for cell in row:
-            cell.alignment = Alignment(vertical="top", wrap_text=True)
-            cell.border = border
+    ),
+    header_color="2563EB",
+)
 
-    sheet.freeze_panes = "A2"
-    sheet.auto_filter.ref = f"A1:{get_column_letter(sheet.max_column)}1"
-    _auto_fit_columns(sheet)
 
-    stream = BytesIO()
-    workbook.save(stream)
-    stream.seek(0)
-    return stream
+_integration_sheet_row = INTEGRATION_COLUMNS.row_mapper(
+    "id",
+    ("matricula", _or_blank),
+    "nome",
+    "setor",
+    "cargo",
+    "turno",
+    "integracao",
+    "supervisor",
+    ("data", _format_date),
+    ("observacao", _or_blank),
+    ("submitted_at", _format_datetime),
+)
 
 
-def _send_workbook(stream: BytesIO, filename: str):
-    """Return a Flask file response compatible with older Flask releases."""
-    mimetype = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    try:
-        return send_file(stream, mimetype=mimetype, as_attachment=True, download_name=filename)
-    except TypeError:
-        stream.seek(0)
-        return send_file(stream, mimetype=mimetype, as_attachment=True, attachment_filename=filename)
+def _build_integration_workbook(records: Iterable[Sequence[Any]]) -> IO[bytes]:
+    return write_workbook(_INTEGRATION_SHEET, (_integration_sheet_row(record) for record in records))
 
 
 @integration_bp.get("")
+@conditional(CONFIGURATION_SCOPE, cache_control=_OPTIONS_CACHE_CONTROL)
 def describe_submission() -> Any:
     """Expose metadata about the integration submission endpoint."""
-    with session_scope() as session:
-        options = get_snapshot(session).get("integration", {})
+    with read_scope() as session:
+        options_version = get_config_version(session)
+        options = get_snapshot(session, options_version).get("integration", {})
 
     payload = {
         "service": "integration-backend",
@@ -171,6 +189,7 @@ def describe_submission() -> Any:
         "content_type": "application/json",
         "payload_expectation": "Objeto JSON com dados de colaboradores e metadados opcionais.",
         "options": options,
+        "options_version": options_version,
     }
 
     return jsonify(payload), HTTPStatus.OK
@@ -181,25 +200,97 @@ def export_records() -> Any:
     search_param = request.args.get("search", default="").strip()
     sort_by_param = request.args.get("sort_by", default="submitted_at")
     sort_order_param = request.args.get("sort_order", default="desc")
+    format_param = request.args.get("format", default="xlsx").strip().lower()
 
-    with session_scope() as session:
-        filters = _build_integration_filters(search_param)
-        data_stmt = select(IntegrationRecord)
+    if format_param != "xlsx" and format_param not in STREAM_MIMETYPES:
+        return jsonify({"error": "Formato de exportação inválido."}), HTTPStatus.BAD_REQUEST
 
-        if filters:
-            data_stmt = data_stmt.where(*filters)
+    try:
+        record_filters = _FILTERS.parse(request.args)
+    except ValueError as error:
+        return jsonify({"error": str(error)}), HTTPStatus.BAD_REQUEST
+    include_archive = parse_flag(request.args.get("include_archive"), default=False)
+
+    data_stmt = _records_statement(search_param, sort_by_param, sort_order_param, record_filters, include_archive)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+
+    if format_param in STREAM_MIMETYPES:
+        return stream_records(
+            format_param,
+            data_stmt,
+            columns=_INTEGRATION_SHEET.headers,
+            to_row=_integration_sheet_row,
+            to_document=serialize_integration_record,
+            filename=f"integracoes_{timestamp}.{format_param}",
+            dataset="integration",
+        )
+
+    with observe_export("integration", "xlsx") as export, read_scope() as session:
+        records = execute_rows(session, data_stmt, yield_per=EXPORT_CHUNK_SIZE)
+        stream = _build_integration_workbook(export.track(records))
 
-        sort_column = _SORTABLE_FIELDS.get(sort_by_param, IntegrationRecord.submitted_at)
-        sort_order = sort_order_param.lower()
-        order_clause = sort_column.asc() if sort_order == "asc" else sort_column.desc()
-        data_stmt = data_stmt.order_by(order_clause)
+    filename = f"integracoes_{timestamp}.xlsx"
 
-        records = session.execute(data_stmt).scalars().all()
+    return send_spreadsheet(stream, filename)
 
-    stream = _build_integration_workbook(records)
-    filename = f"integracoes_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
 
-    return _send_workbook(stream, filename)
+_ROLLUP_STATS = StatsDataset(
+    name="integration",
+    model=IntegrationDailyRollup,
+    time_column=IntegrationDailyRollup.day,
+    dimensions={
+        "setor": IntegrationDailyRollup.setor,
+        "integracao": IntegrationDailyRollup.integracao,
+    },
+    count=func.coalesce(func.sum(IntegrationDailyRollup.record_count), 0),
+)
+
+_STATS = StatsDataset(
+    name="integration",
+    model=IntegrationRecord,
+    time_column=IntegrationRecord.data,
+    dimensions={
+        "setor": IntegrationRecord.setor,
+        "integracao": IntegrationRecord.integracao,
+        "turno": IntegrationRecord.turno,
+        "supervisor": IntegrationRecord.supervisor,
+        "cargo": IntegrationRecord.cargo,
+    },
+    rollup=_ROLLUP_STATS,
+)
+
+
+@integration_bp.get("/stats")
+@conditional(INTEGRATION_SCOPE)
+def integration_stats() -> Any:
+    """Counts grouped by dimensions and/or buckets of the integration date, optionally pivoted."""
+    try:
+        query = parse_query(_STATS, request.args)
+    except ValueError as error:
+        return jsonify({"error": str(error)}), HTTPStatus.BAD_REQUEST
+
+    with read_scope() as session:
+        payload = aggregate(session, _STATS, query)
+    return jsonify(payload), HTTPStatus.OK
+
+
+def _records_statement(
+    search_term: str,
+    sort_by: str,
+    sort_order: str,
+    record_filters: RecordFilters = NO_FILTERS,
+    include_archive: bool = False,
+):
+    data_stmt = INTEGRATION_COLUMNS.select()
+    filters = _build_integration_filters(search_term, record_filters)
+    if filters:
+        data_stmt = data_stmt.where(*filters)
+    if include_archive and archive_enabled():
+        # Archived rows are not in the search index, so their half matches with ilike.
+        archived_filters = _build_integration_filters(search_term, record_filters, indexed=False)
+        archived = archived_select(IntegrationRecord, INTEGRATION_COLUMNS.columns, archived_filters)
+        return with_archive(data_stmt, archived, sort_by if sort_by in _SORTABLE_FIELDS else "submitted_at", sort_order)
+    return _apply_sort(data_stmt, sort_by, sort_order, search_term, IntegrationRecord.submitted_at)
 
 
 @integration_bp.post("")
@@ -213,11 +304,17 @@ def accept_submission() -> Any:
         return jsonify({"error": "Não foi possível interpretar os dados enviados."}), HTTPStatus.BAD_REQUEST
 
     try:
-        with session_scope() as session:
-            record = persist_integration(session, payload)
-            options = get_snapshot(session).get("integration", {})
-            envelope = build_envelope(_record_payload(record), origin="frontend")
-            log_envelope(envelope, record_id=record.id)
+        committer = get_committer()
+        if committer is not None:
+            record = committer.submit(persist_integration, payload)
+            with read_scope() as session:
+                options = options_payload(session, "integration", request.args.get("options_version"))
+        else:
+            with session_scope() as session:
+                record = persist_integration(session, payload)
+                options = options_payload(session, "integration", request.args.get("options_version"))
+        envelope = build_envelope(_record_payload(record), origin="frontend")
+        log_envelope(envelope, record_id=record.id)
 
         return (
             jsonify(
@@ -226,17 +323,82 @@ def accept_submission() -> Any:
                     "record_id": record.id,
                     "submission_id": envelope.submission_id,
                     "received_at": envelope.received_at.isoformat(),
-                    "options": options,
+                    **options,
                 }
             ),
             HTTPStatus.ACCEPTED,
         )
     except ValueError as error:
         return jsonify({"error": str(error)}), HTTPStatus.BAD_REQUEST
+    except GroupCommitTimeout:
+        return jsonify({"error": "Servidor ocupado. Tente novamente em instantes."}), HTTPStatus.SERVICE_UNAVAILABLE
     except SQLAlchemyError:
         return jsonify({"error": "Erro ao salvar a integração."}), HTTPStatus.INTERNAL_SERVER_ERROR
 
 
+@integration_bp.post("/batch")
+def accept_batch() -> Any:
+    """Store many payloads in one transaction with per-item results.
+
+    ``mode=atomic`` (default) rejects the batch if any item is invalid;
+    ``mode=best_effort`` stores the valid items and reports the others.
+    """
+    items, atomic, error_response = _extract_batch()
+    if error_response is not None:
+        return error_response
+
+    try:
+        with session_scope() as session:
+            results = persist_integration_batch(session, items, atomic=atomic)
+            options = options_payload(session, "integration", request.args.get("options_version"))
+    except BatchValidationError as error:
+        return (
+            jsonify({"status": "rejected", "mode": "atomic", "error": str(error), "errors": error.results}),
+            HTTPStatus.BAD_REQUEST,
+        )
+    except SQLAlchemyError:
+        return jsonify({"error": "Erro ao salvar o lote de integrações."}), HTTPStatus.INTERNAL_SERVER_ERROR
+
+    errors = [result for result in results if result["status"] == "error"]
+    _batch_logger.info(
+        "integration_batch items=%s created=%s errors=%s mode=%s",
+        len(results),
+        len(results) - len(errors),
+        len(errors),
+        "atomic" if atomic else "best_effort",
+    )
+    return (
+        jsonify(
+            {
+                "status": "partial" if errors else "accepted",
+                "mode": "atomic" if atomic else "best_effort",
+                "created": len(results) - len(errors),
+                "failed": len(errors),
+                "results": results,
+                **options,
+            }
+        ),
+        HTTPStatus.MULTI_STATUS if errors else HTTPStatus.ACCEPTED,
+    )
+
+
+@integration_bp.post("/import")
+def import_records() -> Any:
+    """Import an exported XLSX/CSV file; rows already stored are skipped."""
+    upload = request.files.get("file")
+    if upload is None or not upload.filename:
+        return jsonify({"error": "Envie o arquivo no campo 'file'."}), HTTPStatus.BAD_REQUEST
+
+    try:
+        report = import_file("integration", upload.stream, upload.filename)
+    except ValueError as error:
+        return jsonify({"error": str(error)}), HTTPStatus.BAD_REQUEST
+    except SQLAlchemyError:
+        return jsonify({"error": "Erro ao importar integrações."}), HTTPStatus.INTERNAL_SERVER_ERROR
+
+    return jsonify({"status": "imported", **report.to_dict()}), HTTPStatus.OK
+
+
 @integration_bp.put("/records/<int:record_id>")
 def update_record(record_id: int) -> Any:
     payload = _extract_payload()
@@ -250,7 +412,7 @@ def update_record(record_id: int) -> Any:
                 return jsonify({"error": "Registro de integração não encontrado."}), HTTPStatus.NOT_FOUND
 
             updated_record = update_integration_record(session, record, payload)
-            options = get_snapshot(session).get("integration", {})
+            options = options_payload(session, "integration", request.args.get("options_version"))
             envelope = build_envelope(_record_payload(updated_record), origin="frontend")
             log_envelope(envelope, record_id=updated_record.id)
 
@@ -259,7 +421,7 @@ def update_record(record_id: int) -> Any:
                 {
                     "status": "updated",
                     "record_id": record_id,
-                    "options": options,
+                    **options,
                 }
             ),
             HTTPStatus.OK,
@@ -278,7 +440,7 @@ def delete_record(record_id: int) -> Any:
             if record is None:
                 return jsonify({"error": "Registro de integração não encontrado."}), HTTPStatus.NOT_FOUND
 
-            session.delete(record)
+            delete_integration_record(session, record)
 
         return jsonify({"status": "deleted", "record_id": record_id}), HTTPStatus.OK
     except SQLAlchemyError:
@@ -286,12 +448,15 @@ def delete_record(record_id: int) -> Any:
 
 
 @integration_bp.get("/records")
+@conditional(INTEGRATION_SCOPE)
 def list_records() -> Any:
     page_param = request.args.get("page", default="1")
     size_param = request.args.get("page_size", default="10")
     sort_by_param = request.args.get("sort_by", default="submitted_at")
     sort_order_param = request.args.get("sort_order", default="desc")
     search_param = request.args.get("search", default="").strip()
+    cursor_param = request.args.get("cursor")
+    with_total = parse_flag(request.args.get("with_total"), default=True)
 
     try:
         page = max(int(page_param), 1)
@@ -303,60 +468,134 @@ def list_records() -> Any:
     except (TypeError, ValueError):
         page_size = 10
 
-    with session_scope() as session:
-        filters = _build_integration_filters(search_param)
+    try:
+        record_filters = _FILTERS.parse(request.args)
+    except ValueError as error:
+        return jsonify({"error": str(error)}), HTTPStatus.BAD_REQUEST
+
+    format_param = request.args.get("format", default="json").strip().lower()
+    if format_param in STREAM_MIMETYPES:
+        data_stmt = _records_statement(search_param, sort_by_param, sort_order_param, record_filters)
+        return stream_records(
+            format_param,
+            data_stmt,
+            columns=INTEGRATION_FIELDS,
+            to_row=_integration_record_values,
+            to_document=serialize_integration_record,
+        )
+    if format_param != "json":
+        return jsonify({"error": "Formato de listagem inválido."}), HTTPStatus.BAD_REQUEST
+
+    if cursor_param is not None:
+        return _list_keyset_page(
+            cursor_param, page_size, sort_by_param, sort_order_param, search_param, record_filters, with_total
+        )
+
+    with read_scope() as session:
+        filters = _build_integration_filters(search_param, record_filters)
 
         count_stmt = select(func.count()).select_from(IntegrationRecord)
-        data_stmt = select(IntegrationRecord)
+        data_stmt = INTEGRATION_COLUMNS.select()
 
         if filters:
             count_stmt = count_stmt.where(*filters)
             data_stmt = data_stmt.where(*filters)
 
-        total_items = session.execute(count_stmt).scalar_one()
+        total_items = None
+        total_pages = 0
+        if with_total:
+            total_items = session.execute(count_stmt).scalar_one()
 
-        total_pages = ceil(total_items / page_size) if total_items else 0
-        if total_pages:
-            page = min(page, total_pages)
-        else:
-            page = 1
+            total_pages = ceil(total_items / page_size) if total_items else 0
+            if total_pages:
+                page = min(page, total_pages)
+            else:
+                page = 1
 
         offset = (page - 1) * page_size
 
-        sort_column = _SORTABLE_FIELDS.get(sort_by_param, IntegrationRecord.submitted_at)
-        sort_order = sort_order_param.lower()
-        order_clause = sort_column.asc() if sort_order == "asc" else sort_column.desc()
+        data_stmt = _apply_sort(data_stmt, sort_by_param, sort_order_param, search_param, IntegrationRecord.submitted_at)
+        data_stmt = data_stmt.offset(offset).limit(page_size + (0 if with_total else 1))
+        records = execute_rows(session, data_stmt).all()
 
-        data_stmt = data_stmt.order_by(order_clause).offset(offset).limit(page_size)
-        records = session.execute(data_stmt).scalars().all()
+    pagination: Dict[str, Any] = {"page": page, "page_size": page_size}
+    if with_total:
+        pagination["total_items"] = total_items
+        pagination["total_pages"] = total_pages or 1
+    else:
+        pagination["has_more"] = len(records) > page_size
+        records = records[:page_size]
 
     payload = {
-        "items": [_serialize_integration_record(record) for record in records],
-        "pagination": {
-            "page": page,
-            "page_size": page_size,
-            "total_items": total_items,
-            "total_pages": total_pages or 1,
-        },
+        "items": [serialize_integration_record(record) for record in records],
+        "pagination": pagination,
     }
 
     return jsonify(payload), HTTPStatus.OK
 
 
-def _serialize_integration_record(record: IntegrationRecord) -> Dict[str, Any]:
-    return {
-        "id": record.id,
-        "matricula": record.matricula,
-        "nome": record.nome,
-        "setor": record.setor,
-        "cargo": record.cargo,
-        "turno": record.turno,
-        "integracao": record.integracao,
-        "supervisor": record.supervisor,
-        "data": record.data.isoformat() if record.data else None,
-        "observacao": record.observacao,
-        "submitted_at": record.submitted_at.isoformat(),
+def _list_keyset_page(
+    cursor_token: str,
+    page_size: int,
+    sort_by: str,
+    sort_order: str,
+    search_term: str,
+    record_filters: RecordFilters,
+    with_total: bool,
+) -> Any:
+    """Serve a page positioned by an opaque cursor instead of an offset."""
+    if sort_by not in _SORTABLE_FIELDS:
+        sort_by = "submitted_at"
+    sort_order = "asc" if sort_order.lower() == "asc" else "desc"
+    sort_column = _SORTABLE_FIELDS[sort_by]
+
+    cursor = None
+    if cursor_token:
+        try:
+            cursor = KeysetCursor.decode(cursor_token, sort_column)
+        except ValueError as error:
+            return jsonify({"error": str(error)}), HTTPStatus.BAD_REQUEST
+        if (cursor.sort_by, cursor.sort_order) != (sort_by, sort_order):
+            return jsonify({"error": "Cursor não corresponde à ordenação solicitada."}), HTTPStatus.BAD_REQUEST
+
+    with read_scope() as session:
+        filters = _build_integration_filters(search_term, record_filters)
+
+        total_items = None
+        if with_total:
+            count_stmt = select(func.count()).select_from(IntegrationRecord)
+            if filters:
+                count_stmt = count_stmt.where(*filters)
+            total_items = session.execute(count_stmt).scalar_one()
+
+        data_stmt = INTEGRATION_COLUMNS.select()
+        if filters:
+            data_stmt = data_stmt.where(*filters)
+        data_stmt = apply_keyset(data_stmt, sort_column, IntegrationRecord.id, sort_order, cursor)
+        records = execute_rows(session, data_stmt.limit(page_size + 1)).all()
+
+    has_more = len(records) > page_size
+    records = records[:page_size]
+    next_cursor = None
+    if has_more and records:
+        last = records[-1]
+        next_cursor = KeysetCursor(sort_by, sort_order, getattr(last, sort_by), last.id).encode()
+
+    pagination: Dict[str, Any] = {
+        "mode": "cursor",
+        "page_size": page_size,
+        "has_more": has_more,
+        "next_cursor": next_cursor,
     }
+    if with_total:
+        pagination["total_items"] = total_items
+
+    payload = {
+        "items": [serialize_integration_record(record) for record in records],
+        "pagination": pagination,
+    }
+
+    return jsonify(payload), HTTPStatus.OK
 
 
 def _extract_payload() -> Dict[str, Any] | None:
@@ -368,6 +607,27 @@ def _extract_payload() -> Dict[str, Any] | None:
     return form_data or None
 
 
+def _extract_batch() -> Tuple[List[Any], bool, Any]:
+    data = request.get_json(silent=True) if request.is_json else None
+    mode = request.args.get("mode")
+    if isinstance(data, dict):
+        mode = data.get("mode", mode)
+        data = data.get("items")
+    if not isinstance(data, list):
+        return [], True, (jsonify({"error": "Esperada lista de itens em 'items'."}), HTTPStatus.BAD_REQUEST)
+
+    max_items = int(current_app.config.get("BATCH_MAX_ITEMS", 5000))
+    if len(data) > max_items:
+        error = jsonify({"error": f"Lote excede o limite de {max_items} itens."})
+        return [], True, (error, HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+
+    normalized_mode = str(mode or "atomic").strip().lower()
+    if normalized_mode not in {"atomic", "best_effort"}:
+        error = jsonify({"error": "Modo de lote inválido. Use 'atomic' ou 'best_effort'."})
+        return [], True, (error, HTTPStatus.BAD_REQUEST)
+    return data, normalized_mode == "atomic", None
+
+
 def _record_payload(record: IntegrationRecord) -> Dict[str, Any]:
     return {
         "submission_id": record.id,
@@ -382,3 +642,17 @@ def _record_payload(record: IntegrationRecord) -> Dict[str, Any]:
         "observacao": record.observacao,
         "submitted_at": record.submitted_at.isoformat(),
     }
+
+
+register_dataset(
+    ExportDataset(
+        name="integration",
+        scope=INTEGRATION_SCOPE,
+        filename_prefix="integracoes",
+        layout=_INTEGRATION_SHEET,
+        build_statement=_records_statement,
+        filters=_FILTERS,
+        to_row=_integration_sheet_row,
+        to_document=serialize_integration_record,
+    )
+)
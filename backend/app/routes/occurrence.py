@@ -2,23 +2,50 @@
 
 from __future__ import annotations
 
+import logging
 from datetime import datetime
-from io import BytesIO
 from math import ceil
 from http import HTTPStatus
-from typing import Any, Dict, List
+from typing import IO, Any, Dict, Iterable, List, Sequence, Tuple
 
-from flask import Blueprint, jsonify, request, send_file
-from openpyxl import Workbook
-from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
-from openpyxl.utils import get_column_letter
-from sqlalchemy import func, or_, select
+from flask import Blueprint, current_app, jsonify, request
+from sqlalchemy import case, func, select
 from sqlalchemy.exc import SQLAlchemyError
 
-from ..database import session_scope
-from ..models import OccurrenceRecord
-from ..services.configuration import get_snapshot
-from ..services.ingestion import persist_occurrence, update_occurrence_record
+from ..database import read_scope, session_scope
+from ..models import OccurrenceDailyRollup, OccurrenceRecord
+from ..services.archive import archive_enabled, archived_select, with_archive
+from ..services.audit import audit_event
+from ..services.configuration import options_payload
+from ..services.export import (
+    EXPORT_CHUNK_SIZE,
+    STREAM_MIMETYPES,
+    SheetLayout,
+    send_spreadsheet,
+    stream_records,
+    write_workbook,
+)
+from ..services.export_jobs import ExportDataset, register_dataset
+from ..services.filters import NO_FILTERS, FilterSet, RecordFilters
+from ..services.group_commit import GroupCommitTimeout, get_committer
+from ..services.http_cache import conditional
+from ..services.importer import import_file
+from ..services.metrics import observe_export
+from ..services.pagination import KeysetCursor, apply_keyset, parse_flag
+from ..services.projection import execute_rows
+from ..services.records import OCCURRENCE_COLUMNS, OCCURRENCE_FIELDS, serialize_occurrence_record
+from ..services.search import SEARCH_INDEXES, build_search_filters, order_by_relevance
+from ..services.stats import StatsDataset, aggregate, parse_query
+from ..services.versioning import OCCURRENCE_SCOPE
+from ..services.ingestion import (
+    BatchValidationError,
+    delete_occurrence_record,
+    persist_occurrence,
+    persist_occurrence_batch,
+    update_occurrence_record,
+)
+
+_batch_logger = logging.getLogger("integration.batch")
 
 occurrence_bp = Blueprint("occurrence", __name__, url_prefix="/api/occurrence")
 
@@ -38,23 +65,46 @@ _SORTABLE_FIELDS = {
 }
 
 
-def _build_occurrence_filters(search_term: str) -> List[Any]:
-    filters: List[Any] = []
-    if search_term:
-        like_pattern = f"%{search_term}%"
-        filters.append(
-            or_(
-                OccurrenceRecord.matricula.ilike(like_pattern),
-                OccurrenceRecord.nome.ilike(like_pattern),
-                OccurrenceRecord.setor.ilike(like_pattern),
-                OccurrenceRecord.cargo.ilike(like_pattern),
-                OccurrenceRecord.turno.ilike(like_pattern),
-                OccurrenceRecord.motivo.ilike(like_pattern),
-                OccurrenceRecord.supervisor.ilike(like_pattern),
-                OccurrenceRecord.observacao.ilike(like_pattern),
-            )
-        )
-    return filters
+# The ILIKE fallback (no FTS5, archived rows) searches exactly the indexed columns.
+_SEARCH_FALLBACK_COLUMNS = tuple(
+    getattr(OccurrenceRecord, name) for name in SEARCH_INDEXES[OccurrenceRecord.__tablename__]
+)
+
+
+_FILTERS = FilterSet(
+    exact={
+        "setor": OccurrenceRecord.setor,
+        "cargo": OccurrenceRecord.cargo,
+        "turno": OccurrenceRecord.turno,
+        "supervisor": OccurrenceRecord.supervisor,
+        "motivo": OccurrenceRecord.motivo,
+    },
+    ranges={
+        "grau": OccurrenceRecord.grau,
+        "volumes": OccurrenceRecord.volumes,
+    },
+    dates={
+        "created_at": OccurrenceRecord.created_at,
+    },
+    normalize={"supervisor": str.upper},
+)
+
+
+def _build_occurrence_filters(
+    search_term: str, record_filters: RecordFilters = NO_FILTERS, *, indexed: bool = True
+) -> List[Any]:
+    filters = build_search_filters(OccurrenceRecord, search_term, _SEARCH_FALLBACK_COLUMNS, indexed=indexed)
+    return filters + _FILTERS.clauses(record_filters)
+
+
+def _apply_sort(stmt, sort_by: str, sort_order: str, search_term: str, default_column):
+    if sort_by == "relevance" and search_term:
+        ranked = order_by_relevance(stmt, OccurrenceRecord, search_term)
+        if ranked is not None:
+            return ranked
+    sort_column = _SORTABLE_FIELDS.get(sort_by, default_column)
+    order_clause = sort_column.asc() if sort_order.lower() == "asc" else sort_column.desc()
+    return stmt.order_by(order_clause)
 
 
 def _format_datetime(value) -> str:
@@ -63,23 +113,24 @@ def _format_datetime(value) -> str:
     return value.strftime("%d/%m/%Y %H:%M")
 
 
-def _auto_fit_columns(sheet) -> None:
-    for index, column in enumerate(sheet.columns, start=1):
-        max_length = 0
-        for cell in column:
-            value = cell.value
-            length = len(str(value)) if value is not None else 0
-            max_length = max(max_length, length)
-        adjusted = min(max_length + 4, 48)
-        sheet.column_dimensions[get_column_letter(index)].width = max(adjusted, 12)
+def _isoformat(value) -> str | None:
+    return value.isoformat() if value else None
+
+
+def _or_blank(value) -> Any:
+    return value or ""
+
 
+def _blank_if_none(value) -> Any:
+    return "" if value is None else value
 
-def _build_occurrence_workbook(records: List[OccurrenceRecord]) -> BytesIO:
-    workbook = Workbook()
-    sheet = workbook.active
-    sheet.title = "Ocorrências"
 
-    headers = [
+_occurrence_record_values = OCCURRENCE_COLUMNS.row_mapper(*OCCURRENCE_FIELDS[:12], ("created_at", _isoformat))
+
+
+_OCCURRENCE_SHEET = SheetLayout(
+    title="Ocorrências",
+    headers=(
         "ID",
         "Matrícula",
         "Colaborador",
@@ -93,63 +144,30 @@ def _build_occurrence_workbook(records: List[OccurrenceRecord]) -> BytesIO:
         "Volumes",
         "Observação",
         "Registrado em",
-    ]
-    sheet.append(headers)
-
-    for record in records:
-        sheet.append(
-            [
-                record.id,
-                record.matricula or "",
-                record.nome,
-                record.setor,
-                record.cargo,
-                record.turno,
-                record.supervisor,
-                record.motivo or "",
-                record.grau_label or "",
-                record.grau if record.grau is not None else "",
-                record.volumes if record.volumes is not None else "",
-                record.observacao or "",
-                _format_datetime(record.created_at),
-            ]
-        )
-
-    header_font = Font(bold=True, color="FFFFFFFF")
-    header_fill = PatternFill(fill_type="solid", fgColor="DC2626")
-    header_alignment = Alignment(vertical="center", horizontal="left")
-    thin = Side(style="thin", color="D1D5DB")
-    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    ),
+    header_color="DC2626",
+)
 
-    for cell in sheet[1]:
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = header_alignment
-        cell.border = border
 
-    for row in sheet.iter_rows(min_row=2):
-        for cell in row:
-            cell.alignment = Alignment(vertical="top", wrap_text=True)
-            cell.border = border
+_occurrence_sheet_row = OCCURRENCE_COLUMNS.row_mapper(
+    "id",
+    ("matricula", _or_blank),
+    "nome",
+    "setor",
+    "cargo",
+    "turno",
+    "supervisor",
+    ("motivo", _or_blank),
+    ("grau_label", _or_blank),
+    ("grau", _blank_if_none),
+    ("volumes", _blank_if_none),
+    ("observacao", _or_blank),
+    ("created_at", _format_datetime),
+)
 
-    sheet.freeze_panes = "A2"
-    sheet.auto_filter.ref = f"A1:{get_column_letter(sheet.max_column)}1"
-    _auto_fit_columns(sheet)
 
-    stream = BytesIO()
-    workbook.save(stream)
-    stream.seek(0)
-    return stream
-
-
-def _send_workbook(stream: BytesIO, filename: str):
-    """Return a Flask file response compatible with older Flask releases."""
-    mimetype = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    try:
-        return send_file(stream, mimetype=mimetype, as_attachment=True, download_name=filename)
-    except TypeError:
-        stream.seek(0)
-        return send_file(stream, mimetype=mimetype, as_attachment=True, attachment_filename=filename)
+def _build_occurrence_workbook(records: Iterable[Sequence[Any]]) -> IO[bytes]:
+    return write_workbook(_OCCURRENCE_SHEET, (_occurrence_sheet_row(record) for record in records))
 
 
 @occurrence_bp.post("")
@@ -159,29 +177,101 @@ def register_occurrence() -> Any:
         return jsonify({"error": "Não foi possível interpretar os dados enviados."}), HTTPStatus.BAD_REQUEST
 
     try:
-        with session_scope() as session:
-            record = persist_occurrence(session, payload)
-            options = get_snapshot(session).get("occurrence", {})
-        summary = _record_summary(record)
-        print("\n=== Ocorrência registrada ===", flush=True)
-        print(summary, flush=True)
-        print("=== Fim da ocorrência ===\n", flush=True)
+        committer = get_committer()
+        if committer is not None:
+            record = committer.submit(persist_occurrence, payload)
+            with read_scope() as session:
+                options = options_payload(session, "occurrence", request.args.get("options_version"))
+        else:
+            with session_scope() as session:
+                record = persist_occurrence(session, payload)
+                options = options_payload(session, "occurrence", request.args.get("options_version"))
+        audit_event(
+            "occurrence_registered",
+            record_id=record.id,
+            detail=lambda: serialize_occurrence_record(OCCURRENCE_COLUMNS.values(record)),
+        )
         return (
             jsonify(
                 {
                     "status": "accepted",
                     "record_id": record.id,
-                    "options": options,
+                    **options,
                 }
             ),
             HTTPStatus.ACCEPTED,
         )
     except ValueError as error:
         return jsonify({"error": str(error)}), HTTPStatus.BAD_REQUEST
+    except GroupCommitTimeout:
+        return jsonify({"error": "Servidor ocupado. Tente novamente em instantes."}), HTTPStatus.SERVICE_UNAVAILABLE
     except SQLAlchemyError:
         return jsonify({"error": "Erro ao salvar a ocorrência."}), HTTPStatus.INTERNAL_SERVER_ERROR
 
 
+@occurrence_bp.post("/batch")
+def accept_batch() -> Any:
+    """Store many payloads in one transaction with per-item results.
+
+    ``mode=atomic`` (default) rejects the batch if any item is invalid;
+    ``mode=best_effort`` stores the valid items and reports the others.
+    """
+    items, atomic, error_response = _extract_batch()
+    if error_response is not None:
+        return error_response
+
+    try:
+        with session_scope() as session:
+            results = persist_occurrence_batch(session, items, atomic=atomic)
+            options = options_payload(session, "occurrence", request.args.get("options_version"))
+    except BatchValidationError as error:
+        return (
+            jsonify({"status": "rejected", "mode": "atomic", "error": str(error), "errors": error.results}),
+            HTTPStatus.BAD_REQUEST,
+        )
+    except SQLAlchemyError:
+        return jsonify({"error": "Erro ao salvar o lote de ocorrências."}), HTTPStatus.INTERNAL_SERVER_ERROR
+
+    errors = [result for result in results if result["status"] == "error"]
+    _batch_logger.info(
+        "occurrence_batch items=%s created=%s errors=%s mode=%s",
+        len(results),
+        len(results) - len(errors),
+        len(errors),
+        "atomic" if atomic else "best_effort",
+    )
+    return (
+        jsonify(
+            {
+                "status": "partial" if errors else "accepted",
+                "mode": "atomic" if atomic else "best_effort",
+                "created": len(results) - len(errors),
+                "failed": len(errors),
+                "results": results,
+                **options,
+            }
+        ),
+        HTTPStatus.MULTI_STATUS if errors else HTTPStatus.ACCEPTED,
+    )
+
+
+@occurrence_bp.post("/import")
+def import_occurrences() -> Any:
+    """Import an exported XLSX/CSV file; rows already stored are skipped."""
+    upload = request.files.get("file")
+    if upload is None or not upload.filename:
+        return jsonify({"error": "Envie o arquivo no campo 'file'."}), HTTPStatus.BAD_REQUEST
+
+    try:
+        report = import_file("occurrence", upload.stream, upload.filename)
+    except ValueError as error:
+        return jsonify({"error": str(error)}), HTTPStatus.BAD_REQUEST
+    except SQLAlchemyError:
+        return jsonify({"error": "Erro ao importar ocorrências."}), HTTPStatus.INTERNAL_SERVER_ERROR
+
+    return jsonify({"status": "imported", **report.to_dict()}), HTTPStatus.OK
+
+
 @occurrence_bp.put("/records/<int:record_id>")
 def update_occurrence(record_id: int) -> Any:
     payload = _extract_payload()
@@ -195,14 +285,14 @@ def update_occurrence(record_id: int) -> Any:
                 return jsonify({"error": "Registro de ocorrência não encontrado."}), HTTPStatus.NOT_FOUND
 
             updated_record = update_occurrence_record(session, record, payload)
-            options = get_snapshot(session).get("occurrence", {})
+            options = options_payload(session, "occurrence", request.args.get("options_version"))
 
         return (
             jsonify(
                 {
                     "status": "updated",
                     "record_id": record_id,
-                    "options": options,
+                    **options,
                     "grau_label": updated_record.grau_label,
                 }
             ),
@@ -222,7 +312,7 @@ def delete_occurrence(record_id: int) -> Any:
             if record is None:
                 return jsonify({"error": "Registro de ocorrência não encontrado."}), HTTPStatus.NOT_FOUND
 
-            session.delete(record)
+            delete_occurrence_record(session, record)
 
         return jsonify({"status": "deleted", "record_id": record_id}), HTTPStatus.OK
     except SQLAlchemyError:
@@ -230,12 +320,15 @@ def delete_occurrence(record_id: int) -> Any:
 
 
 @occurrence_bp.get("/records")
+@conditional(OCCURRENCE_SCOPE)
 def list_occurrences() -> Any:
     page_param = request.args.get("page", default="1")
     size_param = request.args.get("page_size", default="10")
     sort_by_param = request.args.get("sort_by", default="created_at")
     sort_order_param = request.args.get("sort_order", default="desc")
     search_param = request.args.get("search", default="").strip()
+    cursor_param = request.args.get("cursor")
+    with_total = parse_flag(request.args.get("with_total"), default=True)
 
     try:
         page = max(int(page_param), 1)
@@ -247,41 +340,131 @@ def list_occurrences() -> Any:
     except (TypeError, ValueError):
         page_size = 10
 
-    with session_scope() as session:
-        filters = _build_occurrence_filters(search_param)
+    try:
+        record_filters = _FILTERS.parse(request.args)
+    except ValueError as error:
+        return jsonify({"error": str(error)}), HTTPStatus.BAD_REQUEST
+
+    format_param = request.args.get("format", default="json").strip().lower()
+    if format_param in STREAM_MIMETYPES:
+        data_stmt = _records_statement(search_param, sort_by_param, sort_order_param, record_filters)
+        return stream_records(
+            format_param,
+            data_stmt,
+            columns=OCCURRENCE_FIELDS,
+            to_row=_occurrence_record_values,
+            to_document=serialize_occurrence_record,
+        )
+    if format_param != "json":
+        return jsonify({"error": "Formato de listagem inválido."}), HTTPStatus.BAD_REQUEST
+
+    if cursor_param is not None:
+        return _list_keyset_page(
+            cursor_param, page_size, sort_by_param, sort_order_param, search_param, record_filters, with_total
+        )
+
+    with read_scope() as session:
+        filters = _build_occurrence_filters(search_param, record_filters)
 
         count_stmt = select(func.count()).select_from(OccurrenceRecord)
-        data_stmt = select(OccurrenceRecord)
+        data_stmt = OCCURRENCE_COLUMNS.select()
 
         if filters:
             count_stmt = count_stmt.where(*filters)
             data_stmt = data_stmt.where(*filters)
 
-        total_items = session.execute(count_stmt).scalar_one()
+        total_items = None
+        total_pages = 0
+        if with_total:
+            total_items = session.execute(count_stmt).scalar_one()
 
-        total_pages = ceil(total_items / page_size) if total_items else 0
-        if total_pages:
-            page = min(page, total_pages)
-        else:
-            page = 1
+            total_pages = ceil(total_items / page_size) if total_items else 0
+            if total_pages:
+                page = min(page, total_pages)
+            else:
+                page = 1
 
         offset = (page - 1) * page_size
 
-        sort_column = _SORTABLE_FIELDS.get(sort_by_param, OccurrenceRecord.created_at)
-        sort_order = sort_order_param.lower()
-        order_clause = sort_column.asc() if sort_order == "asc" else sort_column.desc()
+        data_stmt = _apply_sort(data_stmt, sort_by_param, sort_order_param, search_param, OccurrenceRecord.created_at)
+        data_stmt = data_stmt.offset(offset).limit(page_size + (0 if with_total else 1))
+        records = execute_rows(session, data_stmt).all()
 
-        data_stmt = data_stmt.order_by(order_clause).offset(offset).limit(page_size)
-        records = session.execute(data_stmt).scalars().all()
+    pagination: Dict[str, Any] = {"page": page, "page_size": page_size}
+    if with_total:
+        pagination["total_items"] = total_items
+        pagination["total_pages"] = total_pages or 1
+    else:
+        pagination["has_more"] = len(records) > page_size
+        records = records[:page_size]
 
     payload = {
-        "items": [_serialize_occurrence_record(record) for record in records],
-        "pagination": {
-            "page": page,
-            "page_size": page_size,
-            "total_items": total_items,
-            "total_pages": total_pages or 1,
-        },
+        "items": [serialize_occurrence_record(record) for record in records],
+        "pagination": pagination,
+    }
+
+    return jsonify(payload), HTTPStatus.OK
+
+
+def _list_keyset_page(
+    cursor_token: str,
+    page_size: int,
+    sort_by: str,
+    sort_order: str,
+    search_term: str,
+    record_filters: RecordFilters,
+    with_total: bool,
+) -> Any:
+    """Serve a page positioned by an opaque cursor instead of an offset."""
+    if sort_by not in _SORTABLE_FIELDS:
+        sort_by = "created_at"
+    sort_order = "asc" if sort_order.lower() == "asc" else "desc"
+    sort_column = _SORTABLE_FIELDS[sort_by]
+
+    cursor = None
+    if cursor_token:
+        try:
+            cursor = KeysetCursor.decode(cursor_token, sort_column)
+        except ValueError as error:
+            return jsonify({"error": str(error)}), HTTPStatus.BAD_REQUEST
+        if (cursor.sort_by, cursor.sort_order) != (sort_by, sort_order):
+            return jsonify({"error": "Cursor não corresponde à ordenação solicitada."}), HTTPStatus.BAD_REQUEST
+
+    with read_scope() as session:
+        filters = _build_occurrence_filters(search_term, record_filters)
+
+        total_items = None
+        if with_total:
+            count_stmt = select(func.count()).select_from(OccurrenceRecord)
+            if filters:
+                count_stmt = count_stmt.where(*filters)
+            total_items = session.execute(count_stmt).scalar_one()
+
+        data_stmt = OCCURRENCE_COLUMNS.select()
+        if filters:
+            data_stmt = data_stmt.where(*filters)
+        data_stmt = apply_keyset(data_stmt, sort_column, OccurrenceRecord.id, sort_order, cursor)
+        records = execute_rows(session, data_stmt.limit(page_size + 1)).all()
+
+    has_more = len(records) > page_size
+    records = records[:page_size]
+    next_cursor = None
+    if has_more and records:
+        last = records[-1]
+        next_cursor = KeysetCursor(sort_by, sort_order, getattr(last, sort_by), last.id).encode()
+
+    pagination: Dict[str, Any] = {
+        "mode": "cursor",
+        "page_size": page_size,
+        "has_more": has_more,
+        "next_cursor": next_cursor,
+    }
+    if with_total:
+        pagination["total_items"] = total_items
+
+    payload = {
+        "items": [serialize_occurrence_record(record) for record in records],
+        "pagination": pagination,
     }
 
     return jsonify(payload), HTTPStatus.OK
@@ -292,25 +475,114 @@ def export_occurrences() -> Any:
     search_param = request.args.get("search", default="").strip()
     sort_by_param = request.args.get("sort_by", default="created_at")
     sort_order_param = request.args.get("sort_order", default="desc")
+    format_param = request.args.get("format", default="xlsx").strip().lower()
 
-    with session_scope() as session:
-        filters = _build_occurrence_filters(search_param)
-        data_stmt = select(OccurrenceRecord)
+    if format_param != "xlsx" and format_param not in STREAM_MIMETYPES:
+        return jsonify({"error": "Formato de exportação inválido."}), HTTPStatus.BAD_REQUEST
 
-        if filters:
-            data_stmt = data_stmt.where(*filters)
+    try:
+        record_filters = _FILTERS.parse(request.args)
+    except ValueError as error:
+        return jsonify({"error": str(error)}), HTTPStatus.BAD_REQUEST
+    include_archive = parse_flag(request.args.get("include_archive"), default=False)
+
+    data_stmt = _records_statement(search_param, sort_by_param, sort_order_param, record_filters, include_archive)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+
+    if format_param in STREAM_MIMETYPES:
+        return stream_records(
+            format_param,
+            data_stmt,
+            columns=_OCCURRENCE_SHEET.headers,
+            to_row=_occurrence_sheet_row,
+            to_document=serialize_occurrence_record,
+            filename=f"ocorrencias_{timestamp}.{format_param}",
+            dataset="occurrence",
+        )
 
-        sort_column = _SORTABLE_FIELDS.get(sort_by_param, OccurrenceRecord.created_at)
-        sort_order = sort_order_param.lower()
-        order_clause = sort_column.asc() if sort_order == "asc" else sort_column.desc()
-        data_stmt = data_stmt.order_by(order_clause)
+    with observe_export("occurrence", "xlsx") as export, read_scope() as session:
+        records = execute_rows(session, data_stmt, yield_per=EXPORT_CHUNK_SIZE)
+        stream = _build_occurrence_workbook(export.track(records))
+
+    filename = f"ocorrencias_{timestamp}.xlsx"
+
+    return send_spreadsheet(stream, filename)
+
+
+_ROLLUP_STATS = StatsDataset(
+    name="occurrence",
+    model=OccurrenceDailyRollup,
+    time_column=OccurrenceDailyRollup.day,
+    dimensions={
+        "setor": OccurrenceDailyRollup.setor,
+        "motivo": OccurrenceDailyRollup.motivo,
+        "grau": OccurrenceDailyRollup.grau,
+        "turno": OccurrenceDailyRollup.turno,
+    },
+    metrics={
+        "volumes": func.coalesce(func.sum(OccurrenceDailyRollup.volume_sum), 0),
+        "grau_avg": func.round(
+            func.sum(OccurrenceDailyRollup.grau * OccurrenceDailyRollup.record_count)
+            * 1.0
+            / func.sum(case((OccurrenceDailyRollup.grau.isnot(None), OccurrenceDailyRollup.record_count))),
+            2,
+        ),
+    },
+    count=func.coalesce(func.sum(OccurrenceDailyRollup.record_count), 0),
+)
+
+_STATS = StatsDataset(
+    name="occurrence",
+    model=OccurrenceRecord,
+    time_column=OccurrenceRecord.created_at,
+    dimensions={
+        "setor": OccurrenceRecord.setor,
+        "motivo": OccurrenceRecord.motivo,
+        "grau": OccurrenceRecord.grau,
+        "grau_label": OccurrenceRecord.grau_label,
+        "turno": OccurrenceRecord.turno,
+        "supervisor": OccurrenceRecord.supervisor,
+        "cargo": OccurrenceRecord.cargo,
+    },
+    metrics={
+        "volumes": func.coalesce(func.sum(OccurrenceRecord.volumes), 0),
+        "grau_avg": func.round(func.avg(OccurrenceRecord.grau), 2),
+    },
+    rollup=_ROLLUP_STATS,
+)
+
+
+@occurrence_bp.get("/stats")
+@conditional(OCCURRENCE_SCOPE)
+def occurrence_stats() -> Any:
+    """Counts and sums grouped by dimensions and/or time buckets, optionally pivoted."""
+    try:
+        query = parse_query(_STATS, request.args)
+    except ValueError as error:
+        return jsonify({"error": str(error)}), HTTPStatus.BAD_REQUEST
 
-        records = session.execute(data_stmt).scalars().all()
+    with read_scope() as session:
+        payload = aggregate(session, _STATS, query)
+    return jsonify(payload), HTTPStatus.OK
 
-    stream = _build_occurrence_workbook(records)
-    filename = f"ocorrencias_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
 
-    return _send_workbook(stream, filename)
+def _records_statement(
+    search_term: str,
+    sort_by: str,
+    sort_order: str,
+    record_filters: RecordFilters = NO_FILTERS,
+    include_archive: bool = False,
+):
+    data_stmt = OCCURRENCE_COLUMNS.select()
+    filters = _build_occurrence_filters(search_term, record_filters)
+    if filters:
+        data_stmt = data_stmt.where(*filters)
+    if include_archive and archive_enabled():
+        # Archived rows are not in the search index, so their half matches with ilike.
+        archived_filters = _build_occurrence_filters(search_term, record_filters, indexed=False)
+        archived = archived_select(OccurrenceRecord, OCCURRENCE_COLUMNS.columns, archived_filters)
+        return with_archive(data_stmt, archived, sort_by if sort_by in _SORTABLE_FIELDS else "created_at", sort_order)
+    return _apply_sort(data_stmt, sort_by, sort_order, search_term, OccurrenceRecord.created_at)
 
 
 def _extract_payload() -> Dict[str, Any] | None:
@@ -322,38 +594,36 @@ def _extract_payload() -> Dict[str, Any] | None:
     return form_data or None
 
 
-def _record_summary(record: OccurrenceRecord) -> str:
-    lines = [
-        f"Registro ID: {record.id}",
-        f"Matrícula: {record.matricula or '-'}",
-        f"Colaborador: {record.nome}",
-        f"Setor: {record.setor}",
-        f"Cargo: {record.cargo}",
-        f"Turno: {record.turno}",
-        f"Supervisor: {record.supervisor}",
-        f"Motivo: {record.motivo or '-'}",
-        f"Grau: {record.grau_label or '-'}",
-        f"Grau (valor): {record.grau if record.grau is not None else '-'}",
-        f"Volumes: {record.volumes if record.volumes is not None else '-'}",
-        f"Observação: {record.observacao or '-'}",
-        f"Criado em: {record.created_at.isoformat()}",
-    ]
-    return "\n".join(lines)
-
-
-def _serialize_occurrence_record(record: OccurrenceRecord) -> Dict[str, Any]:
-    return {
-        "id": record.id,
-        "matricula": record.matricula,
-        "nome": record.nome,
-        "setor": record.setor,
-        "cargo": record.cargo,
-        "turno": record.turno,
-        "supervisor": record.supervisor,
-        "motivo": record.motivo,
-        "grau": record.grau,
-        "grau_label": record.grau_label,
-        "volumes": record.volumes,
-        "observacao": record.observacao,
-        "created_at": record.created_at.isoformat(),
-    }
+def _extract_batch() -> Tuple[List[Any], bool, Any]:
+    data = request.get_json(silent=True) if request.is_json else None
+    mode = request.args.get("mode")
+    if isinstance(data, dict):
+        mode = data.get("mode", mode)
+        data = data.get("items")
+    if not isinstance(data, list):
+        return [], True, (jsonify({"error": "Esperada lista de itens em 'items'."}), HTTPStatus.BAD_REQUEST)
+
+    max_items = int(current_app.config.get("BATCH_MAX_ITEMS", 5000))
+    if len(data) > max_items:
+        error = jsonify({"error": f"Lote excede o limite de {max_items} itens."})
+        return [], True, (error, HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+
+    normalized_mode = str(mode or "atomic").strip().lower()
+    if normalized_mode not in {"atomic", "best_effort"}:
+        error = jsonify({"error": "Modo de lote inválido. Use 'atomic' ou 'best_effort'."})
+        return [], True, (error, HTTPStatus.BAD_REQUEST)
+    return data, normalized_mode == "atomic", None
+
+
+register_dataset(
+    ExportDataset(
+        name="occurrence",
+        scope=OCCURRENCE_SCOPE,
+        filename_prefix="ocorrencias",
+        layout=_OCCURRENCE_SHEET,
+        build_statement=_records_statement,
+        filters=_FILTERS,
+        to_row=_occurrence_sheet_row,
+        to_document=serialize_occurrence_record,
+    )
+)
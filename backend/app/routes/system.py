@@ -4,7 +4,13 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 
-from flask import Blueprint, jsonify
+from flask import Blueprint, Response, jsonify
+
+from ..database import database_stats
+from ..services.compression import compression_stats
+from ..services.events import get_hub
+from ..services.group_commit import get_committer
+from ..services.metrics import CONTENT_TYPE, render_metrics
 
 system_bp = Blueprint("system", __name__, url_prefix="/api")
 
@@ -18,3 +24,23 @@ def healthcheck() -> tuple:
         "timestamp": datetime.now(timezone.utc).isoformat(),
     }
     return jsonify(payload), 200
+
+
+@system_bp.get("/diagnostics")
+def diagnostics() -> tuple:
+    """Report database writer queue, read pool, group commit, compression and event stream usage."""
+    committer = get_committer()
+    payload = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "database": database_stats(),
+        "group_commit": committer.stats() if committer is not None else {"enabled": False},
+        "compression": compression_stats(),
+        "events": get_hub().stats(),
+    }
+    return jsonify(payload), 200
+
+
+@system_bp.get("/metrics")
+def metrics() -> Response:
+    """Request, SQL, export and database file metrics of all workers in Prometheus text format."""
+    return Response(render_metrics(), content_type=CONTENT_TYPE)
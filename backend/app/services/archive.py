@@ -0,0 +1,203 @@
+"""Hot/cold split of the record tables.
+
+Rows older than ``ARCHIVE_AFTER_DAYS`` move in batches from the record tables
+into identical tables of a second SQLite file, attached to every connection
+as ``archive``. Listings and search read only the hot tables; exports and
+the collaborator history union both when asked to with ``include_archive``.
+Daily rollups are not touched by a move, so statistics keep covering the
+archived period.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Sequence
+
+from sqlalchemy import Column, MetaData, Table, delete, exists, func, insert, select, text, union_all
+from sqlalchemy.sql import visitors
+
+from ..database import ARCHIVE_SCHEMA, archive_attached, session_scope
+from ..models import IntegrationRecord, OccurrenceRecord
+from .versioning import INTEGRATION_SCOPE, OCCURRENCE_SCOPE, bump_version
+
+_logger = logging.getLogger("integration.archive")
+
+_ARCHIVE_METADATA = MetaData()
+
+
+@dataclass(frozen=True)
+class ArchiveTarget:
+    name: str
+    model: Any
+    age_column: str
+    scope: str
+
+
+# Records age by when they were registered.
+ARCHIVE_TARGETS: Dict[str, ArchiveTarget] = {
+    "integration": ArchiveTarget("integration", IntegrationRecord, "submitted_at", INTEGRATION_SCOPE),
+    "occurrence": ArchiveTarget("occurrence", OccurrenceRecord, "created_at", OCCURRENCE_SCOPE),
+}
+
+_TABLES: Dict[str, Table] = {
+    target.model.__tablename__: target.model.__table__.to_metadata(_ARCHIVE_METADATA, schema=ARCHIVE_SCHEMA)
+    for target in ARCHIVE_TARGETS.values()
+}
+
+
+def archive_enabled() -> bool:
+    return archive_attached()
+
+
+def archive_table(model) -> Table:
+    """The archive copy of ``model``'s table (same columns and indexes)."""
+    return _TABLES[model.__tablename__]
+
+
+def install_archive(connection) -> None:
+    """Create the archive tables in the attached file when they are missing."""
+    if not archive_attached():
+        return
+    journal_mode = connection.execute(text("PRAGMA main.journal_mode")).scalar()
+    if str(journal_mode).lower() == "wal":
+        connection.execute(text(f"PRAGMA {ARCHIVE_SCHEMA}.journal_mode=WAL"))
+    _ARCHIVE_METADATA.create_all(connection)
+    for target in ARCHIVE_TARGETS.values():
+        _reserve_archived_ids(connection, target.model.__tablename__)
+
+
+def archived_select(model, columns: Sequence[Any], clauses: Sequence[Any]):
+    """Select ``columns`` of ``model`` from its archive table, filtered by ``clauses``.
+
+    Columns and clauses are written against the hot table and rebound onto
+    the archive copy, so one filter definition serves both halves of a UNION.
+    """
+    rebind = _rebinder(model.__table__, archive_table(model))
+    stmt = select(*(rebind(column) for column in columns))
+    if clauses:
+        stmt = stmt.where(*(rebind(clause) for clause in clauses))
+    return stmt
+
+
+def with_archive(stmt, archived, sort_by: str, sort_order: str):
+    """``UNION ALL`` of ``stmt`` and ``archived``, ordered by the output column ``sort_by`` then ``id``."""
+    combined = union_all(stmt, archived)
+    columns = combined.selected_columns
+    order = columns[sort_by].asc() if sort_order.lower() == "asc" else columns[sort_by].desc()
+    return combined.order_by(order, columns.id.desc())
+
+
+def archive_records(
+    days: int,
+    batch_size: int,
+    targets: Sequence[str] | None = None,
+    progress: Callable[[str, int], None] | None = None,
+) -> Dict[str, int]:
+    """Move records older than ``days`` into the archive; returns rows moved per target."""
+    if not archive_attached():
+        raise ValueError("Banco de arquivo não configurado (ARCHIVE_DATABASE_PATH).")
+    cutoff = datetime.utcnow() - timedelta(days=max(days, 0))
+    batch_size = max(batch_size, 1)
+    moved: Dict[str, int] = {}
+    for name in targets or ARCHIVE_TARGETS:
+        target = ARCHIVE_TARGETS[name]
+        moved[name] = 0
+        while True:
+            count = _move_batch(target, cutoff, batch_size)
+            if not count:
+                break
+            moved[name] += count
+            if progress is not None:
+                progress(name, moved[name])
+        if moved[name]:
+            _logger.info("records_archived target=%s rows=%s cutoff=%s", name, moved[name], cutoff.isoformat())
+    return moved
+
+
+def archive_counts() -> Dict[str, Dict[str, int]]:
+    """Rows per target in the hot and archive tables."""
+    counts: Dict[str, Dict[str, int]] = {}
+    with session_scope() as session:
+        for name, target in ARCHIVE_TARGETS.items():
+            hot = session.execute(select(func.count()).select_from(target.model)).scalar_one()
+            cold = 0
+            if archive_attached():
+                cold = session.execute(select(func.count()).select_from(archive_table(target.model))).scalar_one()
+            counts[name] = {"hot": hot, "archive": cold}
+    return counts
+
+
+def _move_batch(target: ArchiveTarget, cutoff: datetime, batch_size: int) -> int:
+    hot = target.model.__table__
+    cold = archive_table(target.model)
+
+    # Copy and delete run as separate transactions: in WAL mode a commit spanning
+    # two files is not atomic, and this order can only leave a row in both
+    # places (skipped on the next run), never in neither.
+    with session_scope() as session:
+        ids: List[int] = list(
+            session.execute(
+                select(hot.c.id)
+                .where(hot.c[target.age_column] < cutoff)
+                .order_by(hot.c[target.age_column])
+                .limit(batch_size)
+            ).scalars()
+        )
+        if not ids:
+            return 0
+        names = [column.name for column in hot.columns]
+        session.execute(
+            insert(cold).prefix_with("OR IGNORE").from_select(names, select(*hot.columns).where(hot.c.id.in_(ids)))
+        )
+
+    # Only rows whose archived copy is identical leave the hot table: an id
+    # already taken in the archive by another row keeps the new one hot.
+    with session_scope() as session:
+        copied = exists().where(*(cold.c[column.name].is_not_distinct_from(column) for column in hot.columns))
+        result = session.execute(delete(hot).where(hot.c.id.in_(ids), copied))
+        bump_version(session, target.scope)
+    if result.rowcount < len(ids):
+        _logger.warning(
+            "archive_rows_kept target=%s rows=%s reason=archive_id_conflict", target.name, len(ids) - result.rowcount
+        )
+    return result.rowcount
+
+
+def _reserve_archived_ids(connection, table_name: str) -> None:
+    """Raise the AUTOINCREMENT counter of a hot table above its archived ids.
+
+    Databases whose tables predate AUTOINCREMENT reused ids freed by archived
+    rows; from here on SQLite only hands out ids past every archived one.
+    """
+    archived = connection.execute(select(func.max(_TABLES[table_name].c.id))).scalar()
+    if archived is None:
+        return
+    sequence = connection.execute(
+        text("SELECT seq FROM main.sqlite_sequence WHERE name = :name"), {"name": table_name}
+    ).first()
+    if sequence is None:
+        connection.execute(
+            text("INSERT INTO main.sqlite_sequence (name, seq) VALUES (:name, :seq)"),
+            {"name": table_name, "seq": archived},
+        )
+    elif sequence.seq < archived:
+        connection.execute(
+            text("UPDATE main.sqlite_sequence SET seq = :seq WHERE name = :name"),
+            {"name": table_name, "seq": archived},
+        )
+
+
+def _rebinder(source: Table, target: Table) -> Callable[[Any], Any]:
+    def replace(element: Any) -> Any:
+        if isinstance(element, Column) and element.table is source:
+            return target.c[element.key]
+        return None
+
+    def rebind(clause: Any) -> Any:
+        # Mapped attributes (``Model.column``) expose their Core column lazily.
+        clause = clause.__clause_element__() if hasattr(clause, "__clause_element__") else clause
+        return visitors.replacement_traverse(clause, {}, replace)
+
+    return rebind
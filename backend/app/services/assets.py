@@ -0,0 +1,531 @@
+"""Frontend asset pipeline: built once at startup, served from memory.
+
+Scripts and stylesheets referenced by ``index.html`` are minified,
+fingerprinted with a content hash, gzipped ahead of time and rewritten into
+the page. Hashed URLs never change content, so browsers may cache them
+forever; only ``index.html`` is revalidated.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import logging
+import mimetypes
+import posixpath
+import re
+import time
+import urllib.parse
+import urllib.request
+from dataclasses import dataclass
+from http import HTTPStatus
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from flask import Response, request
+
+_logger = logging.getLogger("integration.assets")
+
+ASSET_URL_PREFIX = "/assets"
+VENDOR_DIR = "vendor"
+
+_IMMUTABLE = "public, max-age=31536000, immutable"
+_REVALIDATE = "no-cache"
+
+# Gzip is only kept when it saves at least this fraction of the body.
+_MIN_GZIP_SAVING = 0.1
+
+_TEXT_SUFFIXES = {".js", ".css", ".html", ".svg", ".json", ".txt", ".map"}
+
+_TAG_RE = re.compile(r"<(script|link)\b[^>]*>", re.IGNORECASE)
+_ATTR_RE = re.compile(r"""\b(src|href|rel)\s*=\s*(["'])(.*?)\2""", re.IGNORECASE)
+_CSS_IMPORT_RE = re.compile(r"""@import\s+(?:url\(\s*(["']?)([^"')]+)\1\s*\)|(["'])([^"']+)\3)\s*;""")
+_CSS_URL_RE = re.compile(r"""url\(\s*(["']?)([^"')]+)\1\s*\)""")
+
+_REGEX_PRECEDERS = set("(,=:[!&|?{};+-*%<>~^")
+_REGEX_KEYWORDS = {
+    "return", "typeof", "instanceof", "in", "of", "new", "delete", "void",
+    "throw", "case", "do", "else", "yield", "await",
+}
+
+
+@dataclass(frozen=True)
+class Asset:
+    """One in-memory file with its precompressed variant."""
+
+    path: str
+    mimetype: str
+    body: bytes
+    gzip_body: bytes | None
+    etag: str
+    immutable: bool
+
+    def response(self) -> Response:
+        """Answer the current request, honouring ``If-None-Match`` and ``Accept-Encoding``."""
+        compressed = self.gzip_body is not None and request.accept_encodings["gzip"] > 0
+        etag = f"{self.etag}-gz" if compressed else self.etag
+        cache_control = _IMMUTABLE if self.immutable else _REVALIDATE
+
+        if request.if_none_match.contains(etag):
+            response = Response(status=HTTPStatus.NOT_MODIFIED)
+        else:
+            response = Response(self.gzip_body if compressed else self.body, mimetype=self.mimetype)
+            if compressed:
+                response.headers["Content-Encoding"] = "gzip"
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = cache_control
+        if self.gzip_body is not None:
+            response.vary.add("Accept-Encoding")
+        return response
+
+
+class AssetBundle:
+    """Fingerprinted copies of everything ``index.html`` pulls from ``frontend_dir``.
+
+    External scripts and stylesheets are swapped for local copies when a file
+    with the same name exists under ``frontend/vendor``.
+    """
+
+    def __init__(self, frontend_dir: Path, *, minify: bool = True) -> None:
+        self._root = frontend_dir.resolve()
+        self._minify = minify
+        self._by_source: Dict[Path, str] = {}
+        self.assets: Dict[str, Asset] = {}
+        self.index: Asset | None = None
+        self.external: List[str] = []
+
+    def build(self) -> "AssetBundle":
+        html = (self._root / "index.html").read_text(encoding="utf-8")
+        html = _TAG_RE.sub(self._rewrite_tag, html)
+        self.index = _make_asset("index.html", "text/html", html.encode("utf-8"), immutable=False)
+        return self
+
+    def get(self, path: str) -> Asset | None:
+        return self.assets.get(path)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "files": len(self.assets),
+            "bytes": sum(len(asset.body) for asset in self.assets.values()),
+            "gzip_bytes": sum(len(asset.gzip_body or asset.body) for asset in self.assets.values()),
+        }
+
+    def _rewrite_tag(self, match: re.Match) -> str:
+        tag = match.group(0)
+        attributes = {name.lower(): value for name, _, value in _ATTR_RE.findall(tag)}
+        if match.group(1).lower() == "script":
+            attribute = "src"
+        elif "stylesheet" in attributes.get("rel", "").lower().split():
+            attribute = "href"
+        else:
+            return tag
+
+        reference = attributes.get(attribute)
+        if not reference:
+            return tag
+        source = self._resolve_reference(reference)
+        if source is None:
+            if _is_external(reference):
+                self.external.append(reference)
+            return tag
+
+        url = self._url_for(source)
+        return _ATTR_RE.sub(
+            lambda found: f'{found.group(1)}="{url}"' if found.group(1).lower() == attribute else found.group(0),
+            tag,
+        )
+
+    def _resolve_reference(self, reference: str) -> Path | None:
+        if _is_external(reference):
+            name = posixpath.basename(urllib.parse.urlsplit(reference).path)
+            candidate = self._root / VENDOR_DIR / name
+            return candidate if name and candidate.is_file() else None
+        return self._local_file(self._root, reference)
+
+    def _local_file(self, base: Path, reference: str) -> Path | None:
+        if _is_external(reference) or reference.startswith(("/", "#", "data:")):
+            return None
+        relative = urllib.parse.unquote(urllib.parse.urlsplit(reference).path)
+        candidate = (base / relative).resolve()
+        if not candidate.is_file() or self._root not in candidate.parents:
+            return None
+        return candidate
+
+    def _url_for(self, source: Path) -> str:
+        """Build ``source`` (once) and return its fingerprinted URL."""
+        if source in self._by_source:
+            return f"{ASSET_URL_PREFIX}/{self._by_source[source]}"
+
+        suffix = source.suffix.lower()
+        if suffix == ".css":
+            body = self._build_css(source, set()).encode("utf-8")
+        elif suffix == ".js":
+            text = source.read_text(encoding="utf-8")
+            if self._minify and not source.name.endswith(".min.js"):
+                text = minify_js(text)
+            body = text.encode("utf-8")
+        else:
+            body = source.read_bytes()
+
+        digest = hashlib.sha256(body).hexdigest()[:12]
+        relative = source.relative_to(self._root).as_posix()
+        stem, dot, extension = relative.rpartition(".")
+        public = f"{stem}.{digest}.{extension}" if dot else f"{relative}.{digest}"
+        mimetype = mimetypes.guess_type(source.name)[0] or "application/octet-stream"
+        self.assets[public] = _make_asset(public, mimetype, body, immutable=True)
+        self._by_source[source] = public
+        return f"{ASSET_URL_PREFIX}/{public}"
+
+    def _build_css(self, source: Path, seen: set) -> str:
+        """Inline local ``@import`` rules and fingerprint ``url()`` targets."""
+        seen = seen | {source}
+        base = source.parent
+        text = source.read_text(encoding="utf-8")
+
+        def rewrite_url(match: re.Match) -> str:
+            if text[: match.start()].rstrip().endswith("@import"):
+                return match.group(0)
+            reference = match.group(2).strip()
+            target = self._local_file(base, reference)
+            if target is None:
+                return match.group(0)
+            fragment = urllib.parse.urlsplit(reference).fragment
+            return f'url("{self._url_for(target)}{"#" + fragment if fragment else ""}")'
+
+        def inline_import(match: re.Match) -> str:
+            target = self._local_file(base, match.group(2) or match.group(4))
+            if target is None or target in seen or target.suffix.lower() != ".css":
+                return match.group(0)
+            return self._build_css(target, seen)
+
+        text = _CSS_URL_RE.sub(rewrite_url, text)
+        text = _CSS_IMPORT_RE.sub(inline_import, text)
+        return minify_css(text) if self._minify else text
+
+
+def _is_external(reference: str) -> bool:
+    return reference.startswith(("http://", "https://", "//"))
+
+
+def _make_asset(path: str, mimetype: str, body: bytes, *, immutable: bool) -> Asset:
+    compressed = None
+    if Path(path).suffix.lower() in _TEXT_SUFFIXES:
+        candidate = gzip.compress(body, compresslevel=9, mtime=0)
+        if len(candidate) <= len(body) * (1 - _MIN_GZIP_SAVING):
+            compressed = candidate
+    return Asset(
+        path=path,
+        mimetype=mimetype,
+        body=body,
+        gzip_body=compressed,
+        etag=hashlib.sha256(body).hexdigest()[:16],
+        immutable=immutable,
+    )
+
+
+def _skip_string(source: str, index: int) -> int:
+    """Return the index just past the quoted string starting at ``index``."""
+    quote = source[index]
+    index += 1
+    while index < len(source):
+        char = source[index]
+        if char == "\\":
+            index += 2
+            continue
+        if char == quote or (char == "\n" and quote != "`"):
+            return index + 1
+        index += 1
+    return index
+
+
+def minify_js(source: str) -> str:
+    """Drop comments and indentation without changing how the script parses.
+
+    Line breaks are kept wherever automatic semicolon insertion could depend
+    on them; strings, template literals and regular expressions are copied
+    untouched. ``/*!`` license comments are preserved.
+    """
+    out: List[str] = []
+    length = len(source)
+    index = 0
+    pending = ""  # "", " " or "\n": whitespace seen since the last token
+    templates: List[int] = []  # brace depth at each open `${`
+    depth = 0
+
+    def last_char() -> str:
+        return out[-1][-1] if out else ""
+
+    def last_word() -> str:
+        tail = "".join(out[-12:])
+        found = re.search(r"[A-Za-z_$][\w$]*$", tail)
+        return found.group(0) if found else ""
+
+    def flush(next_char: str) -> None:
+        nonlocal pending
+        previous = last_char()
+        if pending and previous:
+            if pending == "\n" and not (previous in "{;,([=:?&|" or next_char in ")]},;"):
+                out.append("\n")
+            elif _needs_space(previous, next_char):
+                out.append(" ")
+        pending = ""
+
+    while index < length:
+        char = source[index]
+
+        if char in " \t\r\n\f\v\ufeff":
+            if char == "\n":
+                pending = "\n"
+            elif not pending:
+                pending = " "
+            index += 1
+            continue
+
+        if char == "/" and source.startswith("//", index):
+            end = source.find("\n", index)
+            index = length if end == -1 else end
+            continue
+
+        if char == "/" and source.startswith("/*", index):
+            end = source.find("*/", index + 2)
+            end = length if end == -1 else end + 2
+            comment = source[index:end]
+            if comment.startswith("/*!"):
+                flush("/")
+                out.append(comment)
+                pending = "\n"
+            elif "\n" in comment:
+                pending = "\n"
+            elif not pending:
+                pending = " "
+            index = end
+            continue
+
+        flush(char)
+
+        if char in "'\"":
+            end = _skip_string(source, index)
+            out.append(source[index:end])
+            index = end
+            continue
+
+        if char == "`" or (char == "}" and templates and templates[-1] == depth):
+            if char == "}":
+                templates.pop()
+            start = index
+            index += 1
+            while index < length:
+                current = source[index]
+                if current == "\\":
+                    index += 2
+                    continue
+                if current == "`":
+                    index += 1
+                    break
+                if current == "$" and source.startswith("${", index):
+                    index += 2
+                    templates.append(depth)
+                    break
+                index += 1
+            out.append(source[start:index])
+            continue
+
+        if char == "/" and _starts_regex(out, last_char(), last_word()):
+            end = _skip_regex(source, index)
+            if end is not None:
+                out.append(source[index:end])
+                index = end
+                continue
+
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+        out.append(char)
+        index += 1
+
+    return "".join(out).strip() + "\n"
+
+
+def _starts_regex(out: List[str], previous: str, word: str) -> bool:
+    """Whether a ``/`` after the emitted tokens opens a regular expression rather than dividing."""
+    if not out:
+        return True
+    if previous in "+-" and "".join(out[-2:]).endswith((previous * 2)):
+        # Postfix ``i++ / 2``: an increment never applies to a regex literal.
+        return False
+    return previous in _REGEX_PRECEDERS or word in _REGEX_KEYWORDS
+
+
+def _skip_regex(source: str, index: int) -> int | None:
+    """Index just past the regex literal at ``index``; ``None`` when no closing ``/`` ends the line."""
+    index += 1
+    in_class = False
+    while index < len(source):
+        current = source[index]
+        if current == "\\":
+            index += 2
+            continue
+        if current == "\n":
+            return None
+        if current == "[":
+            in_class = True
+        elif current == "]":
+            in_class = False
+        elif current == "/" and not in_class:
+            return index + 1
+        index += 1
+    return None
+
+
+def _is_word(char: str) -> bool:
+    return char.isalnum() or char in "_$\\" or ord(char) > 127
+
+
+def _needs_space(previous: str, following: str) -> bool:
+    if _is_word(previous) and _is_word(following):
+        return True
+    if previous.isdigit() and following == ".":
+        return True
+    return previous + following in {"++", "--", "+-", "-+", "//", "/*"} or (previous == "<" and following == "!")
+
+
+def minify_css(source: str) -> str:
+    """Drop comments and redundant whitespace outside strings."""
+    out: List[str] = []
+    length = len(source)
+    index = 0
+    pending = False
+
+    while index < length:
+        char = source[index]
+        if char in " \t\r\n\f":
+            pending = True
+            index += 1
+            continue
+        if source.startswith("/*", index):
+            end = source.find("*/", index + 2)
+            end = length if end == -1 else end + 2
+            if source.startswith("/*!", index):
+                out.append(source[index:end])
+            else:
+                pending = True
+            index = end
+            continue
+
+        if pending and out and out[-1][-1] not in "{};,:>" and char not in "{};,>":
+            out.append(" ")
+        pending = False
+
+        if char in "'\"":
+            end = _skip_string(source, index)
+            out.append(source[index:end])
+            index = end
+            continue
+        if char == "}" and out and out[-1] == ";":
+            out.pop()
+        out.append(char)
+        index += 1
+
+    return "".join(out).strip() + "\n"
+
+
+def vendor_external(
+    frontend_dir: Path, *, timeout: float = 30, log: Callable[[str], None] = _logger.info
+) -> List[Path]:
+    """Download the external scripts and stylesheets of ``index.html`` into ``frontend/vendor``.
+
+    Run once on a machine with internet access; the pipeline then serves the
+    local copies. Files referenced by ``url()`` in a stylesheet (web fonts)
+    are saved next to it and the stylesheet is rewritten to point at them.
+    """
+    html = (frontend_dir / "index.html").read_text(encoding="utf-8")
+    target_dir = frontend_dir / VENDOR_DIR
+    target_dir.mkdir(parents=True, exist_ok=True)
+    saved: List[Path] = []
+
+    def download(url: str) -> bytes:
+        log(f"Baixando {url}")
+        with urllib.request.urlopen(url, timeout=timeout) as handle:  # noqa: S310 - fixed CDN URLs
+            return handle.read()
+
+    for match in _TAG_RE.finditer(html):
+        attributes = {name.lower(): value for name, _, value in _ATTR_RE.findall(match.group(0))}
+        reference = attributes.get("src") or attributes.get("href")
+        if not reference or not _is_external(reference):
+            continue
+        if match.group(1).lower() == "link" and "stylesheet" not in attributes.get("rel", "").lower().split():
+            continue
+        url = "https:" + reference if reference.startswith("//") else reference
+        name = posixpath.basename(urllib.parse.urlsplit(url).path)
+        if not name:
+            continue
+        body = download(url)
+
+        if name.lower().endswith(".css"):
+            text = body.decode("utf-8")
+
+            def localise(found: re.Match) -> str:
+                reference = found.group(2).strip()
+                if reference.startswith(("data:", "#")):
+                    return found.group(0)
+                absolute = urllib.parse.urljoin(url, reference)
+                parts = urllib.parse.urlsplit(absolute)
+                local_name = posixpath.basename(parts.path)
+                local_path = target_dir / local_name
+                if not local_path.exists():
+                    local_path.write_bytes(download(urllib.parse.urlunsplit(parts._replace(fragment=""))))
+                    saved.append(local_path)
+                return f'url("./{local_name}{"#" + parts.fragment if parts.fragment else ""}")'
+
+            body = _CSS_URL_RE.sub(localise, text).encode("utf-8")
+
+        path = target_dir / name
+        path.write_bytes(body)
+        saved.append(path)
+
+    return saved
+
+
+_bundle: AssetBundle | None = None
+
+
+def init_app(app, frontend_dir: Path) -> None:
+    """Build the bundle and register ``/assets/<path>`` when ``ASSET_PIPELINE_ENABLED``.
+
+    Built before any worker is forked, so every process shares the bytes.
+    """
+    global _bundle
+
+    _bundle = None
+    if not app.config.get("ASSET_PIPELINE_ENABLED", True):
+        return
+    if not (frontend_dir / "index.html").is_file():
+        _logger.warning("assets_skipped reason=index_missing path=%s", frontend_dir)
+        return
+
+    started = time.perf_counter()
+    _bundle = AssetBundle(frontend_dir, minify=bool(app.config.get("ASSET_MINIFY", True))).build()
+    stats = _bundle.stats()
+    _logger.info(
+        "assets_built files=%s bytes=%s gzip_bytes=%s ms=%.1f",
+        stats["files"],
+        stats["bytes"],
+        stats["gzip_bytes"],
+        (time.perf_counter() - started) * 1000,
+    )
+    # React and ReactDOM ship in frontend/vendor; anything else still loads from its CDN.
+    for reference in _bundle.external:
+        _logger.warning("assets_cdn_fallback url=%s reason=not_vendored hint=manage.py vendor", reference)
+
+    @app.get(f"{ASSET_URL_PREFIX}/<path:filename>")
+    def asset(filename: str):
+        found = _bundle.get(filename) if _bundle is not None else None
+        if found is None:
+            return Response(status=HTTPStatus.NOT_FOUND)
+        return found.response()
+
+
+def get_bundle() -> AssetBundle | None:
+    """Return the built bundle, or ``None`` when files are served from disk."""
+    return _bundle
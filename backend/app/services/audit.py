@@ -0,0 +1,149 @@
+"""Non-blocking audit logging: request threads enqueue, a listener writes JSON lines."""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+from typing import Any, Callable, Dict, Sequence
+
+AUDIT_LOGGER_NAME = "integration.audit"
+
+_audit_logger = logging.getLogger(AUDIT_LOGGER_NAME)
+
+_listener: QueueListener | None = None
+_listener_handlers: Sequence[logging.Handler] = ()
+_queue: "queue.SimpleQueue[logging.LogRecord] | None" = None
+_queue_handler: QueueHandler | None = None
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Render each record as one JSON object; audit fields are merged at the top level."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        document: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": record.getMessage(),
+            "pid": record.process,
+        }
+        fields = getattr(record, "audit", None)
+        if fields:
+            document.update(fields)
+        return json.dumps(document, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a ``rate`` fraction of INFO/DEBUG records; warnings and errors always pass."""
+
+    def __init__(self, rate: float) -> None:
+        super().__init__()
+        self._rate = min(max(rate, 0.0), 1.0)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self._rate >= 1.0:
+            return True
+        return random.random() < self._rate
+
+
+class _ExcludeAudit(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        return not record.name.startswith(AUDIT_LOGGER_NAME)
+
+
+def audit_event(
+    event: str,
+    *,
+    detail: Dict[str, Any] | Callable[[], Dict[str, Any]] | None = None,
+    **fields: Any,
+) -> None:
+    """Enqueue an audit record.
+
+    ``detail`` is only attached at DEBUG verbosity; pass a callable to skip
+    building it otherwise.
+    """
+    if not _audit_logger.isEnabledFor(logging.INFO):
+        return
+    if detail is not None and _audit_logger.isEnabledFor(logging.DEBUG):
+        fields["detail"] = detail() if callable(detail) else detail
+    _audit_logger.info(event, extra={"audit": fields})
+
+
+def install_pipeline(config, console_handler: logging.Handler) -> None:
+    """Route the root and audit loggers through one queue drained by a listener thread.
+
+    The console keeps the human-readable format without audit records
+    (unless ``AUDIT_LOG_CONSOLE``); the rotating file receives every record
+    as JSON lines.
+    """
+    global _listener, _listener_handlers, _queue, _queue_handler
+
+    stop_pipeline()
+
+    handlers = [console_handler]
+    if not config.get("AUDIT_LOG_CONSOLE"):
+        console_handler.addFilter(_ExcludeAudit())
+
+    log_file = config.get("AUDIT_LOG_FILE")
+    if log_file:
+        path = Path(log_file)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        file_handler = RotatingFileHandler(
+            path,
+            maxBytes=int(config.get("AUDIT_LOG_MAX_BYTES", 10 * 1024 * 1024)),
+            backupCount=int(config.get("AUDIT_LOG_BACKUPS", 5)),
+            encoding="utf-8",
+            delay=True,
+        )
+        file_handler.setFormatter(JsonLinesFormatter())
+        handlers.append(file_handler)
+
+    _queue = queue.SimpleQueue()
+    _listener_handlers = tuple(handlers)
+    _listener = QueueListener(_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    _queue_handler = QueueHandler(_queue)
+    root.addHandler(_queue_handler)
+
+    _audit_logger.setLevel(str(config.get("AUDIT_LOG_LEVEL", "INFO")).upper())
+    for existing in list(_audit_logger.filters):
+        _audit_logger.removeFilter(existing)
+    _audit_logger.addFilter(SamplingFilter(float(config.get("AUDIT_LOG_SAMPLE_RATE", 1.0))))
+
+
+def stop_pipeline() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _restart_after_fork() -> None:
+    # Neither the listener thread nor the queue's internal lock survive fork,
+    # so each child gets a fresh queue and listener. Records still queued
+    # belong to the parent, which writes them itself.
+    global _listener, _queue
+
+    if _queue_handler is not None and _listener is not None:
+        _queue = queue.SimpleQueue()
+        _queue_handler.queue = _queue
+        _listener = QueueListener(_queue, *_listener_handlers, respect_handler_level=True)
+        _listener.start()
+
+
+atexit.register(stop_pipeline)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_after_fork)
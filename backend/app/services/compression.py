@@ -0,0 +1,142 @@
+"""Negotiated gzip compression for API responses."""
+
+from __future__ import annotations
+
+import gzip
+import logging
+import threading
+import time
+from http import HTTPStatus
+from typing import Any, Dict
+
+from flask import Response, request
+
+_logger = logging.getLogger("integration.compression")
+
+# Mimetypes worth compressing; archives such as XLSX are already deflated.
+_COMPRESSIBLE = {
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+}
+
+_SKIPPED_STATUS = {HTTPStatus.NO_CONTENT, HTTPStatus.PARTIAL_CONTENT, HTTPStatus.NOT_MODIFIED}
+
+
+class CompressionStats:
+    """Running totals of what the middleware compressed and what it cost."""
+
+    def __init__(self, min_size: int, level: int) -> None:
+        self._lock = threading.Lock()
+        self._min_size = min_size
+        self._level = level
+        self._responses = 0
+        self._bytes_in = 0
+        self._bytes_out = 0
+        self._cpu_total = 0.0
+
+    def record(self, bytes_in: int, bytes_out: int, cpu: float) -> None:
+        with self._lock:
+            self._responses += 1
+            self._bytes_in += bytes_in
+            self._bytes_out += bytes_out
+            self._cpu_total += cpu
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            responses = self._responses or 1
+            return {
+                "min_size": self._min_size,
+                "level": self._level,
+                "responses": self._responses,
+                "bytes_in": self._bytes_in,
+                "bytes_out": self._bytes_out,
+                "ratio": round(self._bytes_out / self._bytes_in, 4) if self._bytes_in else None,
+                "cpu_ms_total": round(self._cpu_total * 1000, 3),
+                "cpu_ms_avg": round(self._cpu_total / responses * 1000, 3),
+            }
+
+
+_stats: CompressionStats | None = None
+
+
+def init_app(app) -> None:
+    """Gzip eligible responses when ``COMPRESSION_ENABLED`` is set.
+
+    Only buffered bodies of at least ``COMPRESSION_MIN_SIZE`` bytes with a
+    textual mimetype are compressed; streamed downloads, files sent from
+    disk and responses that already carry a ``Content-Encoding`` pass
+    through untouched.
+    """
+    global _stats
+
+    _stats = None
+    if not app.config.get("COMPRESSION_ENABLED", True):
+        return
+
+    min_size = max(int(app.config.get("COMPRESSION_MIN_SIZE", 1024)), 0)
+    level = min(max(int(app.config.get("COMPRESSION_LEVEL", 6)), 1), 9)
+    stats = _stats = CompressionStats(min_size, level)
+
+    @app.after_request
+    def compress_response(response: Response) -> Response:
+        return _compress(response, min_size, level, stats)
+
+
+def _compress(response: Response, min_size: int, level: int, stats: CompressionStats) -> Response:
+    if (
+        response.direct_passthrough
+        or response.is_streamed
+        or response.status_code < HTTPStatus.OK
+        or response.status_code in _SKIPPED_STATUS
+        or "Content-Encoding" in response.headers
+        or not _is_compressible(response.mimetype)
+    ):
+        return response
+
+    body = response.get_data()
+    if len(body) < min_size:
+        return response
+
+    response.vary.add("Accept-Encoding")
+    if request.accept_encodings["gzip"] <= 0:
+        return response
+
+    started = time.thread_time()
+    compressed = gzip.compress(body, compresslevel=level, mtime=0)
+    cpu = time.thread_time() - started
+    if len(compressed) >= len(body):
+        return response
+
+    response.set_data(compressed)
+    response.headers["Content-Encoding"] = "gzip"
+    # The gzip bytes are a different representation; a weak ETag still lets
+    # If-None-Match revalidate against the uncompressed version.
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+    stats.record(len(body), len(compressed), cpu)
+    _logger.debug(
+        "response_compressed path=%s bytes=%s gzip_bytes=%s ratio=%.3f cpu_ms=%.3f",
+        request.path,
+        len(body),
+        len(compressed),
+        len(compressed) / len(body),
+        cpu * 1000,
+    )
+    return response
+
+
+def _is_compressible(mimetype: str | None) -> bool:
+    if not mimetype:
+        return False
+    return mimetype.startswith("text/") and mimetype != "text/event-stream" or mimetype in _COMPRESSIBLE
+
+
+def compression_stats() -> Dict[str, Any]:
+    """Return totals for diagnostics, or ``{"enabled": False}``."""
+    if _stats is None:
+        return {"enabled": False}
+    return _stats.stats()
@@ -2,12 +2,23 @@
 
 from __future__ import annotations
 
-from typing import Dict, Iterable, List
+import copy
+import threading
+from typing import Any, Dict, Iterable, List, Tuple
 
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from ..models import ConfigEntry
+from .metrics import timed
+from .versioning import CONFIGURATION_SCOPE, bump_version, get_version
+
+Snapshot = Dict[str, Dict[str, List[str]]]
+
+# Last snapshot built by this process, tagged with the configuration version
+# it was read at. Other processes invalidate it by bumping the version row.
+_cached_snapshot: Tuple[int, Snapshot] | None = None
+_cache_lock = threading.Lock()
 
 DEFAULT_CONFIGURATION: Dict[str, Dict[str, List[str]]] = {
     "integration": {
@@ -52,6 +63,7 @@ DEFAULT_CONFIGURATION: Dict[str, Dict[str, List[str]]] = {
 
 def bootstrap_defaults(session: Session) -> None:
     """Ensure the configuration table contains default values."""
+    seeded = False
     for scope, groups in DEFAULT_CONFIGURATION.items():
         for key, values in groups.items():
             has_entries = session.execute(
@@ -59,12 +71,55 @@ def bootstrap_defaults(session: Session) -> None:
             ).first()
             if not has_entries:
                 _replace_entries(session, scope, key, values)
+                seeded = True
     session.flush()
+    if seeded:
+        bump_version(session, CONFIGURATION_SCOPE)
+
+
+def get_config_version(session: Session) -> int:
+    """Return the configuration version, bumped by every saved snapshot."""
+    return get_version(session, CONFIGURATION_SCOPE)
+
+
+@timed("config_snapshot")
+def get_snapshot(session: Session, version: int | None = None) -> Snapshot:
+    """Return the current configuration grouped by scope and key.
+
+    Served from an in-process cache while the stored configuration version
+    is unchanged; ``version`` skips the lookup when the caller already has it.
+    """
+    global _cached_snapshot
+
+    if version is None:
+        version = get_config_version(session)
+
+    cached = _cached_snapshot
+    if cached is not None and cached[0] == version:
+        return copy.deepcopy(cached[1])
+
+    snapshot = _read_snapshot(session)
+    with _cache_lock:
+        if _cached_snapshot is None or _cached_snapshot[0] <= version:
+            _cached_snapshot = (version, snapshot)
+    return copy.deepcopy(snapshot)
+
+
+def options_payload(session: Session, scope: str, known_version: str | None = None) -> Dict[str, Any]:
+    """Return the ``options_version`` echoed by write endpoints.
+
+    ``options`` is included only when the client's ``known_version`` differs
+    from the current one, so clients refetch lists only after they change.
+    """
+    version = get_config_version(session)
+    payload: Dict[str, Any] = {"options_version": version}
+    if known_version is None or known_version.strip() != str(version):
+        payload["options"] = get_snapshot(session, version).get(scope, {})
+    return payload
 
 
-def get_snapshot(session: Session) -> Dict[str, Dict[str, List[str]]]:
-    """Return the current configuration grouped by scope and key."""
-    snapshot: Dict[str, Dict[str, List[str]]] = {
+def _read_snapshot(session: Session) -> Snapshot:
+    snapshot: Snapshot = {
         "integration": {k: [] for k in DEFAULT_CONFIGURATION["integration"]},
         "occurrence": {k: [] for k in DEFAULT_CONFIGURATION["occurrence"]},
     }
@@ -80,14 +135,16 @@ def get_snapshot(session: Session) -> Dict[str, Dict[str, List[str]]]:
     return snapshot
 
 
-def save_snapshot(session: Session, payload: Dict[str, Dict[str, Iterable[str]]]) -> Dict[str, Dict[str, List[str]]]:
+def save_snapshot(session: Session, payload: Dict[str, Dict[str, Iterable[str]]]) -> Snapshot:
     """Persist configuration payload and return the refreshed snapshot."""
     for scope, groups in payload.items():
         for key, values in groups.items():
             cleaned_values = [value.strip() for value in values if value and value.strip()]
             _replace_entries(session, scope, key, cleaned_values)
     session.flush()
-    return get_snapshot(session)
+    bump_version(session, CONFIGURATION_SCOPE)
+    # Read uncached: the new version is not visible to others until commit.
+    return _read_snapshot(session)
 
 
 def _replace_entries(session: Session, scope: str, key: str, values: Iterable[str]) -> None:
@@ -0,0 +1,303 @@
+"""Record change notifications for the ``/api/events`` stream.
+
+Events are the entries of the change journal (``services.journal``),
+written in the same transaction as every change, so all worker processes
+see every write and a reconnecting client resumes from ``Last-Event-ID``
+(the journal ``seq``). Each process runs one dispatcher thread that polls
+the journal only while it has subscribers and fans new frames out to all
+of them. Streams handed over by the server (``serving.STREAM_HANDOFF``)
+are plain non-blocking sockets, so an open dashboard holds a file
+descriptor instead of a request thread.
+"""
+
+from __future__ import annotations
+
+import abc
+import json
+import logging
+import os
+import queue
+import socket
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from sqlalchemy import select
+
+from ..database import read_scope
+from ..models import ChangeJournalEntry
+from .journal import journal_horizon, newest_seq
+
+_logger = logging.getLogger("integration.events")
+
+# Events read per dispatcher poll. A stream further behind than this (an
+# import, a long disconnect) gets one "reset" and reloads instead of
+# replaying thousands of rows.
+_POLL_LIMIT = 500
+
+# A client this far behind is dropped; EventSource reconnects and resumes.
+_MAX_PENDING_BYTES = 256 * 1024
+
+_QUEUE_SIZE = 256
+
+_HEARTBEAT = b": keepalive\n\n"
+
+
+def encode_event(event_id: int, data: str, event: str | None = None) -> bytes:
+    """One ``text/event-stream`` frame; ``data`` is single-line JSON."""
+    kind = f"event: {event}\n" if event else ""
+    return f"id: {event_id}\n{kind}data: {data}\n\n".encode("utf-8")
+
+
+def replay(last_event_id: int | None, datasets: Sequence[str]) -> Tuple[int, List[bytes]]:
+    """Frames a new stream starts with, and the journal seq it continues after.
+
+    Without ``last_event_id`` the stream starts at the newest entry. Entries
+    missed since ``last_event_id`` are replayed when still journaled and few
+    enough; otherwise a ``reset`` event tells the client to reload what it shows.
+    """
+    with read_scope() as session:
+        newest = newest_seq(session)
+        frames: List[bytes] = []
+        if last_event_id is not None:
+            if (
+                last_event_id > newest
+                or last_event_id < journal_horizon(session)
+                or newest - last_event_id > _POLL_LIMIT
+            ):
+                frames.append(_reset(newest))
+            else:
+                rows = session.execute(
+                    select(ChangeJournalEntry.seq, ChangeJournalEntry.data)
+                    .where(
+                        ChangeJournalEntry.seq > last_event_id,
+                        ChangeJournalEntry.seq <= newest,
+                        ChangeJournalEntry.dataset.in_(datasets),
+                    )
+                    .order_by(ChangeJournalEntry.seq)
+                )
+                frames.extend(encode_event(seq, data) for seq, data in rows)
+    frames.append(encode_event(newest, _dumps({"last_event_id": newest}), "ready"))
+    return newest, frames
+
+
+class _Subscriber(abc.ABC):
+    def __init__(self, cursor: int, datasets: Iterable[str]) -> None:
+        self.cursor = cursor
+        self.datasets = frozenset(datasets)
+        self.last_write = time.monotonic()
+        self.pending_reset = False
+
+    @abc.abstractmethod
+    def deliver(self, data: bytes) -> bool:
+        """Queue ``data`` for the client; ``False`` drops the subscriber."""
+
+    def alive(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        pass
+
+
+class SocketSubscriber(_Subscriber):
+    """A client connection taken over from the server after the response headers."""
+
+    def __init__(self, sock: socket.socket, cursor: int, datasets: Iterable[str]) -> None:
+        super().__init__(cursor, datasets)
+        sock.setblocking(False)
+        self._sock = sock
+        self._pending = bytearray()
+
+    def deliver(self, data: bytes) -> bool:
+        self._pending += data
+        if len(self._pending) > _MAX_PENDING_BYTES:
+            return False
+        if not self._pending:
+            return True
+        try:
+            sent = self._sock.send(self._pending)
+        except BlockingIOError:
+            return True
+        except OSError:
+            return False
+        del self._pending[:sent]
+        return True
+
+    def alive(self) -> bool:
+        # Writes into a closed connection can succeed for a while; an empty peek is the peer's FIN.
+        try:
+            return self._sock.recv(1, socket.MSG_PEEK) != b""
+        except BlockingIOError:
+            return True
+        except OSError:
+            return False
+
+    def close(self) -> None:
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+
+
+class QueueSubscriber(_Subscriber):
+    """Frames for a response generator, on servers that cannot hand over the socket."""
+
+    def __init__(self, cursor: int, datasets: Iterable[str]) -> None:
+        super().__init__(cursor, datasets)
+        self._queue: "queue.Queue[bytes]" = queue.Queue(maxsize=_QUEUE_SIZE)
+        self._closed = threading.Event()
+
+    def deliver(self, data: bytes) -> bool:
+        if not data:
+            return True
+        try:
+            self._queue.put_nowait(data)
+        except queue.Full:
+            return False
+        return True
+
+    def close(self) -> None:
+        self._closed.set()
+
+    def frames(self, timeout: float) -> Iterator[bytes]:
+        while not self._closed.is_set():
+            try:
+                yield self._queue.get(timeout=timeout)
+            except queue.Empty:
+                continue
+
+
+class EventHub:
+    """Per-process dispatcher from the change journal to the open streams.
+
+    One poll serves every subscriber of the process: frames are encoded
+    once, each subscriber gets the events past its own cursor, and idle
+    streams get a comment line every ``heartbeat_seconds``.
+    """
+
+    def __init__(self, poll_ms: int, heartbeat_seconds: int) -> None:
+        self._interval = max(poll_ms, 10) / 1000
+        self._heartbeat = max(heartbeat_seconds, 1)
+        self._lock = threading.Lock()
+        self._subscribers: List[_Subscriber] = []
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+        self._events = 0
+        self._dropped = 0
+
+    def subscribe(self, subscriber: _Subscriber) -> None:
+        self._ensure_thread()
+        with self._lock:
+            self._subscribers.append(subscriber)
+        self._wake.set()
+
+    def unsubscribe(self, subscriber: _Subscriber) -> None:
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+        subscriber.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "subscribers": len(self._subscribers),
+                "events_dispatched": self._events,
+                "subscribers_dropped": self._dropped,
+                "poll_ms": round(self._interval * 1000),
+            }
+
+    def _ensure_thread(self) -> None:
+        # Threads do not survive fork, so each worker process starts its own.
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="event-hub", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self._interval)
+            self._wake.clear()
+            with self._lock:
+                subscribers = list(self._subscribers)
+            if not subscribers:
+                continue
+            try:
+                if self._dispatch(subscribers):
+                    self._wake.set()
+            except Exception:
+                _logger.exception("events_dispatch_failed subscribers=%s", len(subscribers))
+
+    def _dispatch(self, subscribers: List[_Subscriber]) -> bool:
+        """Send what is new to ``subscribers``; ``True`` when more entries are waiting."""
+        with read_scope() as session:
+            newest = newest_seq(session)
+            for subscriber in subscribers:
+                if newest - subscriber.cursor > _POLL_LIMIT:
+                    subscriber.cursor = newest
+                    subscriber.pending_reset = True
+            cursor = min(subscriber.cursor for subscriber in subscribers)
+            rows = session.execute(
+                select(ChangeJournalEntry.seq, ChangeJournalEntry.dataset, ChangeJournalEntry.data)
+                .where(ChangeJournalEntry.seq > cursor)
+                .order_by(ChangeJournalEntry.seq)
+                .limit(_POLL_LIMIT)
+            ).all()
+        frames = [(seq, dataset, encode_event(seq, data)) for seq, dataset, data in rows]
+        last = frames[-1][0] if frames else cursor
+
+        now = time.monotonic()
+        dropped: List[_Subscriber] = []
+        for subscriber in subscribers:
+            chunk = b"".join(
+                frame for seq, dataset, frame in frames if seq > subscriber.cursor and dataset in subscriber.datasets
+            )
+            if subscriber.pending_reset:
+                subscriber.pending_reset = False
+                chunk = _reset(subscriber.cursor) + chunk
+            subscriber.cursor = max(subscriber.cursor, last)
+            if not chunk and now - subscriber.last_write >= self._heartbeat:
+                if not subscriber.alive():
+                    dropped.append(subscriber)
+                    continue
+                chunk = _HEARTBEAT
+            if chunk:
+                subscriber.last_write = now
+            if not subscriber.deliver(chunk):
+                dropped.append(subscriber)
+
+        for subscriber in dropped:
+            self.unsubscribe(subscriber)
+        with self._lock:
+            self._events += len(frames)
+            self._dropped += len(dropped)
+        return len(rows) == _POLL_LIMIT
+
+
+_hub: EventHub | None = None
+
+
+def init_app(app) -> None:
+    """Create this process's dispatcher."""
+    global _hub
+
+    _hub = EventHub(
+        poll_ms=int(app.config.get("EVENTS_POLL_MS", 500)),
+        heartbeat_seconds=int(app.config.get("EVENTS_HEARTBEAT_SECONDS", 15)),
+    )
+
+
+def get_hub() -> EventHub:
+    if _hub is None:
+        raise RuntimeError("Event hub not initialised. Call init_app first.")
+    return _hub
+
+
+def _reset(seq: int) -> bytes:
+    return encode_event(seq, _dumps({"last_event_id": seq}), "reset")
+
+
+def _dumps(document: Dict[str, Any]) -> str:
+    return json.dumps(document, ensure_ascii=False, separators=(",", ":"))
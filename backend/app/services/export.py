@@ -0,0 +1,220 @@
+"""Streaming spreadsheet export engine shared by the record blueprints."""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import tempfile
+from dataclasses import dataclass
+from itertools import chain, islice
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Sequence
+
+from flask import Response, send_file
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.utils import get_column_letter
+
+from ..database import read_scope
+from .metrics import observe_stream
+from .projection import execute_rows
+
+XLSX_MIMETYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+STREAM_MIMETYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+# Rows fetched per round-trip when streaming query results into an export.
+EXPORT_CHUNK_SIZE = 1000
+
+# Leading rows buffered to size the columns. Write-only sheets emit their
+# column widths before the first row, so widths come from this sample.
+_WIDTH_SAMPLE_ROWS = 500
+_MIN_COLUMN_WIDTH = 12
+_MAX_COLUMN_WIDTH = 48
+
+# Rows serialized per chunk handed to the WSGI server when streaming text.
+_STREAM_CHUNK_ROWS = 500
+
+# Spooled exports stay in memory below this size and move to disk above it.
+_SPOOL_MAX_SIZE = 4 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class SheetLayout:
+    """Title, header captions and accent colour of an exported sheet."""
+
+    title: str
+    headers: Sequence[str]
+    header_color: str
+
+
+def write_workbook(layout: SheetLayout, rows: Iterable[Sequence[Any]], stream: IO[bytes] | None = None) -> IO[bytes]:
+    """Stream ``rows`` into a write-only workbook.
+
+    Rows are consumed lazily and cells share two named styles. Without an
+    explicit ``stream`` the workbook is spooled to a temporary file, returned
+    rewound and ready to be sent.
+    """
+    workbook = Workbook(write_only=True)
+    header_style, body_style = _register_styles(workbook, layout.header_color)
+    sheet = workbook.create_sheet(layout.title)
+
+    rows = iter(rows)
+    sample = list(islice(rows, _WIDTH_SAMPLE_ROWS))
+    widths = [len(header) for header in layout.headers]
+    for row in sample:
+        _measure(widths, row)
+
+    for index, width in enumerate(widths, start=1):
+        adjusted = min(width + 4, _MAX_COLUMN_WIDTH)
+        sheet.column_dimensions[get_column_letter(index)].width = max(adjusted, _MIN_COLUMN_WIDTH)
+
+    sheet.freeze_panes = "A2"
+    sheet.auto_filter.ref = f"A1:{get_column_letter(len(layout.headers))}1"
+
+    header_array = _style_template(sheet, header_style)
+    body_array = _style_template(sheet, body_style)
+    sheet.append(_styled_cells(sheet, layout.headers, header_array))
+    for row in chain(sample, rows):
+        sheet.append(_styled_cells(sheet, row, body_array))
+
+    if stream is None:
+        stream = tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_SIZE)
+    workbook.save(stream)
+    stream.seek(0)
+    return stream
+
+
+def send_spreadsheet(stream: IO[bytes], filename: str):
+    """Return a Flask file response compatible with older Flask releases."""
+    try:
+        return send_file(stream, mimetype=XLSX_MIMETYPE, as_attachment=True, download_name=filename)
+    except TypeError:
+        stream.seek(0)
+        return send_file(stream, mimetype=XLSX_MIMETYPE, as_attachment=True, attachment_filename=filename)
+
+
+def stream_records(
+    fmt: str,
+    stmt,
+    *,
+    columns: Sequence[str],
+    to_row: Callable[[Any], Sequence[Any]],
+    to_document: Callable[[Any], Dict[str, Any]],
+    filename: str | None = None,
+    dataset: str | None = None,
+) -> Response:
+    """Stream the rows selected by ``stmt`` as CSV or NDJSON.
+
+    The query runs on its own session inside the response generator with a
+    server-side cursor, so memory stays bounded regardless of result size.
+    Exports pass ``dataset`` to be timed in ``/api/metrics``.
+    """
+    records = _iter_records(stmt)
+    if dataset is not None:
+        records = observe_stream(records, dataset, fmt)
+    body = iter_text_chunks(fmt, records, columns=columns, to_row=to_row, to_document=to_document)
+    response = Response(body, mimetype=STREAM_MIMETYPES[fmt])
+    if filename:
+        response.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+
+def iter_text_chunks(
+    fmt: str,
+    records: Iterable[Any],
+    *,
+    columns: Sequence[str],
+    to_row: Callable[[Any], Sequence[Any]],
+    to_document: Callable[[Any], Dict[str, Any]],
+) -> Iterator[str]:
+    """Serialize ``records`` as CSV or NDJSON text in bounded chunks."""
+    if fmt == "csv":
+        return _csv_chunks(records, columns, to_row)
+    return _ndjson_chunks(records, to_document)
+
+
+def _iter_records(stmt) -> Iterator[Any]:
+    with read_scope() as session:
+        yield from execute_rows(session, stmt, yield_per=EXPORT_CHUNK_SIZE)
+
+
+def _csv_chunks(records: Iterable[Any], columns: Sequence[str], to_row: Callable[[Any], Sequence[Any]]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield _drain(buffer)
+
+    pending = 0
+    for record in records:
+        writer.writerow(to_row(record))
+        pending += 1
+        if pending >= _STREAM_CHUNK_ROWS:
+            yield _drain(buffer)
+            pending = 0
+    if pending:
+        yield _drain(buffer)
+
+
+def _ndjson_chunks(records: Iterable[Any], to_document: Callable[[Any], Dict[str, Any]]) -> Iterator[str]:
+    lines: List[str] = []
+    for record in records:
+        lines.append(json.dumps(to_document(record), ensure_ascii=False))
+        if len(lines) >= _STREAM_CHUNK_ROWS:
+            yield "\n".join(lines) + "\n"
+            lines.clear()
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def _drain(buffer: io.StringIO) -> str:
+    chunk = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate(0)
+    return chunk
+
+
+def _register_styles(workbook: Workbook, header_color: str) -> tuple[str, str]:
+    thin = Side(style="thin", color="D1D5DB")
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+
+    header = NamedStyle(name="export_header")
+    header.font = Font(bold=True, color="FFFFFFFF")
+    header.fill = PatternFill(fill_type="solid", fgColor=header_color)
+    header.alignment = Alignment(vertical="center", horizontal="left")
+    header.border = border
+
+    body = NamedStyle(name="export_body")
+    body.alignment = Alignment(vertical="top", wrap_text=True)
+    body.border = border
+
+    workbook.add_named_style(header)
+    workbook.add_named_style(body)
+    return header.name, body.name
+
+
+def _style_template(sheet, style: str):
+    """Resolve a named style once; cells then share the resulting style array."""
+    template = WriteOnlyCell(sheet)
+    template.style = style
+    return template._style
+
+
+def _styled_cells(sheet, values: Sequence[Any], style_array) -> List[WriteOnlyCell]:
+    cells = []
+    for value in values:
+        cell = WriteOnlyCell(sheet, value=value)
+        cell._style = style_array
+        cells.append(cell)
+    return cells
+
+
+def _measure(widths: List[int], row: Sequence[Any]) -> None:
+    for index, value in enumerate(row):
+        length = len(str(value)) if value is not None else 0
+        if length > widths[index]:
+            widths[index] = length
@@ -0,0 +1,455 @@
+"""Background export jobs backed by an on-disk result cache.
+
+Each job's state is mirrored to ``<job_id>.job.json`` next to its result,
+so any worker process of the prefork server can answer status polls for a
+job another worker is running.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence
+
+from sqlalchemy import func, select
+from werkzeug.datastructures import MultiDict
+
+from ..database import read_scope
+from .export import EXPORT_CHUNK_SIZE, SheetLayout, iter_text_chunks, write_workbook
+from .filters import NO_FILTERS, FilterSet, RecordFilters
+from .metrics import record_export
+from .projection import execute_rows
+from .versioning import get_version
+
+_logger = logging.getLogger("integration.export")
+
+EXPORT_FORMATS = ("xlsx", "csv", "ndjson")
+
+# Finished jobs are forgotten after this many seconds; their files stay cached.
+_JOB_RETENTION_SECONDS = 3600
+
+_STATE_SUFFIX = ".job.json"
+
+# A running job rewrites its state file at most this often with its progress.
+_PROGRESS_INTERVAL_SECONDS = 1.0
+
+# Unfinished jobs touch their state file this often; where the owner's pid
+# cannot be probed (Windows), a file older than the stale limit means it died.
+_HEARTBEAT_SECONDS = 10.0
+_STALE_AFTER_SECONDS = 60.0
+
+# os.kill(pid, 0) would signal the process on Windows.
+_CAN_PROBE_PIDS = os.name == "posix"
+
+# Job ids are the 32 hex digits produced by _cache_key.
+_JOB_ID_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+
+@dataclass(frozen=True)
+class ExportDataset:
+    """Everything the job runner needs to export one record table."""
+
+    name: str
+    scope: str
+    filename_prefix: str
+    layout: SheetLayout
+    build_statement: Callable[[str, str, str, RecordFilters, bool], Any]
+    to_row: Callable[[Any], Sequence[Any]]
+    to_document: Callable[[Any], Dict[str, Any]]
+    filters: FilterSet | None = None
+
+
+@dataclass
+class ExportJob:
+    job_id: str
+    dataset: str
+    fmt: str
+    search: str
+    sort_by: str
+    sort_order: str
+    path: Path
+    filters: RecordFilters = NO_FILTERS
+    include_archive: bool = False
+    status: str = "queued"
+    rows_written: int = 0
+    total_rows: int | None = None
+    error: str | None = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: datetime | None = None
+
+    @property
+    def filename(self) -> str:
+        prefix = _DATASETS[self.dataset].filename_prefix if self.dataset in _DATASETS else "exportacao"
+        return f"{prefix}_{self.created_at.astimezone().strftime('%Y%m%d_%H%M%S')}.{self.fmt}"
+
+    @classmethod
+    def from_state(cls, document: Dict[str, Any], path: Path) -> "ExportJob":
+        """Rebuild a job described by another process's state file."""
+        dataset = _DATASETS.get(document["dataset"])
+        filters = NO_FILTERS
+        if dataset is not None and dataset.filters is not None:
+            filters = dataset.filters.restore(document.get("filter_state") or {})
+        finished_at = document.get("finished_at")
+        return cls(
+            document["job_id"],
+            document["dataset"],
+            document["format"],
+            document.get("search", ""),
+            document.get("sort_by", ""),
+            document.get("sort_order", ""),
+            path,
+            filters,
+            bool(document.get("include_archive")),
+            status=document["status"],
+            rows_written=int(document.get("rows_written") or 0),
+            total_rows=document.get("total_rows"),
+            error=document.get("error"),
+            created_at=datetime.fromisoformat(document["created_at"]),
+            finished_at=datetime.fromisoformat(finished_at) if finished_at else None,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        progress = None
+        if self.status == "done":
+            progress = 1.0
+        elif self.total_rows:
+            progress = round(min(self.rows_written / self.total_rows, 1.0), 4)
+        return {
+            "job_id": self.job_id,
+            "dataset": self.dataset,
+            "format": self.fmt,
+            "filters": self.filters.to_dict(),
+            "include_archive": self.include_archive,
+            "status": self.status,
+            "rows_written": self.rows_written,
+            "total_rows": self.total_rows,
+            "progress": progress,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+_DATASETS: Dict[str, ExportDataset] = {}
+
+
+def register_dataset(dataset: ExportDataset) -> None:
+    """Expose a record table to the background exporter."""
+    _DATASETS[dataset.name] = dataset
+
+
+class ExportJobManager:
+    """Run exports on a bounded pool and reuse results keyed by data version."""
+
+    def __init__(self, cache_dir: Path, workers: int, max_bytes: int, max_files: int) -> None:
+        self._cache_dir = cache_dir
+        self._max_bytes = max_bytes
+        self._max_files = max_files
+        self._max_pending = max(workers, 1) * 8
+        self._executor = ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix="export")
+        self._jobs: Dict[str, ExportJob] = {}
+        self._lock = threading.Lock()
+        self._heartbeat: threading.Thread | None = None
+        self._heartbeat_pid: int | None = None
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def submit(
+        self,
+        dataset_name: str,
+        fmt: str,
+        search: str,
+        sort_by: str,
+        sort_order: str,
+        filter_args: MultiDict | None = None,
+        include_archive: bool = False,
+    ) -> ExportJob:
+        """Return a finished job from cache or queue a new export.
+
+        ``filter_args`` are parsed by the dataset's ``FilterSet``; invalid
+        values raise ``ValueError``.
+        """
+        dataset = _DATASETS.get(dataset_name)
+        if dataset is None:
+            raise ValueError("Conjunto de dados de exportação inválido.")
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError("Formato de exportação inválido.")
+        filters = dataset.filters.parse(filter_args) if dataset.filters and filter_args else NO_FILTERS
+
+        with read_scope() as session:
+            version = get_version(session, dataset.scope)
+
+        job_id = _cache_key(dataset_name, fmt, search, sort_by, sort_order, filters, include_archive, version)
+        path = self._cache_dir / f"{job_id}.{fmt}"
+
+        with self._lock:
+            self._forget_finished()
+            job = self._jobs.get(job_id) or self._load_state(job_id)
+            if job is not None and job.status in {"queued", "running"}:
+                return job
+            if job is not None and job.status == "done" and path.exists():
+                return job
+
+            job = ExportJob(job_id, dataset_name, fmt, search, sort_by, sort_order, path, filters, include_archive)
+            if path.exists():
+                _touch(path)
+                job.status = "done"
+                job.finished_at = job.created_at
+                self._jobs[job_id] = job
+                return job
+
+            pending = sum(1 for item in self._jobs.values() if item.status in {"queued", "running"})
+            if pending >= self._max_pending:
+                raise RuntimeError("Fila de exportação cheia. Tente novamente em instantes.")
+
+            self._jobs[job_id] = job
+            self._save_state(job)
+            self._ensure_heartbeat()
+
+        self._executor.submit(self._run, job, dataset)
+        return job
+
+    def get(self, job_id: str) -> ExportJob | None:
+        """Look up a job, falling back to the state and result files written by other processes."""
+        if not _JOB_ID_PATTERN.fullmatch(job_id):
+            return None
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+
+        job = self._load_state(job_id)
+        if job is not None:
+            return job
+
+        for path in self._cache_dir.glob(f"{job_id}.*"):
+            fmt = path.suffix.lstrip(".")
+            if fmt in EXPORT_FORMATS:
+                stat = path.stat()
+                finished = datetime.fromtimestamp(stat.st_mtime, timezone.utc)
+                return ExportJob(job_id, "", fmt, "", "", "", path, status="done", created_at=finished, finished_at=finished)
+        return None
+
+    def open_result(self, job: ExportJob) -> Path:
+        """Mark a finished file as recently used and return its path."""
+        _touch(job.path)
+        return job.path
+
+    def _run(self, job: ExportJob, dataset: ExportDataset) -> None:
+        job.status = "running"
+        self._save_state(job)
+        started = time.perf_counter()
+        partial = job.path.with_name(f"{job.path.name}.{os.getpid()}.{threading.get_ident()}.part")
+        try:
+            stmt = dataset.build_statement(job.search, job.sort_by, job.sort_order, job.filters, job.include_archive)
+            with read_scope() as session:
+                count_stmt = select(func.count()).select_from(stmt.order_by(None).subquery())
+                job.total_rows = session.execute(count_stmt).scalar_one()
+                self._save_state(job)
+                records = execute_rows(session, stmt, yield_per=EXPORT_CHUNK_SIZE)
+                tracked = self._track(job, records)
+                with open(partial, "wb") as stream:
+                    if job.fmt == "xlsx":
+                        write_workbook(dataset.layout, (dataset.to_row(record) for record in tracked), stream)
+                    else:
+                        chunks = iter_text_chunks(
+                            job.fmt,
+                            tracked,
+                            columns=dataset.layout.headers,
+                            to_row=dataset.to_row,
+                            to_document=dataset.to_document,
+                        )
+                        for chunk in chunks:
+                            stream.write(chunk.encode("utf-8"))
+            os.replace(partial, job.path)
+            job.status = "done"
+        except Exception as error:  # pragma: no cover - surfaced through job status
+            _logger.exception("export_job_failed job_id=%s", job.job_id)
+            job.status = "failed"
+            job.error = str(error) or error.__class__.__name__
+            partial.unlink(missing_ok=True)
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+            self._save_state(job)
+            record_export(dataset.name, job.fmt, "job", job.status, time.perf_counter() - started, job.rows_written)
+
+        if job.status == "done":
+            self._evict()
+
+    def _track(self, job: ExportJob, records):
+        saved_at = time.monotonic()
+        for record in records:
+            yield record
+            job.rows_written += 1
+            if time.monotonic() - saved_at >= _PROGRESS_INTERVAL_SECONDS:
+                self._save_state(job)
+                saved_at = time.monotonic()
+
+    def _state_path(self, job_id: str) -> Path:
+        return self._cache_dir / f"{job_id}{_STATE_SUFFIX}"
+
+    def _save_state(self, job: ExportJob) -> None:
+        document = job.to_dict()
+        document.update(
+            search=job.search,
+            sort_by=job.sort_by,
+            sort_order=job.sort_order,
+            filter_state=job.filters.to_state(),
+            pid=os.getpid(),
+        )
+        path = self._state_path(job.job_id)
+        partial = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.part")
+        try:
+            partial.write_text(json.dumps(document, ensure_ascii=False), encoding="utf-8")
+            os.replace(partial, path)
+        except OSError as error:
+            _logger.warning("export_state_write_failed job_id=%s error=%s", job.job_id, error)
+
+    def _load_state(self, job_id: str) -> ExportJob | None:
+        """The job as last saved by any process; unfinished jobs of a dead process read as failed."""
+        path = self._state_path(job_id)
+        try:
+            document = json.loads(path.read_text(encoding="utf-8"))
+            job = ExportJob.from_state(document, self._cache_dir / f"{job_id}.{document['format']}")
+            saved_at = path.stat().st_mtime
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if job.status in {"queued", "running"} and not _owner_alive(int(document.get("pid") or 0), saved_at):
+            job.status = "failed"
+            job.error = "Exportação interrompida. Solicite novamente."
+        return job
+
+    def _ensure_heartbeat(self) -> None:
+        # Called under self._lock. Threads do not survive fork, so each worker starts its own.
+        if self._heartbeat is not None and self._heartbeat.is_alive() and self._heartbeat_pid == os.getpid():
+            return
+        self._heartbeat_pid = os.getpid()
+        self._heartbeat = threading.Thread(target=self._beat, name="export-heartbeat", daemon=True)
+        self._heartbeat.start()
+
+    def _beat(self) -> None:
+        while True:
+            time.sleep(_HEARTBEAT_SECONDS)
+            with self._lock:
+                unfinished = [job.job_id for job in self._jobs.values() if job.status in {"queued", "running"}]
+            for job_id in unfinished:
+                _touch(self._state_path(job_id))
+
+    def _forget_finished(self) -> None:
+        now = datetime.now(timezone.utc)
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished_at and (now - job.finished_at).total_seconds() > _JOB_RETENTION_SECONDS
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def _evict(self) -> None:
+        """Drop least recently used files beyond the size and count limits."""
+        entries: List[tuple[float, int, Path]] = []
+        now = time.time()
+        for path in self._cache_dir.iterdir():
+            if path.name.endswith(_STATE_SUFFIX):
+                self._drop_stale_state(path, now)
+                continue
+            if path.suffix.lstrip(".") not in EXPORT_FORMATS:
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        entries.sort()
+        total_bytes = sum(size for _, size, _ in entries)
+        while entries and (total_bytes > self._max_bytes or len(entries) > self._max_files):
+            _, size, path = entries.pop(0)
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total_bytes -= size
+            self._state_path(path.stem).unlink(missing_ok=True)
+            _logger.info("export_cache_evicted file=%s bytes=%s", path.name, size)
+
+    def _drop_stale_state(self, path: Path, now: float) -> None:
+        """Remove state files of failed or evicted jobs once they are past retention."""
+        job_id = path.name[: -len(_STATE_SUFFIX)]
+        try:
+            if now - path.stat().st_mtime <= _JOB_RETENTION_SECONDS:
+                return
+        except OSError:
+            return
+        if not any((self._cache_dir / f"{job_id}.{fmt}").exists() for fmt in EXPORT_FORMATS):
+            path.unlink(missing_ok=True)
+
+
+_manager: ExportJobManager | None = None
+
+
+def init_app(app) -> None:
+    """Create the export job manager from the Flask configuration."""
+    global _manager
+
+    _manager = ExportJobManager(
+        cache_dir=Path(app.config["EXPORT_CACHE_DIR"]),
+        workers=int(app.config.get("EXPORT_WORKERS", 2)),
+        max_bytes=int(app.config.get("EXPORT_CACHE_MAX_BYTES", 512 * 1024 * 1024)),
+        max_files=int(app.config.get("EXPORT_CACHE_MAX_FILES", 64)),
+    )
+
+
+def get_manager() -> ExportJobManager:
+    if _manager is None:
+        raise RuntimeError("Export jobs not initialised. Call init_app first.")
+    return _manager
+
+
+def _cache_key(
+    dataset: str,
+    fmt: str,
+    search: str,
+    sort_by: str,
+    sort_order: str,
+    filters: RecordFilters,
+    include_archive: bool,
+    version: int,
+) -> str:
+    document = json.dumps(
+        [dataset, fmt, search, sort_by, sort_order.lower(), filters.to_dict(), include_archive, version],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(document.encode("utf-8")).hexdigest()[:32]
+
+
+def _owner_alive(pid: int, saved_at: float) -> bool:
+    """Whether the process that saved a job's state at ``saved_at`` is still running it."""
+    if pid == os.getpid():
+        return True
+    if pid <= 0:
+        return False
+    if not _CAN_PROBE_PIDS:
+        return time.time() - saved_at <= _STALE_AFTER_SECONDS
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+def _touch(path: Path) -> None:
+    try:
+        os.utime(path)
+    except OSError:
+        pass
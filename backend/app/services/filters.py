@@ -0,0 +1,158 @@
+"""Typed field filters for the record listings and exports."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Any, Callable, Dict, List, Mapping, Tuple
+
+from sqlalchemy import Date
+from werkzeug.datastructures import MultiDict
+
+
+@dataclass(frozen=True)
+class RecordFilters:
+    """Parsed filters: exact values per field and inclusive ``(low, high)`` bounds."""
+
+    equals: Tuple[Tuple[str, Tuple[Any, ...]], ...] = ()
+    bounds: Tuple[Tuple[str, Any, Any], ...] = ()
+
+    def __bool__(self) -> bool:
+        return bool(self.equals or self.bounds)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly form, stable for a given set of filters."""
+        document: Dict[str, Any] = {name: list(values) for name, values in self.equals}
+        for name, low, high in self.bounds:
+            document[name] = [_plain(low), _plain(high)]
+        return document
+
+    def to_state(self) -> Dict[str, Any]:
+        """Lossless JSON form, read back by :meth:`FilterSet.restore`."""
+        return {
+            "equals": [[name, list(values)] for name, values in self.equals],
+            "bounds": [[name, _plain(low), _plain(high)] for name, low, high in self.bounds],
+        }
+
+
+NO_FILTERS = RecordFilters()
+
+
+@dataclass(frozen=True)
+class FilterSet:
+    """Which columns of a table accept which kind of filter.
+
+    ``exact`` fields take one or more values (``setor=A&setor=B``); ``ranges``
+    take ``<name>_min``/``<name>_max``; ``dates`` take ``<name>_from``/``<name>_to``
+    as ``YYYY-MM-DD`` or ``dd/mm/YYYY``. Every bound is inclusive. ``normalize``
+    maps an exact field to the function ingestion applies to its stored values,
+    so a filter value matches however the client typed it.
+    """
+
+    exact: Mapping[str, Any]
+    ranges: Mapping[str, Any] = field(default_factory=dict)
+    dates: Mapping[str, Any] = field(default_factory=dict)
+    normalize: Mapping[str, Callable[[str], str]] = field(default_factory=dict)
+
+    def parse(self, args: MultiDict) -> RecordFilters:
+        """Validate request arguments; raises ``ValueError`` with a user-facing message."""
+        equals = []
+        for name in self.exact:
+            normalize = self.normalize.get(name, _identity)
+            values = tuple(dict.fromkeys(normalize(value.strip()) for value in args.getlist(name) if value.strip()))
+            if values:
+                equals.append((name, values))
+
+        bounds = []
+        for name in self.ranges:
+            low = _parse_int(args.get(f"{name}_min"), f"{name}_min")
+            high = _parse_int(args.get(f"{name}_max"), f"{name}_max")
+            if low is not None and high is not None and low > high:
+                raise ValueError(f"'{name}_min' deve ser menor ou igual a '{name}_max'.")
+            if low is not None or high is not None:
+                bounds.append((name, low, high))
+        for name in self.dates:
+            start = parse_date(args.get(f"{name}_from"), f"{name}_from")
+            end = parse_date(args.get(f"{name}_to"), f"{name}_to")
+            if start and end and start > end:
+                raise ValueError(f"'{name}_from' deve ser anterior ou igual a '{name}_to'.")
+            if start is not None or end is not None:
+                bounds.append((name, start, end))
+
+        return RecordFilters(tuple(equals), tuple(bounds))
+
+    def restore(self, state: Mapping[str, Any]) -> RecordFilters:
+        """Rebuild filters saved with :meth:`RecordFilters.to_state`."""
+        equals = tuple((name, tuple(values)) for name, values in state.get("equals", ()) if name in self.exact)
+        bounds = []
+        for name, low, high in state.get("bounds", ()):
+            if name in self.dates:
+                low, high = _restore_date(low), _restore_date(high)
+            elif name not in self.ranges:
+                continue
+            bounds.append((name, low, high))
+        return RecordFilters(equals, tuple(bounds))
+
+    def clauses(self, filters: RecordFilters) -> List[Any]:
+        clauses: List[Any] = []
+        for name, values in filters.equals:
+            column = self.exact[name]
+            clauses.append(column == values[0] if len(values) == 1 else column.in_(values))
+        for name, low, high in filters.bounds:
+            if name in self.dates:
+                clauses.extend(date_range_clauses(self.dates[name], low, high))
+                continue
+            column = self.ranges[name]
+            if low is not None:
+                clauses.append(column >= low)
+            if high is not None:
+                clauses.append(column <= high)
+        return clauses
+
+
+def parse_date(value: str | None, name: str) -> date | None:
+    """Accept ``YYYY-MM-DD`` or ``dd/mm/YYYY``."""
+    if value is None or not value.strip():
+        return None
+    text = value.strip()
+    for pattern in ("%Y-%m-%d", "%d/%m/%Y"):
+        try:
+            return datetime.strptime(text, pattern).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Data inválida em '{name}': use AAAA-MM-DD ou DD/MM/AAAA.")
+
+
+def date_range_clauses(column, start: date | None, end: date | None) -> List[Any]:
+    """Inclusive day range on a ``Date`` or ``DateTime`` column, as index-friendly comparisons."""
+    clauses: List[Any] = []
+    is_date = isinstance(column.type, Date)
+    if start is not None:
+        clauses.append(column >= (start if is_date else datetime.combine(start, time.min)))
+    if end is not None:
+        if is_date:
+            clauses.append(column <= end)
+        else:
+            clauses.append(column < datetime.combine(end + timedelta(days=1), time.min))
+    return clauses
+
+
+def _parse_int(value: str | None, name: str) -> int | None:
+    if value is None or not value.strip():
+        return None
+    try:
+        return int(value.strip())
+    except ValueError as error:
+        raise ValueError(f"Valor inválido para '{name}': {value}") from error
+
+
+def _plain(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, date) else value
+
+
+def _restore_date(value: str | None) -> date | None:
+    return date.fromisoformat(value) if value else None
+
+
+def _identity(value: str) -> str:
+    return value
@@ -0,0 +1,186 @@
+"""Group commit: coalesce concurrent single-record writes into one transaction."""
+
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, List, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..database import session_scope
+
+_logger = logging.getLogger("integration.group_commit")
+
+# Upper bounds of the batch size histogram reported in diagnostics.
+_BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+# How long a caller waits for its write before giving up.
+_SUBMIT_TIMEOUT_SECONDS = 30
+
+_Persist = Callable[[Session, Dict[str, Any]], Any]
+_Pending = Tuple[_Persist, Dict[str, Any], Future]
+
+
+class GroupCommitTimeout(RuntimeError):
+    """The write was still queued when the caller stopped waiting; it will not run."""
+
+
+class GroupCommitter:
+    """Collect writes for up to ``window_ms`` or ``max_batch`` items and commit them together.
+
+    Each write runs inside its own savepoint, so a row that fails only
+    resolves its own caller with the error while the rest of the group
+    still commits.
+    """
+
+    def __init__(self, window_ms: int, max_batch: int) -> None:
+        self._window = max(window_ms, 0) / 1000
+        self._max_batch = max(max_batch, 1)
+        self._queue: "queue.Queue[_Pending]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+        self._batches = 0
+        self._items = 0
+        self._max_seen = 0
+        self._commit_total = 0.0
+        self._histogram = {bucket: 0 for bucket in _BATCH_BUCKETS}
+        self._histogram_overflow = 0
+
+    def submit(self, persist: _Persist, payload: Dict[str, Any]) -> Any:
+        """Queue ``persist(session, payload)`` and block until its group commits.
+
+        Raises :class:`GroupCommitTimeout` when the write has not started
+        within the timeout; it is then dropped from the queue, so the caller
+        may retry without creating a duplicate. A write the writer already
+        picked up is waited for, since it commits with its group.
+        """
+        self._ensure_thread()
+        future: Future = Future()
+        self._queue.put((persist, payload, future))
+        try:
+            return future.result(timeout=_SUBMIT_TIMEOUT_SECONDS)
+        except FutureTimeout:
+            if future.cancel():
+                raise GroupCommitTimeout("Gravação não iniciada no prazo.") from None
+            return future.result()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            batches = self._batches or 1
+            histogram = {f"le_{bucket}": count for bucket, count in self._histogram.items()}
+            histogram["gt_%s" % _BATCH_BUCKETS[-1]] = self._histogram_overflow
+            return {
+                "window_ms": round(self._window * 1000, 3),
+                "max_batch": self._max_batch,
+                "pending": self._queue.qsize(),
+                "batches": self._batches,
+                "items": self._items,
+                "avg_batch_size": round(self._items / batches, 3),
+                "max_batch_size": self._max_seen,
+                "commit_ms_avg": round(self._commit_total / batches * 1000, 3),
+                "batch_size_histogram": histogram,
+            }
+
+    def _ensure_thread(self) -> None:
+        # Threads do not survive fork, so each worker process starts its own.
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="group-commit", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            group = [self._queue.get()]
+            deadline = time.perf_counter() + self._window
+            while len(group) < self._max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    group.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._commit(group)
+
+    def _commit(self, group: List[_Pending]) -> None:
+        # Callers that timed out cancelled their futures; those writes are skipped.
+        group = [item for item in group if item[2].set_running_or_notify_cancel()]
+        if not group:
+            return
+        started = time.perf_counter()
+        outcomes: List[Tuple[Future, Any, BaseException | None]] = []
+        try:
+            with session_scope() as session:
+                _begin_group(session)
+                for persist, payload, future in group:
+                    try:
+                        with session.begin_nested():
+                            outcomes.append((future, persist(session, payload), None))
+                    except Exception as error:  # resolved on the caller's thread
+                        outcomes.append((future, None, error))
+        except Exception as error:
+            _logger.exception("group_commit_failed size=%s", len(group))
+            for _, _, future in group:
+                future.set_exception(error)
+            return
+
+        elapsed = time.perf_counter() - started
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+        self._record(len(group), elapsed)
+
+    def _record(self, size: int, elapsed: float) -> None:
+        with self._lock:
+            self._batches += 1
+            self._items += size
+            self._max_seen = max(self._max_seen, size)
+            self._commit_total += elapsed
+            for bucket in _BATCH_BUCKETS:
+                if size <= bucket:
+                    self._histogram[bucket] += 1
+                    break
+            else:
+                self._histogram_overflow += 1
+
+
+def _begin_group(session: Session) -> None:
+    """Open the group's transaction before the first savepoint.
+
+    pysqlite starts no transaction ahead of a ``SAVEPOINT``, so the savepoint
+    would open one and its ``RELEASE`` would commit each item on its own.
+    ``IMMEDIATE`` also takes the write lock once for the whole group.
+    """
+    connection = session.connection()
+    if connection.dialect.name == "sqlite" and not connection.connection.dbapi_connection.in_transaction:
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+_committer: GroupCommitter | None = None
+
+
+def init_app(app) -> None:
+    """Enable group commit when ``GROUP_COMMIT_ENABLED`` is set."""
+    global _committer
+
+    _committer = None
+    if app.config.get("GROUP_COMMIT_ENABLED"):
+        _committer = GroupCommitter(
+            window_ms=int(app.config.get("GROUP_COMMIT_WINDOW_MS", 10)),
+            max_batch=int(app.config.get("GROUP_COMMIT_MAX_BATCH", 64)),
+        )
+
+
+def get_committer() -> GroupCommitter | None:
+    """Return the committer, or ``None`` when writes commit individually."""
+    return _committer
@@ -0,0 +1,56 @@
+"""Conditional GET support keyed by table data versions."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from functools import wraps
+from http import HTTPStatus
+from typing import Any, Callable
+
+from flask import Response, make_response, request
+
+from ..database import read_scope
+from .versioning import get_versions
+
+
+def conditional(*scopes: str, cache_control: str = "private, no-cache") -> Callable:
+    """Answer ``If-None-Match`` with 304 before the view touches any rows.
+
+    The strong ETag hashes the endpoint, its arguments and the current data
+    version of each scope, so any write to those tables changes it.
+    """
+
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with read_scope() as session:
+                versions = get_versions(session, scopes)
+            etag = _compute_etag(versions, kwargs)
+
+            if request.if_none_match.contains_weak(etag):
+                response = Response(status=HTTPStatus.NOT_MODIFIED)
+                response.set_etag(etag)
+                response.headers["Cache-Control"] = cache_control
+                return response
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == HTTPStatus.OK and not response.is_streamed:
+                response.set_etag(etag)
+                response.headers["Cache-Control"] = cache_control
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def _compute_etag(versions: dict, view_args: dict) -> str:
+    document = [
+        request.endpoint,
+        sorted(versions.items()),
+        sorted(request.args.items(multi=True)),
+        sorted((key, str(value)) for key, value in view_args.items()),
+    ]
+    raw = json.dumps(document, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()
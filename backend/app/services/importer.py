@@ -0,0 +1,421 @@
+"""Streaming import of historical spreadsheets and CSV files."""
+
+from __future__ import annotations
+
+import csv
+import io
+import logging
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterator, List, Sequence, Tuple
+
+from openpyxl import load_workbook
+from sqlalchemy import and_, or_, select
+
+from ..database import session_scope
+from ..models import IntegrationRecord, OccurrenceRecord
+from .archive import archive_enabled, archive_table
+from .ingestion import bulk_insert, integration_values, occurrence_values
+from .versioning import INTEGRATION_SCOPE, OCCURRENCE_SCOPE
+
+_logger = logging.getLogger("integration.import")
+
+IMPORT_CHUNK_SIZE = 2000
+
+# Errors kept in the report; the count of skipped rows is always exact.
+_MAX_REPORTED_ERRORS = 100
+
+
+@dataclass(frozen=True)
+class ImportTarget:
+    """Maps exported column captions of one dataset back onto model fields."""
+
+    name: str
+    model: Any
+    scope: str
+    timestamp_field: str
+    headers: Dict[str, str]
+    build_values: Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+def _normalize_header(value: Any) -> str:
+    text = unicodedata.normalize("NFKD", str(value or "")).encode("ascii", "ignore").decode("ascii")
+    return " ".join(text.lower().replace("_", " ").split())
+
+
+def _header_map(pairs: Dict[str, str]) -> Dict[str, str]:
+    mapping = {_normalize_header(caption): field_name for caption, field_name in pairs.items()}
+    mapping.update({_normalize_header(field_name): field_name for field_name in pairs.values()})
+    return mapping
+
+
+IMPORT_TARGETS: Dict[str, ImportTarget] = {
+    "integration": ImportTarget(
+        name="integration",
+        model=IntegrationRecord,
+        scope=INTEGRATION_SCOPE,
+        timestamp_field="submitted_at",
+        headers=_header_map(
+            {
+                "ID": "id",
+                "Matrícula": "matricula",
+                "Colaborador": "nome",
+                "Setor": "setor",
+                "Cargo": "cargo",
+                "Turno": "turno",
+                "Integração": "integracao",
+                "Supervisor": "supervisor",
+                "Data integração": "data",
+                "Observação": "observacao",
+                "Registrado em": "submitted_at",
+            }
+        ),
+        build_values=integration_values,
+    ),
+    "occurrence": ImportTarget(
+        name="occurrence",
+        model=OccurrenceRecord,
+        scope=OCCURRENCE_SCOPE,
+        timestamp_field="created_at",
+        headers=_header_map(
+            {
+                "ID": "id",
+                "Matrícula": "matricula",
+                "Colaborador": "nome",
+                "Setor": "setor",
+                "Cargo": "cargo",
+                "Turno": "turno",
+                "Supervisor": "supervisor",
+                "Motivo": "motivo",
+                "Grau": "grau_label",
+                "Grau (valor)": "grau",
+                "Volumes": "volumes",
+                "Observação": "observacao",
+                "Registrado em": "created_at",
+            }
+        ),
+        build_values=occurrence_values,
+    ),
+}
+
+
+@dataclass
+class ImportReport:
+    dataset: str
+    rows_read: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    failed: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "dataset": self.dataset,
+            "rows_read": self.rows_read,
+            "inserted": self.inserted,
+            "duplicates": self.duplicates,
+            "failed": self.failed,
+            "errors": self.errors,
+        }
+
+
+def import_file(
+    dataset: str,
+    stream: IO[bytes],
+    filename: str,
+    *,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    progress: Callable[[ImportReport], None] | None = None,
+) -> ImportReport:
+    """Import an XLSX or CSV file row by row, committing every ``chunk_size`` rows.
+
+    A row counts as a duplicate when a stored record shows the same content
+    in every exported column (timestamps to the minute, as exports write
+    them) and either has the row's ``ID`` or, without one, is not already
+    matched by another row of the file. Re-importing an export, with or
+    without its ``ID`` column, creates no new records; a row whose ``ID`` is
+    taken by a different record is stored under a new ``ID``.
+    """
+    target = IMPORT_TARGETS.get(dataset)
+    if target is None:
+        raise ValueError("Conjunto de dados de importação inválido.")
+
+    rows = _iter_source_rows(stream, filename)
+    try:
+        header = next(rows)
+    except StopIteration:
+        raise ValueError("Arquivo de importação vazio.") from None
+
+    columns = [target.headers.get(_normalize_header(caption)) for caption in header]
+    if "nome" not in columns:
+        raise ValueError("Cabeçalho não reconhecido: coluna 'Colaborador' ausente.")
+
+    report = ImportReport(dataset=dataset)
+    imported: Counter = Counter()
+    chunk: List[Tuple[int, Dict[str, Any]]] = []
+    for line_number, values in enumerate(rows, start=2):
+        if not any(value not in (None, "") for value in values):
+            continue
+        report.rows_read += 1
+        try:
+            chunk.append((line_number, _build_row(target, columns, values)))
+        except ValueError as error:
+            _record_error(report, line_number, str(error))
+
+        if len(chunk) >= chunk_size:
+            _flush(target, chunk, report, imported)
+            chunk = []
+            if progress:
+                progress(report)
+
+    if chunk:
+        _flush(target, chunk, report, imported)
+    if progress:
+        progress(report)
+
+    _logger.info(
+        "import_finished dataset=%s rows=%s inserted=%s duplicates=%s failed=%s",
+        dataset,
+        report.rows_read,
+        report.inserted,
+        report.duplicates,
+        report.failed,
+    )
+    return report
+
+
+def import_path(dataset: str, path: Path, **kwargs: Any) -> ImportReport:
+    with open(path, "rb") as stream:
+        return import_file(dataset, stream, path.name, **kwargs)
+
+
+def _iter_source_rows(stream: IO[bytes], filename: str) -> Iterator[Sequence[Any]]:
+    suffix = Path(filename or "").suffix.lower()
+    if suffix in {".xlsx", ".xlsm"}:
+        return _iter_xlsx(stream)
+    if suffix in {".csv", ".txt", ""}:
+        return _iter_csv(stream)
+    raise ValueError("Formato de arquivo não suportado. Use .xlsx ou .csv.")
+
+
+def _iter_xlsx(stream: IO[bytes]) -> Iterator[Sequence[Any]]:
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        yield from sheet.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def _iter_csv(stream: IO[bytes]) -> Iterator[Sequence[Any]]:
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    sample = text.read(4096)
+    text.seek(0)
+    delimiter = ";" if sample.count(";") > sample.count(",") else ","
+    try:
+        yield from csv.reader(text, delimiter=delimiter)
+    finally:
+        text.detach()
+
+
+def _build_row(target: ImportTarget, columns: Sequence[str | None], values: Sequence[Any]) -> Dict[str, Any]:
+    payload: Dict[str, Any] = {}
+    for column_name, value in zip(columns, values):
+        if column_name is None:
+            continue
+        if isinstance(value, str):
+            value = value.strip()
+        payload[column_name] = value
+
+    if "data" in payload:
+        payload["data"] = _parse_date(payload["data"])
+    row = target.build_values(payload)
+
+    record_id = payload.get("id")
+    if record_id not in (None, ""):
+        try:
+            row["id"] = int(record_id)
+        except (TypeError, ValueError) as exc:
+            raise ValueError("ID inválido.") from exc
+
+    # Left empty when the file has none; _flush stamps those rows after dedupe.
+    row[target.timestamp_field] = _parse_timestamp(payload.get(target.timestamp_field))
+    return row
+
+
+def _parse_date(value: Any) -> Any:
+    """Accept the ``dd/mm/YYYY`` captions written by the exports besides ISO dates."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str) and "/" in value:
+        try:
+            return datetime.strptime(value, "%d/%m/%Y").date()
+        except ValueError as exc:
+            raise ValueError("Data em formato inválido.") from exc
+    return value
+
+
+def _parse_timestamp(value: Any) -> datetime | None:
+    if value in (None, ""):
+        return None
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    text = str(value).strip()
+    for pattern in ("%d/%m/%Y %H:%M:%S", "%d/%m/%Y %H:%M", "%d/%m/%Y"):
+        try:
+            return datetime.strptime(text, pattern)
+        except ValueError:
+            continue
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError as exc:
+        raise ValueError("Data/hora de registro em formato inválido.") from exc
+
+
+def _flush(
+    target: ImportTarget,
+    chunk: List[Tuple[int, Dict[str, Any]]],
+    report: ImportReport,
+    imported: Counter,
+) -> None:
+    """Insert one chunk in its own transaction, skipping rows already stored.
+
+    ``imported`` counts the content keys inserted by earlier chunks of the
+    same file, so identical records spread over two chunks are not mistaken
+    for repeats of each other.
+    """
+    model = target.model
+
+    with session_scope() as session:
+        # Archived rows count as existing, so re-importing an export never duplicates them.
+        tables = [model.__table__, archive_table(model)] if archive_enabled() else [model.__table__]
+
+        with_id = [row["id"] for _, row in chunk if "id" in row]
+        stored_by_id = _stored_by_id(session, target, tables, with_id) if with_id else {}
+
+        keys = [_content_key(target, row) for _, row in chunk]
+        stored = _stored_keys(session, target, tables, [key for key in keys if key is not None])
+        stored.subtract(imported)
+
+        now = datetime.utcnow()
+        taken_ids = set(stored_by_id)
+        new_with_id: List[Dict[str, Any]] = []
+        new_without_id: List[Dict[str, Any]] = []
+        for (_, row), key in zip(chunk, keys):
+            record_id = row.get("id")
+            if record_id in stored_by_id and _same_content(target, row, stored_by_id[record_id]):
+                if key is not None and stored[key] > 0:
+                    stored[key] -= 1
+                report.duplicates += 1
+                continue
+            if key is not None and stored[key] > 0:
+                stored[key] -= 1
+                report.duplicates += 1
+                continue
+            if key is None:
+                # Without a timestamp in the file only the ID can identify a repeat.
+                row[target.timestamp_field] = now
+            else:
+                imported[key] += 1
+            if record_id is None:
+                new_without_id.append(row)
+            elif record_id in taken_ids:
+                # Same ID, different record (another install or a hand-made sheet): keep it under a new ID.
+                del row["id"]
+                new_without_id.append(row)
+            else:
+                taken_ids.add(record_id)
+                new_with_id.append(row)
+
+        report.inserted += len(bulk_insert(session, model, new_with_id, target.scope))
+        report.inserted += len(bulk_insert(session, model, new_without_id, target.scope))
+
+
+def _content_fields(target: ImportTarget) -> List[str]:
+    """Every exported field except the ID, in a fixed order."""
+    return sorted(set(target.headers.values()) - {"id"})
+
+
+def _content_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        # Exports write timestamps to the minute.
+        return value.replace(second=0, microsecond=0)
+    if isinstance(value, str):
+        return value.strip() or None
+    return value
+
+
+def _content_key(target: ImportTarget, row: Dict[str, Any]) -> Tuple[Any, ...] | None:
+    """The record as an export shows it; rows without a timestamp have no key."""
+    if row.get(target.timestamp_field) is None:
+        return None
+    return tuple(_content_value(row.get(name)) for name in _content_fields(target))
+
+
+def _same_content(target: ImportTarget, row: Dict[str, Any], stored: Dict[str, Any]) -> bool:
+    """Whether an imported row shows the same record as a stored one.
+
+    A file without timestamps is compared on the remaining fields.
+    """
+    for name in _content_fields(target):
+        if name == target.timestamp_field and row.get(name) is None:
+            continue
+        if _content_value(row.get(name)) != _content_value(stored.get(name)):
+            return False
+    return True
+
+
+def _stored_by_id(session, target: ImportTarget, tables: Sequence[Any], ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """Exported fields of the stored rows among ``ids``."""
+    found: Dict[int, Dict[str, Any]] = {}
+    for rows in tables:
+        stmt = select(rows.c.id, *(rows.c[name] for name in _content_fields(target))).where(rows.c.id.in_(ids))
+        for row in session.execute(stmt).mappings():
+            found.setdefault(row["id"], dict(row))
+    return found
+
+
+def _stored_keys(session, target: ImportTarget, tables: Sequence[Any], keys: List[Tuple[Any, ...]]) -> Counter:
+    """How many stored rows have each content key among ``keys``."""
+    if not keys:
+        return Counter()
+    fields = _content_fields(target)
+    position = {name: index for index, name in enumerate(fields)}
+    matriculas = {key[position["matricula"]] for key in keys if key[position["matricula"]]}
+    names = {key[position["nome"]] for key in keys if not key[position["matricula"]]}
+    timestamps = [key[position[target.timestamp_field]] for key in keys]
+    lower = min(timestamps)
+    upper = max(timestamps) + timedelta(minutes=1)
+
+    wanted = set(keys)
+    found: Counter = Counter()
+    for rows in tables:
+        timestamp_column = rows.c[target.timestamp_field]
+        owners = []
+        if matriculas:
+            owners.append(rows.c.matricula.in_(matriculas))
+        if names:
+            owners.append(and_(or_(rows.c.matricula.is_(None), rows.c.matricula == ""), rows.c.nome.in_(names)))
+        # Served by the (matricula, timestamp) index.
+        stmt = select(*(rows.c[name] for name in fields)).where(
+            or_(*owners), timestamp_column >= lower, timestamp_column < upper
+        )
+        for row in session.execute(stmt).mappings():
+            key = _content_key(target, row)
+            if key in wanted:
+                found[key] += 1
+    return found
+
+
+def _record_error(report: ImportReport, line_number: int, message: str) -> None:
+    report.failed += 1
+    if len(report.errors) < _MAX_REPORTED_ERRORS:
+        report.errors.append({"line": line_number, "error": message})
+
+
+__all__ = ["IMPORT_TARGETS", "ImportReport", "import_file", "import_path"]
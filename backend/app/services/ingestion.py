@@ -2,16 +2,18 @@
 
 from __future__ import annotations
 
-import logging
 from dataclasses import asdict, dataclass, field
 from datetime import date, datetime, timezone
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List, Sequence
 
+from sqlalchemy import func, insert, select
 from sqlalchemy.orm import Session
 
 from ..models import IntegrationRecord, OccurrenceRecord
-
-_logger = logging.getLogger("integration.ingest")
+from .audit import audit_event
+from .journal import record_change, record_inserted_ids
+from .rollups import contribution, track_delete, track_insert, track_inserted_ids, track_update
+from .versioning import INTEGRATION_SCOPE, OCCURRENCE_SCOPE, bump_version
 
 
 @dataclass(frozen=True)
@@ -44,49 +46,58 @@ def build_envelope(data: Dict[str, Any], origin: str | None = None) -> Integrati
     )
 
 
-def envelope_summary(envelope: IntegrationEnvelope) -> str:
-    """Return a multi-line summary string for console output."""
-    header = (
-        f"Submission ID: {envelope.submission_id}\n"
-        f"Origin: {envelope.origin}\n"
-        f"Received at: {envelope.received_at.isoformat()}"
+def log_envelope(envelope: IntegrationEnvelope, record_id: int | None = None) -> None:
+    """Enqueue the envelope on the audit log; the payload is kept at DEBUG verbosity."""
+    audit_event(
+        "integration_submission",
+        record_id=record_id,
+        submission_id=envelope.submission_id,
+        origin=envelope.origin,
+        received_at=envelope.received_at.isoformat(),
+        detail=envelope.payload,
     )
-    if not envelope.payload:
-        return f"{header}\nPayload: <vazio>"
 
-    body_lines = "\n".join(
-        f"  • {key}: {envelope.payload[key]}"
-        for key in sorted(envelope.payload)
-    )
-    return f"{header}\nPayload:\n{body_lines}"
 
-
-def log_envelope(envelope: IntegrationEnvelope, record_id: int | None = None) -> None:
-    """Emit the envelope to the Python logger in a structured format."""
-    summary = envelope_summary(envelope)
-    if record_id is not None:
-        summary = f"Registro ID: {record_id}\n" + summary
-    print("\n=== Integração recebida ===", flush=True)
-    print(summary, flush=True)
-    print("=== Fim da submissão ===\n", flush=True)
-    _logger.info("integration_submission")
+def integration_values(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate an integration payload and return column values."""
+    return {
+        "matricula": _safe_string(payload.get("matricula")),
+        "nome": _required_string(payload.get("nome"), "nome"),
+        "setor": _required_string(payload.get("setor"), "setor"),
+        "integracao": _required_string(payload.get("integracao"), "integracao"),
+        "supervisor": _required_string(payload.get("supervisor"), "supervisor").upper(),
+        "turno": _required_string(payload.get("turno"), "turno"),
+        "cargo": _required_string(payload.get("cargo"), "cargo"),
+        "data": _safe_date(payload.get("data")),
+        "observacao": _safe_string(payload.get("observacao")),
+    }
+
+
+def occurrence_values(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate an occurrence payload and return column values."""
+    return {
+        "matricula": _safe_string(payload.get("matricula")),
+        "nome": _required_string(payload.get("nome"), "nome"),
+        "setor": _required_string(payload.get("setor"), "setor"),
+        "cargo": _required_string(payload.get("cargo"), "cargo"),
+        "turno": _required_string(payload.get("turno"), "turno"),
+        "supervisor": _required_string(payload.get("supervisor"), "supervisor").upper(),
+        "motivo": _safe_string(payload.get("motivo")),
+        "grau": _safe_int(payload.get("grau")),
+        "grau_label": _safe_string(payload.get("grau_label")),
+        "volumes": _safe_int(payload.get("volumes")),
+        "observacao": _safe_string(payload.get("observacao")),
+    }
 
 
 def persist_integration(session: Session, payload: Dict[str, Any]) -> IntegrationRecord:
     """Store an integration payload and return the ORM record."""
-    record = IntegrationRecord(
-        matricula=_safe_string(payload.get("matricula")),
-        nome=_required_string(payload.get("nome"), "nome"),
-        setor=_required_string(payload.get("setor"), "setor"),
-        integracao=_required_string(payload.get("integracao"), "integracao"),
-        supervisor=_required_string(payload.get("supervisor"), "supervisor").upper(),
-        turno=_required_string(payload.get("turno"), "turno"),
-        cargo=_required_string(payload.get("cargo"), "cargo"),
-        data=_safe_date(payload.get("data")),
-        observacao=_safe_string(payload.get("observacao")),
-    )
+    record = IntegrationRecord(**integration_values(payload))
     session.add(record)
     session.flush()
+    track_insert(session, record)
+    record_change(session, "created", record)
+    bump_version(session, INTEGRATION_SCOPE)
     return record
 
 
@@ -98,38 +109,35 @@ def update_integration_record(
     if record is None:
         raise ValueError("Registro de integração inexistente.")
 
-    record.matricula = _safe_string(payload.get("matricula"))
-    record.nome = _required_string(payload.get("nome"), "nome")
-    record.setor = _required_string(payload.get("setor"), "setor")
-    record.integracao = _required_string(payload.get("integracao"), "integracao")
-    record.supervisor = _required_string(payload.get("supervisor"), "supervisor").upper()
-    record.turno = _required_string(payload.get("turno"), "turno")
-    record.cargo = _required_string(payload.get("cargo"), "cargo")
-    record.data = _safe_date(payload.get("data"))
-    record.observacao = _safe_string(payload.get("observacao"))
+    before = contribution(record)
+    for key, value in integration_values(payload).items():
+        setattr(record, key, value)
     record.submitted_at = datetime.utcnow()
 
     session.flush()
+    track_update(session, before, record)
+    record_change(session, "updated", record)
+    bump_version(session, INTEGRATION_SCOPE)
     return record
 
 
+def delete_integration_record(session: Session, record: IntegrationRecord) -> None:
+    """Remove an integration entry."""
+    track_delete(session, record)
+    record_change(session, "deleted", record)
+    session.delete(record)
+    session.flush()
+    bump_version(session, INTEGRATION_SCOPE)
+
+
 def persist_occurrence(session: Session, payload: Dict[str, Any]) -> OccurrenceRecord:
     """Store an occurrence payload and return the ORM record."""
-    record = OccurrenceRecord(
-        matricula=_safe_string(payload.get("matricula")),
-        nome=_required_string(payload.get("nome"), "nome"),
-        setor=_required_string(payload.get("setor"), "setor"),
-        cargo=_required_string(payload.get("cargo"), "cargo"),
-        turno=_required_string(payload.get("turno"), "turno"),
-        supervisor=_required_string(payload.get("supervisor"), "supervisor").upper(),
-        motivo=_safe_string(payload.get("motivo")),
-        grau=_safe_int(payload.get("grau")),
-        grau_label=_safe_string(payload.get("grau_label")),
-        volumes=_safe_int(payload.get("volumes")),
-        observacao=_safe_string(payload.get("observacao")),
-    )
+    record = OccurrenceRecord(**occurrence_values(payload))
     session.add(record)
     session.flush()
+    track_insert(session, record)
+    record_change(session, "created", record)
+    bump_version(session, OCCURRENCE_SCOPE)
     return record
 
 
@@ -141,22 +149,125 @@ def update_occurrence_record(
     if record is None:
         raise ValueError("Registro de ocorrência inexistente.")
 
-    record.matricula = _safe_string(payload.get("matricula"))
-    record.nome = _required_string(payload.get("nome"), "nome")
-    record.setor = _required_string(payload.get("setor"), "setor")
-    record.cargo = _required_string(payload.get("cargo"), "cargo")
-    record.turno = _required_string(payload.get("turno"), "turno")
-    record.supervisor = _required_string(payload.get("supervisor"), "supervisor").upper()
-    record.motivo = _safe_string(payload.get("motivo"))
-    record.grau = _safe_int(payload.get("grau"))
-    record.grau_label = _safe_string(payload.get("grau_label"))
-    record.volumes = _safe_int(payload.get("volumes"))
-    record.observacao = _safe_string(payload.get("observacao"))
+    before = contribution(record)
+    for key, value in occurrence_values(payload).items():
+        setattr(record, key, value)
 
     session.flush()
+    track_update(session, before, record)
+    record_change(session, "updated", record)
+    bump_version(session, OCCURRENCE_SCOPE)
     return record
 
 
+def delete_occurrence_record(session: Session, record: OccurrenceRecord) -> None:
+    """Remove an occurrence entry."""
+    track_delete(session, record)
+    record_change(session, "deleted", record)
+    session.delete(record)
+    session.flush()
+    bump_version(session, OCCURRENCE_SCOPE)
+
+
+def persist_integration_batch(
+    session: Session, payloads: Sequence[Any], atomic: bool = True
+) -> List[Dict[str, Any]]:
+    """Validate and bulk insert integration payloads; see ``_persist_batch``."""
+    return _persist_batch(session, IntegrationRecord, payloads, integration_values, INTEGRATION_SCOPE, atomic)
+
+
+def persist_occurrence_batch(
+    session: Session, payloads: Sequence[Any], atomic: bool = True
+) -> List[Dict[str, Any]]:
+    """Validate and bulk insert occurrence payloads; see ``_persist_batch``."""
+    return _persist_batch(session, OccurrenceRecord, payloads, occurrence_values, OCCURRENCE_SCOPE, atomic)
+
+
+class BatchValidationError(ValueError):
+    """Raised in all-or-nothing mode when any batch item fails validation."""
+
+    def __init__(self, results: List[Dict[str, Any]]) -> None:
+        super().__init__("Lote rejeitado: há itens inválidos.")
+        self.results = results
+
+
+def _persist_batch(
+    session: Session,
+    model,
+    payloads: Sequence[Any],
+    build_values: Callable[[Dict[str, Any]], Dict[str, Any]],
+    scope: str,
+    atomic: bool,
+) -> List[Dict[str, Any]]:
+    """Insert valid payloads with one executemany and report per-item results.
+
+    In atomic mode a single invalid item rejects the whole batch; otherwise
+    invalid items are reported by index and the rest are stored.
+    """
+    results: List[Dict[str, Any]] = []
+    pending: List[Dict[str, Any]] = []
+    rows: List[Dict[str, Any]] = []
+
+    for index, payload in enumerate(payloads):
+        try:
+            if not isinstance(payload, dict):
+                raise ValueError("Item do lote deve ser um objeto JSON.")
+            values = build_values(payload)
+        except ValueError as error:
+            results.append({"index": index, "status": "error", "error": str(error)})
+            continue
+        result = {"index": index, "status": "created", "record_id": None}
+        results.append(result)
+        pending.append(result)
+        rows.append(values)
+
+    if atomic and len(rows) != len(results):
+        raise BatchValidationError([result for result in results if result["status"] == "error"])
+
+    if not rows:
+        return results
+
+    record_ids = bulk_insert(session, model, rows, scope)
+    for result, record_id in zip(pending, record_ids):
+        result["record_id"] = record_id
+    return results
+
+
+def bulk_insert(session: Session, model, rows: List[Dict[str, Any]], scope: str) -> List[int]:
+    """Insert already validated rows with one executemany and return their ids in order.
+
+    Either every row carries its ``id`` or none does; mixing both raises
+    ``ValueError``, since generated ids are derived from the table maximum.
+    """
+    if not rows:
+        return []
+    explicit = sum(1 for values in rows if "id" in values)
+    if 0 < explicit < len(rows):
+        raise ValueError("bulk_insert: rows with and without 'id' must be inserted separately.")
+
+    dialect = session.get_bind().dialect
+    if dialect.name == "sqlite":
+        # Ordered RETURNING makes SQLite fall back to one INSERT per row. A plain
+        # executemany is one statement; the transaction holds the write lock, so
+        # generated ids are consecutive and end at the table's new maximum.
+        session.execute(insert(model), rows)
+        if explicit:
+            record_ids = [values["id"] for values in rows]
+        else:
+            last_id = session.execute(select(func.max(model.id))).scalar_one()
+            record_ids = list(range(last_id - len(rows) + 1, last_id + 1))
+    elif getattr(dialect, "insert_executemany_returning_sort_by_parameter_order", False):
+        stmt = insert(model).returning(model.id, sort_by_parameter_order=True)
+        record_ids = list(session.execute(stmt, rows).scalars().all())
+    else:
+        record_ids = [session.execute(insert(model).values(**values)).inserted_primary_key[0] for values in rows]
+
+    track_inserted_ids(session, model, record_ids)
+    record_inserted_ids(session, model, record_ids)
+    bump_version(session, scope)
+    return record_ids
+
+
 def _required_string(value: Any, field_name: str) -> str:
     if not value or not str(value).strip():
         raise ValueError(f"O campo '{field_name}' é obrigatório.")
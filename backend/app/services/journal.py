@@ -0,0 +1,171 @@
+"""Append-only change journal of the record tables.
+
+Every insert, update and delete made through ``services.ingestion`` adds an
+entry in the same transaction, numbered by a monotonically increasing
+``seq``. ``read_changes`` answers "what changed since seq X" for delta
+consumers and the ``/api/events`` stream replays the same entries.
+
+Maintenance (``manage.py compact-changes``) compacts entries older than
+``CHANGES_COMPACT_AFTER_HOURS`` down to the latest one per record, which
+keeps every net change, and purges entries older than
+``CHANGES_RETENTION_DAYS``. The highest purged ``seq`` is kept as the
+version of ``JOURNAL_SCOPE``: a consumer behind it must resynchronise.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Sequence
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from ..models import ChangeJournalEntry, DataVersion, IntegrationRecord, OccurrenceRecord
+from .versioning import JOURNAL_SCOPE, get_version
+
+_logger = logging.getLogger("integration.journal")
+
+JOURNAL_DATASETS: Dict[Any, str] = {IntegrationRecord: "integration", OccurrenceRecord: "occurrence"}
+
+# Inserted rows read back per query when journaling a bulk insert.
+_ID_CHUNK = 500
+
+
+class JournalGap(ValueError):
+    """Raised when entries after the requested ``seq`` were already purged."""
+
+    def __init__(self, horizon: int) -> None:
+        super().__init__("Alterações anteriores a este ponto já foram descartadas; sincronize novamente.")
+        self.horizon = horizon
+
+
+@dataclass(frozen=True)
+class ChangePage:
+    changes: List[Dict[str, Any]]
+    next_since: int
+    has_more: bool
+
+
+def record_change(session: Session, action: str, record) -> None:
+    """Journal ``created``/``updated``/``deleted`` for ``record`` in the caller's transaction."""
+    model = type(record)
+    row = None if action == "deleted" else _document(model, lambda name: getattr(record, name))
+    session.execute(insert(ChangeJournalEntry.__table__), [_entry(JOURNAL_DATASETS[model], action, record.id, row)])
+
+
+def record_inserted_ids(session: Session, model, record_ids: Sequence[int]) -> None:
+    """Journal rows written by a bulk insert, read back by id."""
+    if not record_ids:
+        return
+    dataset = JOURNAL_DATASETS[model]
+    table = model.__table__
+    for start in range(0, len(record_ids), _ID_CHUNK):
+        chunk = record_ids[start : start + _ID_CHUNK]
+        rows = session.execute(select(table).where(table.c.id.in_(chunk)).order_by(table.c.id)).mappings().all()
+        entries = [_entry(dataset, "created", row["id"], _document(model, row.__getitem__)) for row in rows]
+        if entries:
+            session.execute(insert(ChangeJournalEntry.__table__), entries)
+
+
+def journal_horizon(session: Session) -> int:
+    """Highest ``seq`` already purged; changes after it are all still in the journal."""
+    return get_version(session, JOURNAL_SCOPE)
+
+
+def newest_seq(session: Session) -> int:
+    return session.execute(select(func.max(ChangeJournalEntry.seq))).scalar() or 0
+
+
+def read_changes(session: Session, since: int, limit: int, datasets: Sequence[str]) -> ChangePage:
+    """Net changes after ``since``, in journal order, scanning at most ``limit`` entries.
+
+    Several entries of one record inside the window collapse into the
+    latest, placed at its own ``seq``. ``created`` and ``updated`` both carry
+    the full row and are meant to be applied as upserts.
+    """
+    if since < journal_horizon(session):
+        raise JournalGap(journal_horizon(session))
+
+    rows = session.execute(
+        select(
+            ChangeJournalEntry.seq,
+            ChangeJournalEntry.dataset,
+            ChangeJournalEntry.record_id,
+            ChangeJournalEntry.data,
+            ChangeJournalEntry.created_at,
+        )
+        .where(ChangeJournalEntry.seq > since, ChangeJournalEntry.dataset.in_(datasets))
+        .order_by(ChangeJournalEntry.seq)
+        .limit(limit + 1)
+    ).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    latest: Dict[tuple, Any] = {}
+    for row in rows:
+        latest[(row.dataset, row.record_id)] = row
+    changes = [
+        {"seq": row.seq, "changed_at": row.created_at.isoformat(), **json.loads(row.data)}
+        for row in sorted(latest.values(), key=lambda row: row.seq)
+    ]
+    return ChangePage(changes=changes, next_since=rows[-1].seq if rows else since, has_more=has_more)
+
+
+def compact_journal(session: Session, older_than: datetime) -> int:
+    """Drop entries before ``older_than`` that a later entry of the same record supersedes."""
+    table = ChangeJournalEntry.__table__
+    latest = select(func.max(table.c.seq)).group_by(table.c.dataset, table.c.record_id)
+    result = session.execute(delete(table).where(table.c.created_at < older_than, table.c.seq.not_in(latest)))
+    return result.rowcount
+
+
+def purge_journal(session: Session, older_than: datetime) -> int:
+    """Delete entries before ``older_than`` and advance the horizon past them."""
+    table = ChangeJournalEntry.__table__
+    horizon = session.execute(select(func.max(table.c.seq)).where(table.c.created_at < older_than)).scalar()
+    if horizon is None:
+        return 0
+    result = session.execute(delete(table).where(table.c.seq <= horizon))
+    _set_horizon(session, horizon)
+    return result.rowcount
+
+
+def maintain_journal(session: Session, retention_days: int, compact_after_hours: int) -> Dict[str, int]:
+    """Purge, then compact; a non-positive setting disables its step."""
+    now = datetime.utcnow()
+    purged = purge_journal(session, now - timedelta(days=retention_days)) if retention_days > 0 else 0
+    compacted = compact_journal(session, now - timedelta(hours=compact_after_hours)) if compact_after_hours > 0 else 0
+    if purged or compacted:
+        _logger.info("journal_maintained purged=%s compacted=%s", purged, compacted)
+    return {"purged": purged, "compacted": compacted, "horizon": journal_horizon(session)}
+
+
+def _set_horizon(session: Session, horizon: int) -> None:
+    result = session.execute(
+        update(DataVersion)
+        .where(DataVersion.scope == JOURNAL_SCOPE, DataVersion.version < horizon)
+        .values(version=horizon, updated_at=datetime.utcnow())
+    )
+    if result.rowcount == 0 and session.get(DataVersion, JOURNAL_SCOPE) is None:
+        session.add(DataVersion(scope=JOURNAL_SCOPE, version=horizon, updated_at=datetime.utcnow()))
+        session.flush()
+
+
+def _entry(dataset: str, action: str, record_id: int, row: Dict[str, Any] | None) -> Dict[str, Any]:
+    message = {"dataset": dataset, "action": action, "record_id": record_id, "row": row}
+    return {"dataset": dataset, "action": action, "record_id": record_id, "data": _dumps(message)}
+
+
+def _document(model, value: Callable[[str], Any]) -> Dict[str, Any]:
+    return {column.key: _plain(value(column.key)) for column in model.__table__.columns}
+
+
+def _plain(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, date) else value
+
+
+def _dumps(document: Dict[str, Any]) -> str:
+    return json.dumps(document, ensure_ascii=False, separators=(",", ":"))
@@ -0,0 +1,499 @@
+"""Prometheus metrics served by ``/api/metrics``.
+
+Request latency, in-flight requests, SQL statements per request, export
+and configuration snapshot timings live in one in-process registry;
+recording a sample is a lock and a few additions. Under the prefork server
+each worker also writes its registry to ``METRICS_DIR`` every
+``METRICS_FLUSH_SECONDS`` (and when it stops), and a scrape adds up every
+worker's file, so the totals do not depend on which process answers. Files
+of exited workers are folded into ``retired.json`` so counters never go
+backwards when workers are recycled.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from functools import lru_cache, wraps
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, TypeVar
+
+from flask import g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from ..database import database_files
+
+_logger = logging.getLogger("integration.metrics")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_PREFIX = "integration_"
+
+# Histogram upper bounds; +Inf is implicit.
+_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_EXPORT_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+_STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144)
+
+_HISTOGRAMS = {
+    "http_request_duration_seconds": (_LATENCY_BUCKETS, "Request latency by endpoint, method and status."),
+    "http_request_sql_statements": (_STATEMENT_BUCKETS, "SQL statements executed per request, by endpoint."),
+    "http_request_sql_duration_seconds": (_LATENCY_BUCKETS, "Time spent executing SQL per request, by endpoint."),
+    "export_duration_seconds": (_EXPORT_BUCKETS, "Export duration by dataset, format and mode."),
+    "operation_duration_seconds": (_LATENCY_BUCKETS, "Duration of instrumented internal operations."),
+}
+
+_COUNTERS = {
+    "exports_total": "Exports by dataset, format, mode and outcome.",
+    "export_rows_total": "Rows written by exports.",
+}
+
+_GAUGES = {
+    "http_requests_in_flight": "Requests being handled.",
+}
+
+_RETIRED = "retired.json"
+_RETIRE_LOCK = "retire.lock"
+
+# Without a way to probe a pid, a worker file this old belongs to an exited worker.
+_STALE_AFTER_SECONDS = 120.0
+
+_local = threading.local()
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+
+class MetricsRegistry:
+    """Counters, gauges and histograms of this process, keyed by rendered label set."""
+
+    def __init__(self, directory: Path | None, flush_seconds: int) -> None:
+        self._directory = directory
+        self._interval = max(flush_seconds, 1)
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self._counters: Dict[str, Dict[str, float]] = {}
+        self._histograms: Dict[str, Dict[str, List[float]]] = {}
+        self._in_flight = 0
+
+    def inc(self, name: str, labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._inc(name, labels, amount)
+
+    def observe(self, name: str, labels: str, value: float) -> None:
+        with self._lock:
+            self._observe(name, labels, value)
+
+    def request_started(self) -> None:
+        if self._pid != os.getpid():
+            self._ensure_thread()
+        with self._lock:
+            self._in_flight += 1
+
+    def request_finished(self, labels: str, endpoint: str, seconds: float, statements: int, sql_seconds: float) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._observe("http_request_duration_seconds", labels, seconds)
+            self._observe("http_request_sql_statements", endpoint, statements)
+            self._observe("http_request_sql_duration_seconds", endpoint, sql_seconds)
+
+    def record_export(self, labels: str, outcome: str, seconds: float, rows: int) -> None:
+        with self._lock:
+            self._inc("exports_total", f'{labels},outcome="{outcome}"', 1)
+            self._inc("export_rows_total", labels, rows)
+            self._observe("export_duration_seconds", labels, seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "counters": {name: dict(series) for name, series in self._counters.items()},
+                "histograms": {
+                    name: {labels: list(values) for labels, values in series.items()}
+                    for name, series in self._histograms.items()
+                },
+                "gauges": {"http_requests_in_flight": {"": self._in_flight}},
+            }
+
+    def collect(self) -> Dict[str, Any]:
+        """This process's samples plus those every other worker last flushed."""
+        merged = self.snapshot()
+        if self._directory is None:
+            return merged
+        own = self._worker_file()
+        self._retire_exited(own)
+        for path in sorted(self._directory.glob("*.json")):
+            if path == own:
+                continue
+            document = _load(path)
+            if document is not None:
+                _merge(merged, document, gauges=path.name != _RETIRED)
+        return merged
+
+    def flush(self) -> None:
+        if self._directory is None:
+            return
+        document = self.snapshot()
+        document["pid"] = os.getpid()
+        try:
+            _write(self._worker_file(), document)
+        except OSError as error:
+            _logger.warning("metrics_flush_failed error=%s", error)
+
+    def after_fork(self) -> None:
+        # A forked worker starts counting from zero; the parent's samples stay the parent's.
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._reset()
+
+    def _inc(self, name: str, labels: str, amount: float) -> None:
+        series = self._counters.setdefault(name, {})
+        series[labels] = series.get(labels, 0) + amount
+
+    def _observe(self, name: str, labels: str, value: float) -> None:
+        buckets = _HISTOGRAMS[name][0]
+        series = self._histograms.setdefault(name, {})
+        values = series.get(labels)
+        if values is None:
+            # One count per bucket plus +Inf, then the running sum.
+            values = series[labels] = [0] * (len(buckets) + 1) + [0.0]
+        values[bisect_left(buckets, value)] += 1
+        values[-1] += value
+
+    def _ensure_thread(self) -> None:
+        # Threads do not survive fork, so each worker process starts its own.
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            if self._directory is None:
+                return
+            self._thread = threading.Thread(target=self._run, name="metrics-flush", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            self._directory.mkdir(parents=True, exist_ok=True)
+        except OSError as error:
+            _logger.warning("metrics_dir_unavailable path=%s error=%s", self._directory, error)
+            return
+        while True:
+            time.sleep(self._interval)
+            self.flush()
+
+    def _worker_file(self) -> Path:
+        return self._directory / f"worker-{os.getpid()}.json"
+
+    def _retire_exited(self, own: Path) -> None:
+        """Fold the files of exited workers into ``retired.json``, one scraper at a time."""
+        lock = self._directory / _RETIRE_LOCK
+        try:
+            fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                if time.time() - lock.stat().st_mtime > _STALE_AFTER_SECONDS:
+                    lock.unlink()
+            except OSError:
+                pass
+            return
+        except OSError:
+            return
+        try:
+            now = time.time()
+            exited = [path for path in self._directory.glob("worker-*.json") if path != own and _exited(path, now)]
+            if not exited:
+                return
+            retired_path = self._directory / _RETIRED
+            retired = _load(retired_path) or {"counters": {}, "histograms": {}, "gauges": {}}
+            documents = [(path, _load(path)) for path in exited]
+            for _path, document in documents:
+                if document is not None:
+                    _merge(retired, document, gauges=False)
+            _write(retired_path, retired)
+            for path, _document in documents:
+                path.unlink(missing_ok=True)
+            _logger.info("metrics_workers_retired count=%s", len(documents))
+        except OSError as error:
+            _logger.warning("metrics_retire_failed error=%s", error)
+        finally:
+            os.close(fd)
+            lock.unlink(missing_ok=True)
+
+
+class ExportTimer:
+    """Time one export and count its rows; ``track`` wraps the record iterator."""
+
+    def __init__(self, dataset: str, fmt: str, mode: str) -> None:
+        self.dataset = dataset
+        self.fmt = fmt
+        self.mode = mode
+        self.rows = 0
+        self._started = 0.0
+
+    def track(self, records: Iterable[Any]) -> Iterator[Any]:
+        for record in records:
+            self.rows += 1
+            yield record
+
+    def __enter__(self) -> "ExportTimer":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        if exc_type is None:
+            outcome = "done"
+        elif exc_type is GeneratorExit:
+            outcome = "aborted"
+        else:
+            outcome = "failed"
+        record_export(self.dataset, self.fmt, self.mode, outcome, time.perf_counter() - self._started, self.rows)
+        return False
+
+
+_registry: MetricsRegistry | None = None
+_sql_hooks_installed = False
+
+
+def init_app(app) -> None:
+    """Create the registry and time every request and SQL statement of ``app``."""
+    global _registry
+
+    directory = str(app.config.get("METRICS_DIR") or "").strip()
+    _registry = MetricsRegistry(
+        Path(directory) if directory else None,
+        flush_seconds=int(app.config.get("METRICS_FLUSH_SECONDS", 5)),
+    )
+    _install_sql_hooks()
+
+    @app.before_request
+    def _start_request() -> None:
+        _registry.request_started()
+        _local.statements = 0
+        _local.sql_seconds = 0.0
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def _capture_status(response):
+        g.metrics_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def _finish_request(error) -> None:
+        started = g.pop("metrics_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        status = g.pop("metrics_status", 500 if error is not None else 200)
+        endpoint = request.endpoint or "unmatched"
+        _registry.request_finished(
+            _request_labels(endpoint, request.method, status),
+            _endpoint_labels(endpoint),
+            elapsed,
+            _local.statements,
+            _local.sql_seconds,
+        )
+
+
+def get_registry() -> MetricsRegistry:
+    if _registry is None:
+        raise RuntimeError("Metrics not initialised. Call init_app first.")
+    return _registry
+
+
+def flush_metrics() -> None:
+    """Write this process's samples now; called by workers on their way out."""
+    if _registry is not None:
+        _registry.flush()
+
+
+def render_metrics() -> str:
+    """Every worker's samples plus the database file sizes in Prometheus text format."""
+    snapshot = get_registry().collect()
+    lines: List[str] = []
+
+    for name, (buckets, help_text) in _HISTOGRAMS.items():
+        metric = _PREFIX + name
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} histogram"]
+        bounds = [repr(float(bound)) for bound in buckets] + ["+Inf"]
+        for labels, values in sorted(snapshot["histograms"].get(name, {}).items()):
+            prefix = f"{labels}," if labels else ""
+            cumulative = 0
+            for bound, count in zip(bounds, values):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{{prefix}le="{bound}"}} {_value(cumulative)}')
+            lines.append(f"{metric}_sum{_braces(labels)} {_value(values[-1])}")
+            lines.append(f"{metric}_count{_braces(labels)} {_value(cumulative)}")
+
+    for kind, metrics in (("counter", _COUNTERS), ("gauge", _GAUGES)):
+        samples = snapshot["counters" if kind == "counter" else "gauges"]
+        for name, help_text in metrics.items():
+            metric = _PREFIX + name
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}"]
+            for labels, value in sorted(samples.get(name, {}).items()):
+                lines.append(f"{metric}{_braces(labels)} {_value(value)}")
+
+    metric = _PREFIX + "database_file_bytes"
+    lines += [f"# HELP {metric} Size of the SQLite database files.", f"# TYPE {metric} gauge"]
+    for (database, kind), path in database_files().items():
+        try:
+            size = path.stat().st_size
+        except OSError:
+            continue
+        lines.append(f"{metric}{{{_labels(database=database, file=kind)}}} {size}")
+
+    return "\n".join(lines) + "\n"
+
+
+def record_export(dataset: str, fmt: str, mode: str, outcome: str, seconds: float, rows: int) -> None:
+    if _registry is not None:
+        _registry.record_export(_export_labels(dataset, fmt, mode), outcome, seconds, rows)
+
+
+def observe_export(dataset: str, fmt: str, mode: str = "request") -> ExportTimer:
+    return ExportTimer(dataset, fmt, mode)
+
+
+def observe_stream(records: Iterable[Any], dataset: str, fmt: str) -> Iterator[Any]:
+    """Yield ``records`` while timing the export they feed, until the response is closed."""
+    with observe_export(dataset, fmt) as export:
+        yield from export.track(records)
+
+
+def timed(operation: str) -> Callable[[_F], _F]:
+    """Record the duration of each call as ``operation_duration_seconds{operation=...}``."""
+    labels = _labels(operation=operation)
+
+    def decorator(func: _F) -> _F:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                if _registry is not None:
+                    _registry.observe("operation_duration_seconds", labels, time.perf_counter() - started)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def _install_sql_hooks() -> None:
+    """Count statements and their time on the current thread, for every engine."""
+    global _sql_hooks_installed
+
+    if _sql_hooks_installed:
+        return
+    _sql_hooks_installed = True
+
+    @event.listens_for(Engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        _local.sql_started = time.perf_counter()
+
+    @event.listens_for(Engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        elapsed = time.perf_counter() - _local.sql_started
+        # Threads outside a request (export jobs, the event hub) start from zero here.
+        _local.statements = getattr(_local, "statements", 0) + 1
+        _local.sql_seconds = getattr(_local, "sql_seconds", 0.0) + elapsed
+
+
+def _after_fork_in_child() -> None:
+    if _registry is not None:
+        _registry.after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+@lru_cache(maxsize=1024)
+def _request_labels(endpoint: str, method: str, status: int) -> str:
+    return _labels(endpoint=endpoint, method=method, status=str(status))
+
+
+@lru_cache(maxsize=256)
+def _endpoint_labels(endpoint: str) -> str:
+    return _labels(endpoint=endpoint)
+
+
+@lru_cache(maxsize=64)
+def _export_labels(dataset: str, fmt: str, mode: str) -> str:
+    return _labels(dataset=dataset, format=fmt, mode=mode)
+
+
+def _labels(**values: str) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in values.items())
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _braces(labels: str) -> str:
+    return f"{{{labels}}}" if labels else ""
+
+
+def _value(value: float) -> str:
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value)) if math.isfinite(value) else str(value)
+
+
+def _merge(into: Dict[str, Any], document: Dict[str, Any], *, gauges: bool) -> None:
+    kinds = ("counters", "gauges") if gauges else ("counters",)
+    for kind in kinds:
+        for name, series in document.get(kind, {}).items():
+            target = into.setdefault(kind, {}).setdefault(name, {})
+            for labels, value in series.items():
+                target[labels] = target.get(labels, 0) + value
+    for name, series in document.get("histograms", {}).items():
+        if name not in _HISTOGRAMS:
+            continue
+        width = len(_HISTOGRAMS[name][0]) + 2
+        target = into.setdefault("histograms", {}).setdefault(name, {})
+        for labels, values in series.items():
+            if len(values) != width:
+                # Written with other buckets by an older release.
+                continue
+            current = target.get(labels)
+            target[labels] = list(values) if current is None else [a + b for a, b in zip(current, values)]
+
+
+def _exited(path: Path, now: float) -> bool:
+    try:
+        pid = int(path.stem.split("-", 1)[1])
+        mtime = path.stat().st_mtime
+    except (IndexError, ValueError, OSError):
+        return False
+    if os.name != "posix":
+        # os.kill(pid, 0) would signal the process on Windows.
+        return now - mtime > _STALE_AFTER_SECONDS
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        return False
+    return False
+
+
+def _load(path: Path) -> Dict[str, Any] | None:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _write(path: Path, document: Dict[str, Any]) -> None:
+    partial = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    partial.write_text(json.dumps(document, separators=(",", ":")), encoding="utf-8")
+    os.replace(partial, path)
@@ -0,0 +1,107 @@
+"""Keyset (cursor) pagination helpers for the record listings."""
+
+from __future__ import annotations
+
+import base64
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any
+
+from sqlalchemy import and_, or_
+
+_TRUE_VALUES = {"1", "true", "yes", "sim", "on"}
+_FALSE_VALUES = {"0", "false", "no", "nao", "não", "off"}
+
+
+@dataclass(frozen=True)
+class KeysetCursor:
+    """Position after the last row of a page: sort key value plus ``id``."""
+
+    sort_by: str
+    sort_order: str
+    value: Any
+    record_id: int
+
+    def encode(self) -> str:
+        value = self.value
+        if isinstance(value, (datetime, date)):
+            value = value.isoformat()
+        document = [self.sort_by, self.sort_order, value, self.record_id]
+        raw = json.dumps(document, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str, sort_column) -> "KeysetCursor":
+        """Parse an opaque token, coercing the value to ``sort_column``'s type."""
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            sort_by, sort_order, value, record_id = json.loads(base64.urlsafe_b64decode(padded))
+            if value is not None:
+                value = _coerce(value, sort_column)
+            return cls(str(sort_by), str(sort_order), value, int(record_id))
+        except (TypeError, ValueError) as exc:
+            raise ValueError("Cursor de paginação inválido.") from exc
+
+
+def apply_keyset(stmt, sort_column, id_column, sort_order: str, cursor: KeysetCursor | None):
+    """Order ``stmt`` by ``(sort_column, id)`` and seek past ``cursor``.
+
+    NULL sort values are placed first in ascending and last in descending
+    order, matching SQLite's default so the sort column index still applies.
+    """
+    descending = sort_order == "desc"
+    if descending:
+        stmt = stmt.order_by(sort_column.desc().nulls_last(), id_column.desc())
+    else:
+        stmt = stmt.order_by(sort_column.asc().nulls_first(), id_column.asc())
+
+    if cursor is None:
+        return stmt
+
+    if sort_column is id_column:
+        return stmt.where(id_column < cursor.record_id if descending else id_column > cursor.record_id)
+
+    value = cursor.value
+    if descending:
+        if value is None:
+            predicate = and_(sort_column.is_(None), id_column < cursor.record_id)
+        else:
+            predicate = or_(
+                sort_column < value,
+                and_(sort_column == value, id_column < cursor.record_id),
+                sort_column.is_(None),
+            )
+    else:
+        if value is None:
+            predicate = or_(
+                and_(sort_column.is_(None), id_column > cursor.record_id),
+                sort_column.is_not(None),
+            )
+        else:
+            predicate = or_(
+                sort_column > value,
+                and_(sort_column == value, id_column > cursor.record_id),
+            )
+    return stmt.where(predicate)
+
+
+def parse_flag(value: str | None, default: bool) -> bool:
+    """Interpret boolean query-string flags such as ``with_total=false``."""
+    if value is None:
+        return default
+    normalized = value.strip().lower()
+    if normalized in _TRUE_VALUES:
+        return True
+    if normalized in _FALSE_VALUES:
+        return False
+    return default
+
+
+def _coerce(value: Any, sort_column) -> Any:
+    python_type = sort_column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
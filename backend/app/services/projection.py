@@ -0,0 +1,77 @@
+"""Read-only column projections that skip ORM hydration."""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+Converter = Callable[[Any], Any]
+
+
+class Projection:
+    """A fixed list of model columns selected as plain row tuples.
+
+    Listing and export only read each record once, so selecting the columns
+    instead of the entity avoids building instances, identity-map entries
+    and attribute instrumentation. Columns always come back in the same
+    order, which lets the mappers below address values by position. The
+    statements are built from the same column objects every time, so
+    SQLAlchemy reuses its cached compiled form.
+    """
+
+    def __init__(self, model, fields: Sequence[str]) -> None:
+        self.model = model
+        self.fields = tuple(fields)
+        self.columns = tuple(getattr(model, name) for name in self.fields)
+        self._positions = {name: index for index, name in enumerate(self.fields)}
+
+    def select(self):
+        return select(*self.columns)
+
+    def values(self, instance) -> Tuple[Any, ...]:
+        """Read an already loaded ORM instance into the same tuple layout."""
+        return tuple(getattr(instance, name) for name in self.fields)
+
+    def document_mapper(self, converters: Dict[str, Converter] | None = None) -> Callable[[Sequence[Any]], Dict[str, Any]]:
+        """Return ``row -> dict`` keyed by field name; ``converters`` apply to non-null values."""
+        keys = self.fields
+        converted: Tuple[Tuple[str, Converter], ...] = tuple((converters or {}).items())
+        missing = [name for name, _ in converted if name not in self._positions]
+        if missing:
+            raise KeyError(", ".join(missing))
+
+        def to_document(row: Sequence[Any]) -> Dict[str, Any]:
+            document = dict(zip(keys, row))
+            for name, convert in converted:
+                value = document[name]
+                if value is not None:
+                    document[name] = convert(value)
+            return document
+
+        return to_document
+
+    def row_mapper(self, *spec: str | Tuple[str, Converter]) -> Callable[[Sequence[Any]], List[Any]]:
+        """Return ``row -> list`` in ``spec`` order; each entry is a field or ``(field, converter)``."""
+        plan: List[Tuple[int, Converter | None]] = []
+        for entry in spec:
+            name, convert = (entry, None) if isinstance(entry, str) else entry
+            plan.append((self._positions[name], convert))
+        steps = tuple(plan)
+
+        def to_row(row: Sequence[Any]) -> List[Any]:
+            return [row[index] if convert is None else convert(row[index]) for index, convert in steps]
+
+        return to_row
+
+
+def execute_rows(session: Session, stmt, *, yield_per: int | None = None) -> Iterator[Any]:
+    """Run ``stmt`` on the session's connection and return Core rows.
+
+    Going through the connection skips the ORM result layer entirely;
+    ``yield_per`` streams with a server-side cursor in fixed-size batches.
+    """
+    if yield_per:
+        stmt = stmt.execution_options(yield_per=yield_per, stream_results=True)
+    return session.connection().execute(stmt)
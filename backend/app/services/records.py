@@ -0,0 +1,52 @@
+"""Column projections and JSON documents of the two record tables.
+
+Shared by the dataset routes and the collaborator history, which read the
+same columns and must serialize rows identically.
+"""
+
+from __future__ import annotations
+
+from ..models import IntegrationRecord, OccurrenceRecord
+from .projection import Projection
+
+INTEGRATION_FIELDS = (
+    "id",
+    "matricula",
+    "nome",
+    "setor",
+    "cargo",
+    "turno",
+    "integracao",
+    "supervisor",
+    "data",
+    "observacao",
+    "submitted_at",
+)
+
+OCCURRENCE_FIELDS = (
+    "id",
+    "matricula",
+    "nome",
+    "setor",
+    "cargo",
+    "turno",
+    "supervisor",
+    "motivo",
+    "grau",
+    "grau_label",
+    "volumes",
+    "observacao",
+    "created_at",
+)
+
+
+def _isoformat(value) -> str | None:
+    return value.isoformat() if value else None
+
+
+# Listing and export read these columns as plain rows, never as ORM objects.
+INTEGRATION_COLUMNS = Projection(IntegrationRecord, INTEGRATION_FIELDS)
+OCCURRENCE_COLUMNS = Projection(OccurrenceRecord, OCCURRENCE_FIELDS)
+
+serialize_integration_record = INTEGRATION_COLUMNS.document_mapper({"data": _isoformat, "submitted_at": _isoformat})
+serialize_occurrence_record = OCCURRENCE_COLUMNS.document_mapper({"created_at": _isoformat})
@@ -0,0 +1,180 @@
+"""Daily rollup tables kept in step with the record tables.
+
+Each write adjusts the rollup row of its (day, dimensions) key inside the
+same transaction, so year-long dashboards read one row per day and key
+instead of every record.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+from sqlalchemy import Date, delete, func, insert, select, union_all, update
+
+from ..models import IntegrationDailyRollup, IntegrationRecord, OccurrenceDailyRollup, OccurrenceRecord
+from .archive import archive_enabled, archive_table
+
+_logger = logging.getLogger("integration.rollups")
+
+# Inserted ids folded into the rollup per grouped query.
+_ID_CHUNK = 500
+
+_Key = Tuple[Any, ...]
+_Contribution = Tuple["Rollup", _Key, Dict[str, int]]
+
+
+@dataclass(frozen=True)
+class Rollup:
+    """How one record table folds into its daily rollup table."""
+
+    model: Any
+    source: Any
+    source_day: Callable[[Any], Any]
+    record_day: Callable[[Any], Any]
+    keys: Tuple[str, ...]
+    sums: Dict[str, str]
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return ("day", *self.keys)
+
+    def grouped(self, rows=None):
+        """``rows`` (the source table by default) grouped into rollup rows, as a select."""
+        rows = self.source.__table__ if rows is None else rows
+        day = self.source_day(rows.c)
+        key_columns = [rows.c[name] for name in self.keys]
+        return select(
+            day.label("day"),
+            *key_columns,
+            func.count().label("record_count"),
+            *(func.coalesce(func.sum(rows.c[column]), 0).label(name) for name, column in self.sums.items()),
+        ).group_by(day, *key_columns)
+
+    def all_rows(self):
+        """Source rows, unioned with the archived ones when an archive is attached."""
+        hot = self.source.__table__
+        if not archive_enabled():
+            return hot
+        return union_all(select(hot), select(archive_table(self.source))).subquery("records")
+
+
+ROLLUPS: Dict[Any, Rollup] = {
+    OccurrenceRecord: Rollup(
+        model=OccurrenceDailyRollup,
+        source=OccurrenceRecord,
+        source_day=lambda columns: func.date(columns.created_at, type_=Date),
+        record_day=lambda record: record.created_at.date(),
+        keys=("setor", "turno", "motivo", "grau"),
+        sums={"volume_sum": "volumes"},
+    ),
+    IntegrationRecord: Rollup(
+        model=IntegrationDailyRollup,
+        source=IntegrationRecord,
+        source_day=lambda columns: columns.data,
+        record_day=lambda record: record.data,
+        keys=("setor", "integracao"),
+        sums={},
+    ),
+}
+
+
+def contribution(record) -> _Contribution | None:
+    """Capture what ``record`` currently adds to its rollup (call before mutating it)."""
+    rollup = ROLLUPS.get(type(record))
+    if rollup is None:
+        return None
+    key = (rollup.record_day(record), *(getattr(record, name) for name in rollup.keys))
+    sums = {name: getattr(record, column) or 0 for name, column in rollup.sums.items()}
+    return rollup, key, sums
+
+
+def track_insert(session, record) -> None:
+    _merge(session, [(contribution(record), 1)])
+
+
+def track_delete(session, record) -> None:
+    _merge(session, [(contribution(record), -1)])
+
+
+def track_update(session, before: _Contribution | None, record) -> None:
+    """Move the contribution captured in ``before`` to the record's current key."""
+    _merge(session, [(before, -1), (contribution(record), 1)])
+
+
+def track_inserted_ids(session, model, record_ids: Sequence[int]) -> None:
+    """Fold rows written by a bulk insert into the rollup with grouped queries."""
+    rollup = ROLLUPS.get(model)
+    if rollup is None or not record_ids:
+        return
+    deltas: Dict[_Key, List[int]] = {}
+    for start in range(0, len(record_ids), _ID_CHUNK):
+        chunk = record_ids[start : start + _ID_CHUNK]
+        for row in session.execute(rollup.grouped().where(model.__table__.c.id.in_(chunk))):
+            key = tuple(row[: len(rollup.columns)])
+            counts = deltas.setdefault(key, [0] * (1 + len(rollup.sums)))
+            for index, value in enumerate(row[len(rollup.columns) :]):
+                counts[index] += value
+    for key, counts in deltas.items():
+        _apply(session, rollup, key, counts[0], dict(zip(rollup.sums, counts[1:])))
+
+
+def rebuild_rollups(connection, models: Iterable[Any] | None = None) -> Dict[str, int]:
+    """Recompute rollup tables from their sources, archive included; returns the rows written per table."""
+    written: Dict[str, int] = {}
+    for source in models or ROLLUPS:
+        rollup = ROLLUPS[source]
+        table = rollup.model.__table__
+        connection.execute(delete(table))
+        grouped = rollup.grouped(rollup.all_rows())
+        connection.execute(insert(table).from_select([*rollup.columns, "record_count", *rollup.sums], grouped))
+        written[table.name] = connection.execute(select(func.count()).select_from(table)).scalar_one()
+    return written
+
+
+def install_rollups(connection) -> None:
+    """Fill rollup tables that are empty while their source already has rows."""
+    missing = []
+    for source, rollup in ROLLUPS.items():
+        has_rollup = connection.execute(select(rollup.model.id).limit(1)).first() is not None
+        has_source = connection.execute(select(source.id).limit(1)).first() is not None
+        if has_source and not has_rollup:
+            missing.append(source)
+    if missing:
+        written = rebuild_rollups(connection, missing)
+        _logger.info("rollups_built %s", " ".join(f"{name}={rows}" for name, rows in written.items()))
+
+
+def _merge(session, changes: Iterable[Tuple[_Contribution | None, int]]) -> None:
+    deltas: Dict[Tuple[Any, _Key], List[Any]] = {}
+    for found, sign in changes:
+        if found is None:
+            continue
+        rollup, key, sums = found
+        entry = deltas.setdefault((id(rollup), key), [rollup, 0, dict.fromkeys(rollup.sums, 0)])
+        entry[1] += sign
+        for name, value in sums.items():
+            entry[2][name] += sign * value
+    for (_, key), (rollup, count, sums) in deltas.items():
+        if count or any(sums.values()):
+            _apply(session, rollup, key, count, sums)
+
+
+def _apply(session, rollup: Rollup, key: _Key, count: int, sums: Dict[str, int]) -> None:
+    table = rollup.model.__table__
+    match = [
+        table.c[name].is_(None) if value is None else table.c[name] == value
+        for name, value in zip(rollup.columns, key)
+    ]
+    values = {"record_count": table.c.record_count + count}
+    values.update({name: table.c[name] + delta for name, delta in sums.items()})
+    result = session.execute(update(table).where(*match).values(values))
+
+    if result.rowcount == 0:
+        if count <= 0:
+            _logger.warning("rollup_drift table=%s key=%s", table.name, key)
+            return
+        session.execute(insert(table).values({**dict(zip(rollup.columns, key)), "record_count": count, **sums}))
+    elif count < 0:
+        session.execute(delete(table).where(*match, table.c.record_count <= 0))
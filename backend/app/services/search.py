@@ -0,0 +1,169 @@
+"""Full-text search helpers backed by SQLite FTS5."""
+
+from __future__ import annotations
+
+import logging
+import re
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import column, or_, select, table, text
+from sqlalchemy.engine import Connection
+
+_logger = logging.getLogger("integration.search")
+
+# Columns mirrored into each FTS5 index. The tokenizer folds accents and case,
+# so "conferencia" matches "Conferência".
+SEARCH_INDEXES: Dict[str, Sequence[str]] = {
+    "integration_records": (
+        "nome",
+        "matricula",
+        "setor",
+        "cargo",
+        "turno",
+        "integracao",
+        "supervisor",
+        "observacao",
+    ),
+    "occurrence_records": (
+        "nome",
+        "matricula",
+        "setor",
+        "cargo",
+        "turno",
+        "motivo",
+        "supervisor",
+        "observacao",
+    ),
+}
+
+_TOKENIZER = "unicode61 remove_diacritics 2"
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+_fts_enabled = False
+
+
+def install_search_index(connection: Connection) -> bool:
+    """Create the FTS5 tables and sync triggers when SQLite supports them."""
+    global _fts_enabled
+
+    if connection.dialect.name != "sqlite":
+        _fts_enabled = False
+        return False
+
+    try:
+        for source, columns in SEARCH_INDEXES.items():
+            _create_index(connection, source, columns)
+    except Exception:  # pragma: no cover - sqlite builds without FTS5
+        _logger.warning("FTS5 indisponível; buscas usarão ilike.", exc_info=True)
+        _fts_enabled = False
+        return False
+
+    _fts_enabled = True
+    return True
+
+
+def fts_enabled() -> bool:
+    return _fts_enabled
+
+
+def build_match_query(search_term: str) -> str | None:
+    """Translate free text into an FTS5 query with prefix matching per token."""
+    tokens = _TOKEN_PATTERN.findall(search_term or "")
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def build_search_filters(
+    model, search_term: str, fallback_columns: Sequence[Any], *, indexed: bool = True
+) -> List[Any]:
+    """Return WHERE clauses matching ``search_term`` against ``model``.
+
+    Uses the FTS5 index when available and falls back to ``ilike`` otherwise;
+    ``indexed=False`` forces ``ilike`` for rows the index does not cover,
+    such as archived ones.
+    """
+    if not search_term:
+        return []
+
+    if _fts_enabled and indexed:
+        match_query = build_match_query(search_term)
+        if match_query is None:
+            return []
+        index = _index_table(model.__tablename__)
+        matches = select(index.c.rowid).where(_match(index, match_query))
+        return [model.id.in_(matches)]
+
+    like_pattern = f"%{search_term}%"
+    return [or_(*(col.ilike(like_pattern) for col in fallback_columns))]
+
+
+def order_by_relevance(stmt, model, search_term: str):
+    """Join the FTS5 ranking into ``stmt`` and order by BM25, or return ``None``."""
+    if not _fts_enabled:
+        return None
+    match_query = build_match_query(search_term)
+    if match_query is None:
+        return None
+    index = _index_table(model.__tablename__)
+    ranked = (
+        select(index.c.rowid.label("rowid"), index.c.rank.label("rank"))
+        .where(_match(index, match_query))
+        .subquery("search_rank")
+    )
+    return stmt.join(ranked, ranked.c.rowid == model.id).order_by(ranked.c.rank.asc(), model.id.desc())
+
+
+def _match(index, match_query: str):
+    return index.c[index.name].op("MATCH")(match_query)
+
+
+def _index_name(source: str) -> str:
+    return f"{source}_fts"
+
+
+def _index_table(source: str):
+    name = _index_name(source)
+    return table(name, column("rowid"), column("rank"), column(name))
+
+
+def _create_index(connection: Connection, source: str, columns: Sequence[str]) -> None:
+    index = _index_name(source)
+    column_list = ", ".join(columns)
+    new_values = ", ".join(f"new.{name}" for name in columns)
+    old_values = ", ".join(f"old.{name}" for name in columns)
+
+    exists = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": index},
+    ).first()
+
+    connection.execute(
+        text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {index} USING fts5("
+            f"{column_list}, content='{source}', content_rowid='id', tokenize='{_TOKENIZER}')"
+        )
+    )
+    connection.execute(
+        text(
+            f"CREATE TRIGGER IF NOT EXISTS {index}_ai AFTER INSERT ON {source} BEGIN "
+            f"INSERT INTO {index}(rowid, {column_list}) VALUES (new.id, {new_values}); END"
+        )
+    )
+    connection.execute(
+        text(
+            f"CREATE TRIGGER IF NOT EXISTS {index}_ad AFTER DELETE ON {source} BEGIN "
+            f"INSERT INTO {index}({index}, rowid, {column_list}) VALUES ('delete', old.id, {old_values}); END"
+        )
+    )
+    connection.execute(
+        text(
+            f"CREATE TRIGGER IF NOT EXISTS {index}_au AFTER UPDATE ON {source} BEGIN "
+            f"INSERT INTO {index}({index}, rowid, {column_list}) VALUES ('delete', old.id, {old_values}); "
+            f"INSERT INTO {index}(rowid, {column_list}) VALUES (new.id, {new_values}); END"
+        )
+    )
+
+    if not exists:
+        # Backfill rows written before the index existed.
+        connection.execute(text(f"INSERT INTO {index}({index}) VALUES ('rebuild')"))
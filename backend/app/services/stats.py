@@ -0,0 +1,234 @@
+"""Grouped counts and sums computed in SQL for the analytics endpoints."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from werkzeug.datastructures import MultiDict
+
+from .filters import date_range_clauses, parse_date
+
+TIME_BUCKETS = ("day", "week", "month", "year")
+
+# Dimension name used for the time bucket in ``group_by`` and in each row.
+PERIOD = "period"
+
+MAX_DIMENSIONS = 3
+MAX_ROWS = 5000
+
+
+@dataclass(frozen=True)
+class StatsDataset:
+    """Columns a table can be grouped, filtered and bucketed by.
+
+    ``rollup`` is a pre-aggregated daily table described the same way; it
+    answers any query whose dimensions, filters and metrics it covers, with
+    ``count`` summing its stored counts instead of counting rows.
+    """
+
+    name: str
+    model: Any
+    time_column: Any
+    dimensions: Mapping[str, Any]
+    metrics: Mapping[str, Any] = field(default_factory=dict)
+    count: Any = None
+    rollup: "StatsDataset | None" = None
+
+
+@dataclass(frozen=True)
+class StatsQuery:
+    group_by: Tuple[str, ...]
+    metrics: Tuple[str, ...]
+    bucket: str | None
+    filters: Dict[str, List[Any]]
+    start: date | None
+    end: date | None
+    pivot: str | None
+
+
+def parse_query(dataset: StatsDataset, args: MultiDict) -> StatsQuery:
+    """Validate request arguments; raises ``ValueError`` with a user-facing message."""
+    bucket = (args.get("bucket") or "").strip().lower() or None
+    if bucket is not None and bucket not in TIME_BUCKETS:
+        raise ValueError(f"Agrupamento de tempo inválido. Use: {', '.join(TIME_BUCKETS)}.")
+
+    group_by = _split_list(args, "group_by")
+    if bucket is not None and PERIOD not in group_by:
+        group_by.insert(0, PERIOD)
+    for name in group_by:
+        if name == PERIOD:
+            if bucket is None:
+                raise ValueError("Informe 'bucket' para agrupar por período.")
+        elif name not in dataset.dimensions:
+            raise ValueError(f"Dimensão inválida: {name}. Use: {', '.join(dataset.dimensions)}.")
+    if len(set(group_by)) != len(group_by):
+        raise ValueError("Dimensões repetidas em 'group_by'.")
+    if len(group_by) > MAX_DIMENSIONS:
+        raise ValueError(f"Agrupe por no máximo {MAX_DIMENSIONS} dimensões.")
+
+    metrics = _split_list(args, "metrics") or ["count"]
+    available = ["count", *dataset.metrics]
+    for name in metrics:
+        if name not in available:
+            raise ValueError(f"Métrica inválida: {name}. Use: {', '.join(available)}.")
+
+    pivot = (args.get("pivot") or "").strip() or None
+    if pivot is not None:
+        if pivot not in group_by:
+            raise ValueError("A dimensão de 'pivot' precisa estar em 'group_by'.")
+        if len(group_by) < 2:
+            raise ValueError("O pivot exige ao menos duas dimensões.")
+
+    filters: Dict[str, List[Any]] = {}
+    for name, column in dataset.dimensions.items():
+        values = [_coerce(column, value.strip()) for value in args.getlist(name) if value.strip()]
+        if values:
+            filters[name] = values
+
+    start = parse_date(args.get("start"), "start")
+    end = parse_date(args.get("end"), "end")
+    if start and end and start > end:
+        raise ValueError("'start' deve ser anterior ou igual a 'end'.")
+
+    return StatsQuery(tuple(group_by), tuple(dict.fromkeys(metrics)), bucket, filters, start, end, pivot)
+
+
+def aggregate(session: Session, dataset: StatsDataset, query: StatsQuery) -> Dict[str, Any]:
+    """Run ``query`` as one ``GROUP BY`` statement (plus its grand totals) and shape the result."""
+    source = dataset.rollup if _covers(dataset.rollup, query) else dataset
+    group_exprs = [
+        _bucket_expression(source.time_column, query.bucket) if name == PERIOD else source.dimensions[name]
+        for name in query.group_by
+    ]
+    metric_exprs = [_metric_expression(source, name) for name in query.metrics]
+
+    stmt = select(
+        *(expr.label(name) for name, expr in zip(query.group_by, group_exprs)),
+        *(expr.label(name) for name, expr in zip(query.metrics, metric_exprs)),
+    ).select_from(source.model)
+    stmt = stmt.where(*_filter_clauses(source, query))
+    if group_exprs:
+        stmt = stmt.group_by(*group_exprs).order_by(*group_exprs)
+    stmt = stmt.limit(MAX_ROWS + 1)
+
+    rows = [dict(row._mapping) for row in session.connection().execute(stmt)]
+    truncated = len(rows) > MAX_ROWS
+    rows = rows[:MAX_ROWS]
+
+    totals_stmt = select(*(expr.label(name) for name, expr in zip(query.metrics, metric_exprs))).select_from(source.model)
+    totals_stmt = totals_stmt.where(*_filter_clauses(source, query))
+    totals = dict(session.connection().execute(totals_stmt).one()._mapping)
+
+    payload: Dict[str, Any] = {
+        "dataset": dataset.name,
+        "group_by": list(query.group_by),
+        "metrics": list(query.metrics),
+        "bucket": query.bucket,
+        "filters": {
+            **query.filters,
+            "start": query.start.isoformat() if query.start else None,
+            "end": query.end.isoformat() if query.end else None,
+        },
+        "rows": rows,
+        "totals": totals,
+        "truncated": truncated,
+        "source": "rollup" if source is not dataset else "records",
+    }
+    if query.pivot is not None:
+        payload["pivot"] = _pivot(rows, query)
+    return payload
+
+
+def _split_list(args: MultiDict, name: str) -> List[str]:
+    values: List[str] = []
+    for raw in args.getlist(name):
+        values.extend(part.strip() for part in raw.split(",") if part.strip())
+    return values
+
+
+def _bucket_expression(column, bucket: str):
+    # SQLite date functions; a week is labelled by its Monday.
+    if bucket == "day":
+        return func.date(column)
+    if bucket == "week":
+        return func.date(column, "-6 days", "weekday 1")
+    if bucket == "month":
+        return func.strftime("%Y-%m", column)
+    return func.strftime("%Y", column)
+
+
+def _covers(rollup: StatsDataset | None, query: StatsQuery) -> bool:
+    if rollup is None:
+        return False
+    dimensions = [name for name in query.group_by if name != PERIOD] + list(query.filters)
+    return all(name in rollup.dimensions for name in dimensions) and all(
+        name == "count" or name in rollup.metrics for name in query.metrics
+    )
+
+
+def _metric_expression(dataset: StatsDataset, name: str):
+    if name == "count":
+        return dataset.count if dataset.count is not None else func.count()
+    return dataset.metrics[name]
+
+
+def _filter_clauses(dataset: StatsDataset, query: StatsQuery) -> List[Any]:
+    clauses: List[Any] = []
+    for name, values in query.filters.items():
+        column = dataset.dimensions[name]
+        clauses.append(column == values[0] if len(values) == 1 else column.in_(values))
+
+    clauses.extend(date_range_clauses(dataset.time_column, query.start, query.end))
+    return clauses
+
+
+def _coerce(column, value: str) -> Any:
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is int:
+        try:
+            return int(value)
+        except ValueError as error:
+            raise ValueError(f"Valor inválido para '{column.key}': {value}") from error
+    return value
+
+
+def _pivot(rows: Sequence[Dict[str, Any]], query: StatsQuery) -> Dict[str, Any]:
+    """Fold the grouped rows into a matrix: pivot values as columns, the rest as rows."""
+    row_dims = [name for name in query.group_by if name != query.pivot]
+    metric = query.metrics[0]
+
+    column_keys: List[Any] = []
+    row_keys: List[Tuple[Any, ...]] = []
+    cells: Dict[Tuple[Tuple[Any, ...], Any], Any] = {}
+    seen_columns = set()
+    seen_rows = set()
+    for row in rows:
+        row_key = tuple(row[name] for name in row_dims)
+        column_key = row[query.pivot]
+        if row_key not in seen_rows:
+            seen_rows.add(row_key)
+            row_keys.append(row_key)
+        if column_key not in seen_columns:
+            seen_columns.add(column_key)
+            column_keys.append(column_key)
+        cells[(row_key, column_key)] = row[metric]
+
+    column_keys.sort(key=lambda key: (key is None, key))
+    matrix = [[cells.get((row_key, column_key)) or 0 for column_key in column_keys] for row_key in row_keys]
+    return {
+        "rows": row_dims,
+        "column": query.pivot,
+        "metric": metric,
+        "row_keys": [list(key) for key in row_keys],
+        "column_keys": column_keys,
+        "matrix": matrix,
+        "row_totals": [sum(values) for values in matrix],
+        "column_totals": [sum(values) for values in zip(*matrix)] if matrix else [0] * len(column_keys),
+    }
@@ -0,0 +1,43 @@
+"""Monotonic data versions used to key caches across worker processes."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Dict, Iterable
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from ..models import DataVersion
+
+INTEGRATION_SCOPE = "integration_records"
+OCCURRENCE_SCOPE = "occurrence_records"
+CONFIGURATION_SCOPE = "config_entries"
+# Its version is the highest purged journal seq rather than a write counter.
+JOURNAL_SCOPE = "change_journal"
+
+
+def bump_version(session: Session, scope: str) -> None:
+    """Advance the version of ``scope`` inside the caller's transaction."""
+    result = session.execute(
+        update(DataVersion)
+        .where(DataVersion.scope == scope)
+        .values(version=DataVersion.version + 1, updated_at=datetime.utcnow())
+    )
+    if result.rowcount == 0:
+        session.add(DataVersion(scope=scope, version=1, updated_at=datetime.utcnow()))
+        session.flush()
+
+
+def get_versions(session: Session, scopes: Iterable[str]) -> Dict[str, int]:
+    """Return the current version of each scope, ``0`` when never written."""
+    scopes = list(scopes)
+    versions = {scope: 0 for scope in scopes}
+    stmt = select(DataVersion.scope, DataVersion.version).where(DataVersion.scope.in_(scopes))
+    for scope, version in session.execute(stmt):
+        versions[scope] = version
+    return versions
+
+
+def get_version(session: Session, scope: str) -> int:
+    return get_versions(session, [scope])[scope]
@@ -0,0 +1,338 @@
+"""Pre-forked multi-process WSGI serving built on the standard library and werkzeug."""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import ssl
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+
+from .services.audit import stop_pipeline
+from .services.metrics import flush_metrics
+
+_logger = logging.getLogger("integration.serving")
+
+# Idle keep-alive connections are dropped after this many seconds so a
+# recycling worker can drain.
+_KEEPALIVE_TIMEOUT = 15
+
+# A worker that dies sooner than this after starting is not respawned in a
+# tight loop; the supervisor backs off instead.
+_RESPAWN_BACKOFF_SECONDS = 1.0
+
+# WSGI environ key of a callable a view uses to keep the client connection
+# once its response has been written (see ``StreamingRequestHandler``).
+STREAM_HANDOFF = "integration.stream_handoff"
+
+AppFactory = Callable[[], Callable]
+
+
+class StreamingRequestHandler(WSGIRequestHandler):
+    """Request handler that can hand a response's connection over to the application.
+
+    A view calls ``environ[STREAM_HANDOFF](adopt)`` and returns a response
+    without a length. After the headers and body are written the socket is
+    detached from the server and passed to ``adopt``, which owns it from
+    then on, and the handler thread is free for the next request.
+    """
+
+    _adopt: Callable[[socket.socket], None] | None = None
+
+    def make_environ(self):
+        environ = super().make_environ()
+        if not isinstance(self.connection, ssl.SSLSocket):
+            environ[STREAM_HANDOFF] = self._claim
+        return environ
+
+    def _claim(self, adopt: Callable[[socket.socket], None]) -> None:
+        self._adopt = adopt
+        # An HTTP/1.0 body is not chunked and simply ends when the socket closes;
+        # a chunked one would be terminated as soon as the view returns.
+        self.protocol_version = "HTTP/1.0"
+
+    def run_wsgi(self) -> None:
+        super().run_wsgi()
+        adopt, self._adopt = self._adopt, None
+        if adopt is None:
+            return
+        self.close_connection = True
+        try:
+            self.wfile.flush()
+            # detach() leaves the server's socket object closed without closing the
+            # descriptor, so its shutdown/close after this request become no-ops.
+            sock = socket.socket(fileno=self.connection.detach())
+        except OSError:
+            return
+        adopt(sock)
+
+
+class _RequestHandler(StreamingRequestHandler):
+    protocol_version = "HTTP/1.1"
+    timeout = _KEEPALIVE_TIMEOUT
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    """Serve connections on a fixed thread pool and stop after ``max_requests``.
+
+    The accept loop blocks while every thread is busy, leaving new
+    connections on the shared socket for the other workers.
+    """
+
+    multithread = True
+    multiprocess = True
+
+    def __init__(self, host: str, port: int, app, *, threads: int, max_requests: int, fd: int) -> None:
+        self._slots = threading.BoundedSemaphore(max(threads, 1))
+        self._pool = ThreadPoolExecutor(max_workers=max(threads, 1), thread_name_prefix="http")
+        self._max_requests = max_requests
+        self._handled = 0
+        self._handled_lock = threading.Lock()
+        self._stopping = threading.Event()
+        super().__init__(host, port, self._counting(app), handler=_RequestHandler, fd=fd)
+        # Workers race for each connection; a loser must return to its loop, not block in accept().
+        self.socket.setblocking(False)
+
+    def process_request(self, request, client_address) -> None:
+        self._slots.acquire()
+        self._pool.submit(self._handle, request, client_address)
+
+    def _handle(self, request, client_address) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def _counting(self, app):
+        def application(environ, start_response):
+            with self._handled_lock:
+                self._handled += 1
+                recycle = self._max_requests and self._handled >= self._max_requests
+            if recycle:
+                self.stop()
+            return app(environ, start_response)
+
+        return application
+
+    def stop(self) -> None:
+        """Stop accepting connections; in-flight requests finish first."""
+        if not self._stopping.is_set():
+            self._stopping.set()
+            threading.Thread(target=self.shutdown, daemon=True).start()
+
+    def drain(self) -> None:
+        self._pool.shutdown(wait=True)
+
+
+def _serve_worker(app, sock: socket.socket, host: str, port: int, threads: int, max_requests: int) -> None:
+    server = PooledWSGIServer(host, port, app, threads=threads, max_requests=max_requests, fd=sock.fileno())
+    if hasattr(signal, "SIGTERM"):
+        signal.signal(signal.SIGTERM, lambda *_: server.stop())
+    if hasattr(signal, "SIGINT"):
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _logger.info("worker_started pid=%s threads=%s max_requests=%s", os.getpid(), threads, max_requests)
+    try:
+        server.serve_forever()
+    finally:
+        server.drain()
+        flush_metrics()
+        _logger.info("worker_stopped pid=%s requests=%s", os.getpid(), server._handled)
+
+
+def _spawned_worker(app_factory: AppFactory, connection, host: str, port: int, threads: int, max_requests: int) -> None:
+    """Entry point of Windows workers: rebuild the app and adopt the shared socket."""
+    sock = socket.fromshare(connection.recv())
+    connection.close()
+    _serve_worker(app_factory(), sock, host, port, threads, max_requests)
+
+
+class PreforkServer:
+    """Bind once, then keep ``workers`` processes serving the shared socket.
+
+    POSIX workers are forked from a process that already built the app, so
+    they share its memory copy-on-write. Windows has no fork: workers are
+    spawned, build their own app and receive the socket via
+    :meth:`socket.socket.share`. Workers exiting after ``max_requests`` (or
+    crashing) are replaced. An already built ``app`` is reused by forked
+    workers instead of calling the factory again.
+    """
+
+    def __init__(
+        self,
+        app_factory: AppFactory,
+        host: str,
+        port: int,
+        *,
+        workers: int,
+        threads: int,
+        max_requests: int = 0,
+        app=None,
+    ) -> None:
+        self._app_factory = app_factory
+        self._host = host
+        self._port = port
+        self._workers = max(workers, 1)
+        self._threads = max(threads, 1)
+        self._max_requests = max(max_requests, 0)
+        self._socket: socket.socket | None = None
+        self._app = app
+        self._children: Dict[int, object] = {}
+        self._stopping = threading.Event()
+        self._spawn_lock = threading.Lock()
+        self._supervisor: threading.Thread | None = None
+        self._use_fork = hasattr(os, "fork")
+
+    @property
+    def address(self) -> str:
+        return f"{self._host}:{self._port}"
+
+    def start(self) -> None:
+        """Bind the socket and start workers plus a supervisor thread."""
+        family = socket.AF_INET6 if ":" in self._host else socket.AF_INET
+        self._socket = socket.create_server((self._host, self._port), family=family, backlog=128, reuse_port=False)
+        self._socket.set_inheritable(True)
+        if self._use_fork and self._app is None:
+            self._app = self._app_factory()
+
+        for _ in range(self._workers):
+            self._spawn()
+        _logger.info(
+            "prefork_started address=%s workers=%s threads=%s mode=%s",
+            self.address,
+            self._workers,
+            self._threads,
+            "fork" if self._use_fork else "spawn",
+        )
+        self._supervisor = threading.Thread(target=self._supervise, name="prefork-supervisor", daemon=True)
+        self._supervisor.start()
+
+    def serve_forever(self) -> None:
+        """Run in the foreground until SIGINT/SIGTERM."""
+        self.start()
+        for name in ("SIGINT", "SIGTERM"):
+            if hasattr(signal, name):
+                signal.signal(getattr(signal, name), lambda *_: self._stopping.set())
+        try:
+            while not self._stopping.wait(0.5):
+                pass
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self, timeout: float = _KEEPALIVE_TIMEOUT + 5) -> None:
+        """Ask every worker to finish its requests and exit."""
+        with self._spawn_lock:
+            self._stopping.set()
+        if self._supervisor is not None and self._supervisor is not threading.current_thread():
+            self._supervisor.join(timeout=2)
+        for pid in list(self._children):
+            self._terminate(pid)
+
+        deadline = time.monotonic() + timeout
+        while self._children and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.1)
+        for pid in list(self._children):
+            self._kill(pid)
+        self._reap()
+
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def _supervise(self) -> None:
+        while not self._stopping.is_set():
+            for pid, started in self._reap():
+                _logger.info("worker_exited pid=%s", pid)
+                if time.monotonic() - started < _RESPAWN_BACKOFF_SECONDS and self._stopping.wait(_RESPAWN_BACKOFF_SECONDS):
+                    break
+                with self._spawn_lock:
+                    if self._stopping.is_set():
+                        break
+                    self._spawn()
+            self._stopping.wait(0.2)
+
+    def _spawn(self) -> None:
+        assert self._socket is not None
+        if self._use_fork:
+            pid = os.fork()
+            if pid == 0:
+                code = 0
+                try:
+                    _serve_worker(self._app, self._socket, self._host, self._port, self._threads, self._max_requests)
+                except BaseException:
+                    _logger.exception("worker_crashed pid=%s", os.getpid())
+                    code = 1
+                finally:
+                    stop_pipeline()
+                    logging.shutdown()
+                    os._exit(code)
+            self._children[pid] = (time.monotonic(), None)
+            return
+
+        context = multiprocessing.get_context("spawn")
+        parent_end, child_end = context.Pipe()
+        process = context.Process(
+            target=_spawned_worker,
+            args=(self._app_factory, child_end, self._host, self._port, self._threads, self._max_requests),
+            daemon=True,
+        )
+        process.start()
+        parent_end.send(self._socket.share(process.pid))
+        parent_end.close()
+        child_end.close()
+        self._children[process.pid] = (time.monotonic(), process)
+
+    def _reap(self) -> List[tuple]:
+        exited = []
+        for pid, (started, process) in list(self._children.items()):
+            if process is not None:
+                alive = process.is_alive()
+            else:
+                try:
+                    alive = os.waitpid(pid, os.WNOHANG) == (0, 0)
+                except ChildProcessError:
+                    alive = False
+            if not alive:
+                del self._children[pid]
+                exited.append((pid, started))
+        return exited
+
+    def _terminate(self, pid: int) -> None:
+        _, process = self._children.get(pid, (None, None))
+        try:
+            if process is not None:
+                process.terminate()
+            else:
+                os.kill(pid, signal.SIGTERM)
+        except (OSError, ValueError):
+            pass
+
+    def _kill(self, pid: int) -> None:
+        _, process = self._children.get(pid, (None, None))
+        try:
+            if process is not None:
+                process.kill()
+            else:
+                os.kill(pid, signal.SIGKILL)
+        except (OSError, ValueError):
+            pass
+
+
+def serve(app_factory: AppFactory, host: str, port: int, *, workers: int, threads: int, max_requests: int = 0) -> None:
+    """Serve ``app_factory()`` with ``workers`` processes of ``threads`` threads each."""
+    if sys.platform == "win32":
+        multiprocessing.freeze_support()
+    PreforkServer(app_factory, host, port, workers=workers, threads=threads, max_requests=max_requests).serve_forever()
@@ -0,0 +1,167 @@
+"""Compare ORM hydration with the column-projection read path.
+
+Runs against a throw-away SQLite file so production data is never touched:
+
+    python backend/benchmark.py --rows 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Mede o custo por linha de listagem e exportação.")
+    parser.add_argument("--rows", type=int, default=100_000, help="Linhas na exportação (default: %(default)s)")
+    parser.add_argument("--page-size", type=int, default=50, help="Linhas por página (default: %(default)s)")
+    parser.add_argument("--pages", type=int, default=500, help="Páginas medidas (default: %(default)s)")
+    return parser.parse_args()
+
+
+def _orm_document(record) -> Dict[str, Any]:
+    """Serializer used before the projection path, kept here as the baseline."""
+    return {
+        "id": record.id,
+        "matricula": record.matricula,
+        "nome": record.nome,
+        "setor": record.setor,
+        "cargo": record.cargo,
+        "turno": record.turno,
+        "integracao": record.integracao,
+        "supervisor": record.supervisor,
+        "data": record.data.isoformat() if record.data else None,
+        "observacao": record.observacao,
+        "submitted_at": record.submitted_at.isoformat(),
+    }
+
+
+def _orm_sheet_row(record) -> List[Any]:
+    return [
+        record.id,
+        record.matricula or "",
+        record.nome,
+        record.setor,
+        record.cargo,
+        record.turno,
+        record.integracao,
+        record.supervisor,
+        record.data.strftime("%d/%m/%Y") if record.data else "",
+        record.observacao or "",
+        record.submitted_at.strftime("%d/%m/%Y %H:%M") if record.submitted_at else "",
+    ]
+
+
+def _seed(rows: int) -> None:
+    from app.database import session_scope
+    from app.models import IntegrationRecord
+    from app.services.ingestion import bulk_insert
+    from app.services.versioning import INTEGRATION_SCOPE
+
+    started = datetime(2025, 1, 1, 7, 0)
+    batch: List[Dict[str, Any]] = []
+    for index in range(rows):
+        batch.append(
+            {
+                "matricula": str(100000 + index),
+                "nome": f"Colaborador {index}",
+                "setor": ("Expedição", "Recebimento", "Qualidade")[index % 3],
+                "integracao": "Sim",
+                "supervisor": f"SUPERVISOR {index % 12}",
+                "turno": ("1° Turno", "2° Turno", "3° Turno")[index % 3],
+                "cargo": "Operador",
+                "data": date(2025, 1, 1) + timedelta(days=index % 365),
+                "observacao": None if index % 4 else "Observação de teste",
+                "submitted_at": started + timedelta(minutes=index),
+            }
+        )
+        if len(batch) == 5000:
+            with session_scope() as session:
+                bulk_insert(session, IntegrationRecord, batch, INTEGRATION_SCOPE)
+            batch = []
+    if batch:
+        with session_scope() as session:
+            bulk_insert(session, IntegrationRecord, batch, INTEGRATION_SCOPE)
+
+
+def _measure(label: str, rows_per_run: int, runs: int, run: Callable[[], int]) -> float:
+    run()  # warm the compiled statement cache
+    wall_started = time.perf_counter()
+    cpu_started = time.process_time()
+    produced = 0
+    for _ in range(runs):
+        produced += run()
+    cpu = time.process_time() - cpu_started
+    wall = time.perf_counter() - wall_started
+    per_row = cpu / max(produced, 1) * 1_000_000
+    print(f"  {label:<12} {per_row:8.2f} µs/linha (CPU)   {wall:8.3f} s total   {produced} linhas")
+    if produced != rows_per_run * runs:
+        print(f"  aviso: esperado {rows_per_run * runs} linhas", file=sys.stderr)
+    return per_row
+
+
+def main() -> int:
+    args = parse_args()
+    workdir = tempfile.mkdtemp(prefix="benchmark-")
+    os.environ["DATABASE_PATH"] = str(Path(workdir) / "benchmark.db")
+    os.environ.setdefault("AUDIT_LOG_FILE", "")
+    os.environ.setdefault("APP_LOG_LEVEL", "WARNING")
+
+    from sqlalchemy import select
+
+    from app import create_app
+    from app.database import read_scope
+    from app.models import IntegrationRecord
+    from app.routes.integration import _integration_sheet_row
+    from app.services.records import INTEGRATION_COLUMNS, serialize_integration_record
+    from app.services.export import EXPORT_CHUNK_SIZE
+    from app.services.projection import execute_rows
+
+    create_app("production")
+    print(f"Gerando {args.rows} linhas em {workdir} ...")
+    _seed(args.rows)
+
+    # Primary-key order keeps the query itself cheap, so the numbers isolate row handling.
+    order = IntegrationRecord.id.desc()
+    page_size = args.page_size
+
+    def orm_page() -> int:
+        with read_scope() as session:
+            stmt = select(IntegrationRecord).order_by(order).offset(page_size).limit(page_size)
+            return len([_orm_document(record) for record in session.execute(stmt).scalars().all()])
+
+    def projection_page() -> int:
+        with read_scope() as session:
+            stmt = INTEGRATION_COLUMNS.select().order_by(order).offset(page_size).limit(page_size)
+            return len([serialize_integration_record(row) for row in execute_rows(session, stmt).all()])
+
+    def orm_export() -> int:
+        with read_scope() as session:
+            stmt = select(IntegrationRecord).order_by(order).execution_options(yield_per=EXPORT_CHUNK_SIZE)
+            return sum(1 for record in session.execute(stmt).scalars() if _orm_sheet_row(record))
+
+    def projection_export() -> int:
+        with read_scope() as session:
+            stmt = INTEGRATION_COLUMNS.select().order_by(order)
+            return sum(1 for row in execute_rows(session, stmt, yield_per=EXPORT_CHUNK_SIZE) if _integration_sheet_row(row))
+
+    print(f"\nPágina de {page_size} linhas x {args.pages}:")
+    before = _measure("ORM", page_size, args.pages, orm_page)
+    after = _measure("projeção", page_size, args.pages, projection_page)
+    print(f"  economia: {before - after:.2f} µs/linha ({(1 - after / before) * 100:.0f}%)")
+
+    print(f"\nExportação de {args.rows} linhas (consulta + linha da planilha):")
+    before = _measure("ORM", args.rows, 1, orm_export)
+    after = _measure("projeção", args.rows, 1, projection_export)
+    print(f"  economia: {before - after:.2f} µs/linha ({(1 - after / before) * 100:.0f}%)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
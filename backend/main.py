@@ -3,12 +3,15 @@
 from __future__ import annotations
 
 import argparse
+import multiprocessing
 import os
+from functools import partial
 from pathlib import Path
 
 from werkzeug.serving import run_simple
 
-from app import create_app
+from app import FRONTEND_DIR, create_app
+from app.serving import StreamingRequestHandler, serve
 
 
 def parse_args() -> argparse.Namespace:
@@ -26,19 +29,56 @@ def parse_args() -> argparse.Namespace:
         default=os.getenv("APP_RELOAD", "0") not in {"0", "false", "False", "FALSE"},
         help="Habilita recarregamento automático (somente para desenvolvimento).",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("APP_WORKERS", "1")),
+        help="Processos de trabalho; acima de 1 ativa o modo pré-fork de produção (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=int(os.getenv("APP_THREADS", "8")),
+        help="Threads por processo no modo pré-fork (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--max-requests",
+        type=int,
+        default=int(os.getenv("APP_MAX_REQUESTS", "0")),
+        help="Recicla cada processo após N requisições; 0 desativa (default: %(default)s)",
+    )
     return parser.parse_args()
 
 
+def _ensure_frontend(static_folder) -> None:
+    if not static_folder:
+        return
+    static_path = Path(static_folder)
+    if not static_path.exists():
+        raise FileNotFoundError(
+            f"Pasta de frontend não encontrada em '{static_path}'. Certifique-se de copiá-la junto ao executável."
+        )
+
+
 def main() -> None:
     args = parse_args()
-    app = create_app(args.env)
 
-    if getattr(app, "static_folder", None):
-        static_path = Path(app.static_folder)
-        if not static_path.exists():
-            raise FileNotFoundError(
-                f"Pasta de frontend não encontrada em '{static_path}'. Certifique-se de copiá-la junto ao executável."
-            )
+    if args.workers > 1:
+        if args.reload:
+            raise SystemExit("--reload não é suportado com --workers maior que 1.")
+        _ensure_frontend(FRONTEND_DIR)
+        serve(
+            partial(create_app, args.env),
+            args.host,
+            args.port,
+            workers=args.workers,
+            threads=args.threads,
+            max_requests=args.max_requests,
+        )
+        return
+
+    app = create_app(args.env)
+    _ensure_frontend(getattr(app, "static_folder", None))
 
     run_simple(
         hostname=args.host,
@@ -46,8 +86,10 @@ def main() -> None:
         application=app,
         use_reloader=args.reload,
         use_debugger=bool(app.config.get("DEBUG", False)),
+        request_handler=StreamingRequestHandler,
     )
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,192 @@
+"""Maintenance commands for the Martins integration backend."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+from app import FRONTEND_DIR, create_app
+from app.database import session_scope
+from app.services.archive import ARCHIVE_TARGETS, archive_counts, archive_records
+from app.services.assets import vendor_external
+from app.services.importer import IMPORT_CHUNK_SIZE, IMPORT_TARGETS, ImportReport, import_path
+from app.services.journal import maintain_journal
+from app.services.rollups import rebuild_rollups
+from app.services.versioning import INTEGRATION_SCOPE, OCCURRENCE_SCOPE, bump_version
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Comandos de manutenção do backend do painel de integração.")
+    parser.add_argument(
+        "--env",
+        default=os.getenv("APP_ENV"),
+        help="Nome da configuração carregada (development, production, etc.).",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    importer = commands.add_parser("import", help="Importa uma planilha (.xlsx) ou CSV exportado anteriormente.")
+    importer.add_argument("dataset", choices=sorted(IMPORT_TARGETS), help="Conjunto de dados de destino.")
+    importer.add_argument("path", type=Path, help="Arquivo a importar.")
+    importer.add_argument(
+        "--chunk-size",
+        type=int,
+        default=IMPORT_CHUNK_SIZE,
+        help="Linhas gravadas por transação (default: %(default)s)",
+    )
+
+    commands.add_parser(
+        "vendor",
+        help="Baixa React/ReactDOM e demais arquivos de CDN do index.html para frontend/vendor (requer internet).",
+    )
+
+    commands.add_parser(
+        "rebuild-rollups",
+        help="Recalcula as tabelas de resumo diário a partir dos registros.",
+    )
+
+    archiver = commands.add_parser(
+        "archive",
+        help="Move registros antigos para o banco de arquivo (ARCHIVE_DATABASE_PATH).",
+    )
+    archiver.add_argument(
+        "--days",
+        type=int,
+        default=None,
+        help="Idade mínima, em dias, dos registros movidos (default: ARCHIVE_AFTER_DAYS).",
+    )
+    archiver.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Registros movidos por transação (default: ARCHIVE_BATCH_SIZE).",
+    )
+    archiver.add_argument(
+        "--dataset",
+        choices=sorted(ARCHIVE_TARGETS),
+        action="append",
+        help="Restringe a um conjunto de dados; pode ser repetido (default: todos).",
+    )
+
+    journal = commands.add_parser(
+        "compact-changes",
+        help="Compacta e descarta entradas antigas do diário de alterações (/api/changes).",
+    )
+    journal.add_argument(
+        "--retention-days",
+        type=int,
+        default=None,
+        help="Descarta entradas mais antigas que N dias; 0 desativa (default: CHANGES_RETENTION_DAYS).",
+    )
+    journal.add_argument(
+        "--compact-after-hours",
+        type=int,
+        default=None,
+        help="Mantém só a última entrada por registro após N horas; 0 desativa (default: CHANGES_COMPACT_AFTER_HOURS).",
+    )
+    return parser.parse_args()
+
+
+def _print_progress(report: ImportReport) -> None:
+    print(
+        f"\rLidas: {report.rows_read}  Inseridas: {report.inserted}  "
+        f"Duplicadas: {report.duplicates}  Com erro: {report.failed}",
+        end="",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def run_import(args: argparse.Namespace) -> int:
+    if not args.path.is_file():
+        print(f"Arquivo não encontrado: {args.path}", file=sys.stderr)
+        return 1
+
+    try:
+        report = import_path(args.dataset, args.path, chunk_size=max(args.chunk_size, 1), progress=_print_progress)
+    except ValueError as error:
+        print(str(error), file=sys.stderr)
+        return 1
+
+    print(file=sys.stderr)
+    print(json.dumps(report.to_dict(), ensure_ascii=False, indent=2))
+    return 0 if not report.failed else 2
+
+
+def run_vendor(args: argparse.Namespace) -> int:
+    try:
+        saved = vendor_external(FRONTEND_DIR, log=lambda message: print(message, file=sys.stderr))
+    except OSError as error:
+        print(f"Falha ao baixar arquivos: {error}", file=sys.stderr)
+        return 1
+
+    for path in saved:
+        print(path)
+    return 0
+
+
+def run_rebuild_rollups(args: argparse.Namespace) -> int:
+    with session_scope() as session:
+        written = rebuild_rollups(session.connection())
+        bump_version(session, INTEGRATION_SCOPE)
+        bump_version(session, OCCURRENCE_SCOPE)
+
+    print(json.dumps(written, ensure_ascii=False, indent=2))
+    return 0
+
+
+def run_archive(args: argparse.Namespace, config) -> int:
+    days = args.days if args.days is not None else int(config.get("ARCHIVE_AFTER_DAYS", 180))
+    batch_size = args.batch_size if args.batch_size is not None else int(config.get("ARCHIVE_BATCH_SIZE", 1000))
+
+    def progress(name: str, moved: int) -> None:
+        print(f"\r{name}: {moved} registros arquivados", end="", file=sys.stderr, flush=True)
+
+    try:
+        moved = archive_records(days, batch_size, targets=args.dataset, progress=progress)
+    except ValueError as error:
+        print(str(error), file=sys.stderr)
+        return 1
+
+    print(file=sys.stderr)
+    print(json.dumps({"days": days, "moved": moved, "rows": archive_counts()}, ensure_ascii=False, indent=2))
+    return 0
+
+
+def run_compact_changes(args: argparse.Namespace, config) -> int:
+    retention_days = args.retention_days
+    if retention_days is None:
+        retention_days = int(config.get("CHANGES_RETENTION_DAYS", 30))
+    compact_after_hours = args.compact_after_hours
+    if compact_after_hours is None:
+        compact_after_hours = int(config.get("CHANGES_COMPACT_AFTER_HOURS", 24))
+
+    with session_scope() as session:
+        result = maintain_journal(session, retention_days, compact_after_hours)
+
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0
+
+
+def main() -> int:
+    args = parse_args()
+    if args.command == "vendor":
+        return run_vendor(args)
+
+    app = create_app(args.env)
+
+    if args.command == "import":
+        return run_import(args)
+    if args.command == "rebuild-rollups":
+        return run_rebuild_rollups(args)
+    if args.command == "archive":
+        return run_archive(args, app.config)
+    if args.command == "compact-changes":
+        return run_compact_changes(args, app.config)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""Shared fixtures: every test gets a fresh application on its own SQLite file."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_PATH", str(tmp_path / "integration.db"))
+    monkeypatch.setenv("AUDIT_LOG_FILE", "")
+    from app import create_app
+
+    return create_app("production")
+
+
+@pytest.fixture
+def integration_payload():
+    """Valid integration payloads: ``integration_payload(index, **overrides)``, matricula ``1000 + index``."""
+
+    def build(index: int = 0, **overrides) -> dict:
+        return {
+            "nome": f"Colaborador {index}",
+            "setor": "Expedição",
+            "integracao": "Sim",
+            "supervisor": "ana",
+            "turno": "1° Turno",
+            "cargo": "Operador 1",
+            "matricula": str(1000 + index),
+            "data": "2025-01-02",
+            **overrides,
+        }
+
+    return build
+
+
+@pytest.fixture
+def occurrence_payload():
+    """Valid occurrence payloads: ``occurrence_payload(index, **overrides)``, matricula ``1000 + index``."""
+
+    def build(index: int = 0, **overrides) -> dict:
+        return {
+            "nome": f"Colaborador {index}",
+            "setor": "Expedição",
+            "cargo": "Operador 1",
+            "turno": "1° Turno",
+            "supervisor": "ana",
+            "motivo": "Atraso",
+            "grau": 1,
+            "volumes": 2,
+            "matricula": str(1000 + index),
+            **overrides,
+        }
+
+    return build
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def statements(app):
+    """SQL statements sent to the database while the test runs."""
+    from sqlalchemy import event
+
+    from app.database import get_engine
+
+    executed: list = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany) -> None:
+        executed.append(statement)
+
+    engine = get_engine()
+    event.listen(engine, "before_cursor_execute", _record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", _record)
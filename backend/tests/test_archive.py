@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import select, update
+
+from app.database import session_scope
+from app.models import IntegrationRecord
+from app.services.archive import archive_records, archive_table
+from app.services.ingestion import delete_integration_record, persist_integration_batch
+
+_OLD = datetime(2020, 1, 2, 8, 0)
+
+
+def _insert(payloads: list, age: datetime | None = None) -> None:
+    with session_scope() as session:
+        results = persist_integration_batch(session, payloads)
+        if age is not None:
+            ids = [result["record_id"] for result in results]
+            session.execute(update(IntegrationRecord).where(IntegrationRecord.id.in_(ids)).values(submitted_at=age))
+
+
+def test_archive_never_reuses_ids_after_newest_row_is_deleted(app, integration_payload):
+    _insert([integration_payload(1), integration_payload(2)], age=_OLD)
+    _insert([integration_payload(3)])
+    assert archive_records(30, 100, ["integration"]) == {"integration": 2}
+
+    with session_scope() as session:
+        newest = session.execute(select(IntegrationRecord)).scalar_one()
+        delete_integration_record(session, newest)
+    _insert([integration_payload(4)], age=_OLD)
+    assert archive_records(30, 100, ["integration"]) == {"integration": 1}
+
+    cold = archive_table(IntegrationRecord)
+    with session_scope() as session:
+        hot = session.execute(select(IntegrationRecord.id)).scalars().all()
+        archived = dict(session.execute(select(cold.c.id, cold.c.matricula)).all())
+
+    assert hot == []
+    assert sorted(archived.values()) == ["1001", "1002", "1004"]
+    assert len(archived) == 3
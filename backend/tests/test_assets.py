@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import shutil
+import subprocess
+
+import pytest
+
+from app import FRONTEND_DIR
+from app.services.assets import minify_js
+
+_NODE = shutil.which("node")
+
+
+def _run(script: str) -> str:
+    return subprocess.run([_NODE, "-e", script], capture_output=True, text=True, check=True).stdout
+
+
+def test_division_after_postfix_increment_is_not_a_regex():
+    source = 'var i = 3;\nvar half = i++ / 2, path = "a///b", r = /x\\/y/g;\nconsole.log(half, path, r.source);\n'
+
+    minified = minify_js(source)
+
+    assert '"a///b"' in minified
+    assert "/x\\/y/g" in minified
+    if _NODE:
+        assert _run(minified) == _run(source)
+
+
+@pytest.mark.skipif(_NODE is None, reason="node not installed")
+@pytest.mark.parametrize(
+    "script",
+    sorted(path.name for path in FRONTEND_DIR.glob("*.js") if not path.name.endswith(".min.js")),
+)
+def test_shipped_scripts_still_parse_after_minification(script, tmp_path):
+    minified = tmp_path / script
+    minified.write_text(minify_js((FRONTEND_DIR / script).read_text(encoding="utf-8")), encoding="utf-8")
+
+    result = subprocess.run([_NODE, "--check", str(minified)], capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+
+def _changes(client, since: int, **args) -> dict:
+    response = client.get("/api/changes", query_string={"since": since, **args})
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def test_changes_after_a_cursor(client, integration_payload, occurrence_payload):
+    first = client.post("/api/integration", json=integration_payload(1)).get_json()["record_id"]
+    cursor = _changes(client, 0)["next_since"]
+
+    second = client.post("/api/integration", json=integration_payload(2)).get_json()["record_id"]
+    updated = client.put(f"/api/integration/records/{first}", json=integration_payload(1, setor="Recebimento"))
+    assert updated.status_code == 200
+    assert client.delete(f"/api/integration/records/{second}").status_code == 200
+    occurrence = client.post("/api/occurrence", json=occurrence_payload(3)).get_json()["record_id"]
+
+    page = _changes(client, cursor)
+
+    summary = [(change["dataset"], change["action"], change["record_id"]) for change in page["changes"]]
+    assert summary == [
+        ("integration", "updated", first),
+        ("integration", "deleted", second),
+        ("occurrence", "created", occurrence),
+    ]
+    assert page["changes"][0]["row"]["setor"] == "Recebimento"
+    assert page["has_more"] is False
+    assert _changes(client, page["next_since"])["changes"] == []
+    only_occurrences = _changes(client, cursor, dataset="occurrence")["changes"]
+    assert [change["record_id"] for change in only_occurrences] == [occurrence]
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import json
+import os
+from datetime import date
+
+from werkzeug.datastructures import MultiDict
+
+from app.services import export_jobs
+from app.services.export_jobs import ExportJob, ExportJobManager
+from app.services.filters import RecordFilters
+
+_JOB_ID = "0123456789abcdef0123456789abcdef"
+
+
+def _manager(directory) -> ExportJobManager:
+    return ExportJobManager(directory, workers=1, max_bytes=1 << 20, max_files=8)
+
+
+def _state(directory, **values) -> None:
+    document = {
+        "job_id": _JOB_ID,
+        "dataset": "occurrence",
+        "format": "csv",
+        "status": "running",
+        "created_at": "2025-01-02T08:00:00+00:00",
+        **values,
+    }
+    (directory / f"{_JOB_ID}.job.json").write_text(json.dumps(document), encoding="utf-8")
+
+
+def test_job_ids_that_are_not_hashes_are_rejected(app, tmp_path):
+    (tmp_path / f"{_JOB_ID}.csv").write_text("ID\n1\n", encoding="utf-8")
+    manager = _manager(tmp_path)
+
+    assert manager.get(_JOB_ID) is not None
+    assert manager.get("*") is None
+    assert manager.get("0123?56789abcdef0123456789abcdef") is None
+
+
+def test_restored_job_keeps_ranges_and_dates(app, tmp_path):
+    args = MultiDict([("setor", "Expedição"), ("grau_min", "2"), ("grau_max", "4"), ("created_at_from", "2025-01-01")])
+    filters = export_jobs._DATASETS["occurrence"].filters.parse(args)
+    job = ExportJob(_JOB_ID, "occurrence", "csv", "", "created_at", "desc", tmp_path / f"{_JOB_ID}.csv", filters)
+    _manager(tmp_path)._save_state(job)
+
+    restored = _manager(tmp_path).get(_JOB_ID)
+
+    assert restored.filters == filters
+    assert restored.filters == RecordFilters(
+        (("setor", ("Expedição",)),), (("grau", 2, 4), ("created_at", date(2025, 1, 1), None))
+    )
+
+
+def test_unfinished_job_without_heartbeat_reads_as_failed(app, tmp_path, monkeypatch):
+    monkeypatch.setattr(export_jobs, "_CAN_PROBE_PIDS", False)
+    _state(tmp_path, pid=os.getpid() + 1)
+
+    assert _manager(tmp_path).get(_JOB_ID).status == "running"
+
+    stale = os.path.getmtime(tmp_path / f"{_JOB_ID}.job.json") - export_jobs._STALE_AFTER_SECONDS - 1
+    os.utime(tmp_path / f"{_JOB_ID}.job.json", (stale, stale))
+
+    assert _manager(tmp_path).get(_JOB_ID).status == "failed"
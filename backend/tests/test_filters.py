@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from app.database import session_scope
+from app.services.ingestion import persist_integration_batch
+
+
+def test_supervisor_filter_matches_stored_case(client, integration_payload):
+    with session_scope() as session:
+        persist_integration_batch(
+            session,
+            [
+                integration_payload(0, supervisor="ana"),
+                integration_payload(1, supervisor="joao"),
+                integration_payload(2, supervisor="João Silva"),
+            ],
+        )
+
+    response = client.get("/api/integration/records?supervisor=%20joao%20&supervisor=jo%C3%A3o%20silva")
+
+    assert response.status_code == 200
+    assert sorted(item["matricula"] for item in response.get_json()["items"]) == ["1001", "1002"]
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+
+import pytest
+
+from app.services import group_commit
+from app.services.group_commit import GroupCommitter, GroupCommitTimeout
+from app.services.ingestion import persist_integration
+
+
+def _submit_together(committer: GroupCommitter, persist, payloads) -> list:
+    outcomes: list = [None] * len(payloads)
+
+    def submit(index: int) -> None:
+        try:
+            outcomes[index] = committer.submit(persist, payloads[index])
+        except Exception as error:
+            outcomes[index] = error
+
+    threads = [threading.Thread(target=submit, args=(index,)) for index in range(len(payloads))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return outcomes
+
+
+def test_group_is_one_transaction(app, tmp_path, integration_payload):
+    committer = GroupCommitter(window_ms=2000, max_batch=4)
+    visible = []
+
+    def persist(session, payload):
+        record = persist_integration(session, payload)
+        with sqlite3.connect(tmp_path / "integration.db") as other:
+            visible.append(other.execute("SELECT COUNT(*) FROM integration_records").fetchone()[0])
+        return record.id
+
+    outcomes = _submit_together(committer, persist, [integration_payload(index) for index in range(4)])
+
+    assert sorted(outcomes) == [1, 2, 3, 4]
+    assert visible == [0, 0, 0, 0]
+    assert committer.stats()["batches"] == 1
+
+
+def test_failed_item_only_fails_its_caller(app, tmp_path, integration_payload):
+    committer = GroupCommitter(window_ms=2000, max_batch=3)
+    payloads = [integration_payload(0), {**integration_payload(1), "nome": ""}, integration_payload(2)]
+
+    outcomes = _submit_together(committer, persist_integration, payloads)
+
+    assert isinstance(outcomes[1], ValueError)
+    with sqlite3.connect(tmp_path / "integration.db") as other:
+        stored = {row[0] for row in other.execute("SELECT matricula FROM integration_records")}
+    assert stored == {"1000", "1002"}
+
+
+def test_timed_out_write_is_dropped(app, monkeypatch, integration_payload):
+    monkeypatch.setattr(group_commit, "_SUBMIT_TIMEOUT_SECONDS", 0.2)
+    committer = GroupCommitter(window_ms=0, max_batch=1)
+    release = threading.Event()
+    persisted = []
+
+    def slow(session, payload):
+        release.wait(5)
+        persisted.append(payload["matricula"])
+
+    def persist(session, payload):
+        persisted.append(payload["matricula"])
+
+    first = threading.Thread(target=committer.submit, args=(slow, integration_payload(0)))
+    first.start()
+    with pytest.raises(GroupCommitTimeout):
+        committer.submit(persist, integration_payload(1))
+    release.set()
+    first.join()
+    committer.submit(persist, integration_payload(2))
+
+    assert persisted == ["1000", "1002"]
+
+
+@pytest.mark.parametrize("url", ["/api/integration", "/api/occurrence"])
+def test_submit_timeout_is_503(client, monkeypatch, url, integration_payload):
+    class Busy:
+        def submit(self, persist, payload):
+            raise GroupCommitTimeout("Gravação não iniciada no prazo.")
+
+    module = "integration" if url.endswith("integration") else "occurrence"
+    monkeypatch.setattr(f"app.routes.{module}.get_committer", lambda: Busy())
+
+    response = client.post(url, json=integration_payload(0))
+
+    assert response.status_code == 503
+    assert "error" in response.get_json()
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+
+def test_if_none_match_answers_304_until_the_next_write(client, integration_payload):
+    assert client.post("/api/integration", json=integration_payload(1)).status_code == 202
+    first = client.get("/api/integration/records")
+    etag = first.headers["ETag"]
+
+    repeat = client.get("/api/integration/records", headers={"If-None-Match": etag})
+    assert repeat.status_code == 304
+    assert repeat.headers["ETag"] == etag
+    assert repeat.get_data() == b""
+
+    assert client.post("/api/integration", json=integration_payload(2)).status_code == 202
+    changed = client.get("/api/integration/records", headers={"If-None-Match": etag})
+
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert len(changed.get_json()["items"]) == 2
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import io
+
+from sqlalchemy import select
+
+from app.database import session_scope
+from app.models import IntegrationRecord
+from app.services.importer import import_file
+
+_HEADER = "Matrícula;Colaborador;Setor;Cargo;Turno;Integração;Supervisor;Data integração;Registrado em\n"
+
+
+def _csv(*lines: str) -> io.BytesIO:
+    return io.BytesIO((_HEADER + "".join(f"{line}\n" for line in lines)).encode("utf-8"))
+
+
+def test_reimport_without_id_is_deduplicated(app):
+    lines = (
+        "1001;Ana;Expedição;Operador 1;1° Turno;Sim;joao;02/01/2025;02/01/2025 08:15",
+        "1002;Bia;Expedição;Operador 1;1° Turno;Sim;joao;02/01/2025;02/01/2025 08:15",
+    )
+    first = import_file("integration", _csv(*lines), "historico.csv")
+    second = import_file("integration", _csv(*lines), "historico.csv")
+
+    assert (first.inserted, first.duplicates) == (2, 0)
+    assert (second.inserted, second.duplicates) == (0, 2)
+
+
+def test_reimport_of_export_without_id_column(client):
+    response = client.post(
+        "/api/integration",
+        json={
+            "nome": "Ana",
+            "setor": "Expedição",
+            "integracao": "Sim",
+            "supervisor": "joao",
+            "turno": "1° Turno",
+            "cargo": "Operador 1",
+            "matricula": "1001",
+            "data": "2025-01-02",
+        },
+    )
+    assert response.status_code == 202
+
+    exported = client.get("/api/integration/export?format=csv").get_data(as_text=True)
+    without_id = "\n".join(line.split(",", 1)[1] for line in exported.splitlines())
+    report = import_file("integration", io.BytesIO(without_id.encode("utf-8")), "export.csv")
+
+    assert (report.inserted, report.duplicates) == (0, 1)
+
+
+def test_rows_without_timestamp_are_kept(app):
+    header = "Matrícula;Colaborador;Setor;Cargo;Turno;Integração;Supervisor;Data integração\n"
+    body = "1001;Ana;Expedição;Operador 1;1° Turno;Sim;joao;02/01/2025\n" * 2
+    report = import_file("integration", io.BytesIO((header + body).encode("utf-8")), "sem_horario.csv")
+
+    assert (report.inserted, report.duplicates) == (2, 0)
+
+
+def test_same_minute_records_of_one_collaborator_are_kept(app):
+    lines = (
+        "1001;Ana;Expedição;Operador 1;1° Turno;Sim;joao;02/01/2025;02/01/2025 08:15",
+        "1001;Ana;Recebimento;Operador 1;1° Turno;Sim;joao;02/01/2025;02/01/2025 08:15",
+        "1001;Ana;Recebimento;Operador 1;1° Turno;Sim;joao;02/01/2025;02/01/2025 08:15",
+    )
+    first = import_file("integration", _csv(*lines), "lote.csv")
+    second = import_file("integration", _csv(*lines), "lote.csv")
+
+    assert (first.inserted, first.duplicates) == (3, 0)
+    assert (second.inserted, second.duplicates) == (0, 3)
+
+
+def test_colliding_id_with_other_content_is_stored_under_new_id(app):
+    header = "ID;" + _HEADER
+    stored = "1;1001;Ana;Expedição;Operador 1;1° Turno;Sim;joao;02/01/2025;02/01/2025 08:15\n"
+    other = "1;2002;Bia;Recebimento;Operador 2;2° Turno;Não;maria;03/01/2025;03/01/2025 09:00\n"
+    import_file("integration", io.BytesIO((header + stored).encode("utf-8")), "local.csv")
+
+    report = import_file("integration", io.BytesIO((header + stored + other).encode("utf-8")), "outra.csv")
+
+    assert (report.inserted, report.duplicates) == (1, 1)
+    with session_scope() as session:
+        rows = dict(session.execute(select(IntegrationRecord.id, IntegrationRecord.matricula)).all())
+    assert rows[1] == "1001"
+    assert sorted(rows.values()) == ["1001", "2002"]
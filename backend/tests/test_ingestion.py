@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import func, select
+
+from app.database import session_scope
+from app.models import IntegrationRecord
+from app.services.ingestion import bulk_insert, integration_values, persist_integration_batch
+from app.services.versioning import INTEGRATION_SCOPE
+
+
+def test_batch_insert_is_one_statement(app, statements, integration_payload):
+    with session_scope() as session:
+        results = persist_integration_batch(session, [integration_payload(index) for index in range(1200)])
+
+    inserts = [statement for statement in statements if statement.lstrip().startswith("INSERT INTO integration_records")]
+    assert len(inserts) == 1
+    assert [result["status"] for result in results] == ["created"] * 1200
+
+
+def test_batch_insert_reports_ids_in_order(app, integration_payload):
+    with session_scope() as session:
+        persist_integration_batch(session, [integration_payload(0)])
+    with session_scope() as session:
+        results = persist_integration_batch(session, [integration_payload(index) for index in range(1, 6)])
+
+    with session_scope() as session:
+        stored = dict(session.execute(select(IntegrationRecord.id, IntegrationRecord.matricula)).all())
+        total = session.execute(select(func.count()).select_from(IntegrationRecord)).scalar_one()
+
+    assert total == 6
+    assert [stored[result["record_id"]] for result in results] == [str(1000 + index) for index in range(1, 6)]
+
+
+def test_bulk_insert_rejects_mixed_explicit_ids(app, integration_payload):
+    rows = [integration_values(integration_payload(0)), {**integration_values(integration_payload(1)), "id": 50}]
+
+    with pytest.raises(ValueError):
+        with session_scope() as session:
+            bulk_insert(session, IntegrationRecord, rows, INTEGRATION_SCOPE)
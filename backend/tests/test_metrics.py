@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+_LIST = 'integration_http_request_duration_seconds_count{endpoint="integration.list_records",method="GET",status="200"}'
+_EXPORTS = 'integration_exports_total{dataset="integration",format="csv",mode="request",outcome="done"}'
+
+
+def _scrape(client) -> dict:
+    response = client.get("/api/metrics")
+    assert response.status_code == 200
+    assert response.content_type.startswith("text/plain")
+    samples = {}
+    for line in response.get_data(as_text=True).splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+def test_metrics_counters_go_up(client, integration_payload):
+    before = _scrape(client)
+
+    assert client.post("/api/integration", json=integration_payload(1)).status_code == 202
+    for _ in range(3):
+        assert client.get("/api/integration/records").status_code == 200
+    export = client.get("/api/integration/export", query_string={"format": "csv"})
+    assert export.status_code == 200
+    export.get_data()  # the export is counted once its stream ends
+
+    after = _scrape(client)
+    assert after[_LIST] - before.get(_LIST, 0) == 3
+    assert after[_EXPORTS] - before.get(_EXPORTS, 0) == 1
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from app.database import session_scope
+from app.services.ingestion import persist_integration_batch
+
+
+def _store(*payloads: dict) -> list:
+    with session_scope() as session:
+        return [result["record_id"] for result in persist_integration_batch(session, list(payloads))]
+
+
+def _page(client, cursor: str) -> dict:
+    response = client.get("/api/integration/records", query_string={"cursor": cursor, "page_size": 3})
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_cursor_pages_neither_repeat_nor_skip_across_an_insert(client, integration_payload):
+    stored = _store(*(integration_payload(index) for index in range(7)))
+
+    first = _page(client, "")
+    _store(integration_payload(99))
+    seen = [item["id"] for item in first["items"]]
+    cursor = first["pagination"]["next_cursor"]
+    while cursor:
+        page = _page(client, cursor)
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["pagination"]["next_cursor"]
+
+    assert first["pagination"]["mode"] == "cursor"
+    assert seen == sorted(stored, reverse=True)
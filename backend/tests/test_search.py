@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import pytest
+
+from app.database import session_scope
+from app.services import search
+from app.services.ingestion import persist_integration_batch
+
+
+def _store(*payloads: dict) -> None:
+    with session_scope() as session:
+        persist_integration_batch(session, list(payloads))
+
+
+def _found(client, term: str) -> list:
+    response = client.get("/api/integration/records", query_string={"search": term})
+    assert response.status_code == 200
+    return sorted(item["matricula"] for item in response.get_json()["items"])
+
+
+@pytest.mark.parametrize("indexed", [True, False])
+def test_index_and_fallback_search_the_same_columns(client, monkeypatch, integration_payload, indexed):
+    _store(integration_payload(1, observacao="treinamento extra"), integration_payload(2))
+    monkeypatch.setattr(search, "_fts_enabled", indexed)
+
+    assert _found(client, "treinamento") == ["1001"]
+
+
+def test_search_folds_accents_and_matches_prefixes(client, integration_payload):
+    _store(
+        integration_payload(1, nome="João Conceição", setor="Conferência"),
+        integration_payload(2, nome="Joana Silva", setor="Expedição"),
+        integration_payload(3, nome="Pedro Souza", setor="Recebimento"),
+    )
+    assert search.fts_enabled()
+
+    assert _found(client, "conferencia") == ["1001"]
+    assert _found(client, "CONCEIÇAO") == ["1001"]
+    assert _found(client, "jo") == ["1001", "1002"]
+    assert _found(client, "joa sil") == ["1002"]
@@ -1222,6 +1222,17 @@
         const [occurrenceOptions, setOccurrenceOptions] = React.useState(function () {
             return normalizeOccurrenceOptions(DEFAULT_OCCURRENCE_OPTIONS);
         });
+        const optionsVersionRef = React.useRef(null);
+        const withOptionsVersion = function (endpoint) {
+            return optionsVersionRef.current === null
+                ? endpoint
+                : endpoint + "?options_version=" + encodeURIComponent(optionsVersionRef.current);
+        };
+        const rememberOptionsVersion = function (version) {
+            if (version !== null && version !== undefined) {
+                optionsVersionRef.current = String(version);
+            }
+        };
         const [activeView, setActiveView] = React.useState(function () {
             const storedView = safeStorageGet(VIEW_STORAGE_KEY);
             if (storedView && VALID_VIEW_IDS.indexOf(storedView) !== -1) {
@@ -1331,9 +1342,11 @@
                 payload.id = editingId;
             }
 
-            const endpoint = isEditingIntegration
-                ? "/api/integration/records/" + encodeURIComponent(editingId)
-                : "/api/integration";
+            const endpoint = withOptionsVersion(
+                isEditingIntegration
+                    ? "/api/integration/records/" + encodeURIComponent(editingId)
+                    : "/api/integration"
+            );
             const method = isEditingIntegration ? "PUT" : "POST";
 
             console.group(isEditingIntegration ? "Integração atualizada" : "Integração submetida");
@@ -1363,6 +1376,7 @@
                     throw new Error(errorMessage);
                 }
 
+                rememberOptionsVersion(responseBody && responseBody.options_version);
                 const nextOptions = responseBody && responseBody.options
                     ? normalizeIntegrationOptions(responseBody.options)
                     : integrationOptions;
@@ -1430,9 +1444,11 @@
                 payload.id = editingId;
             }
 
-            const endpoint = isEditingOccurrence
-                ? "/api/occurrence/records/" + encodeURIComponent(editingId)
-                : "/api/occurrence";
+            const endpoint = withOptionsVersion(
+                isEditingOccurrence
+                    ? "/api/occurrence/records/" + encodeURIComponent(editingId)
+                    : "/api/occurrence"
+            );
             const method = isEditingOccurrence ? "PUT" : "POST";
 
             console.group(isEditingOccurrence ? "Ocorrência atualizada" : "Ocorrência registrada");
@@ -1464,6 +1480,7 @@
                     throw new Error(errorMessage);
                 }
 
+                rememberOptionsVersion(responseBody && responseBody.options_version);
                 const nextOptions = responseBody && responseBody.options
                     ? normalizeOccurrenceOptions(responseBody.options)
                     : occurrenceOptions;
@@ -1551,6 +1568,8 @@
                     throw new Error(errorMessage);
                 }
 
+                rememberOptionsVersion(response.headers.get("X-Config-Version"));
+
                 const nextIntegrationOptions = normalizeIntegrationOptions(snapshot.integration);
                 const nextOccurrenceOptions = normalizeOccurrenceOptions(snapshot.occurrence);
 
@@ -1599,6 +1618,8 @@
                         return;
                     }
 
+                    rememberOptionsVersion(response.headers.get("X-Config-Version"));
+
                     const nextIntegrationOptions = normalizeIntegrationOptions(snapshot.integration);
                     const nextOccurrenceOptions = normalizeOccurrenceOptions(snapshot.occurrence);
 
@@ -1867,20 +1888,8 @@
                 });
             });
 
-            const params = new URLSearchParams({
-                page: "1",
-                page_size: "200",
-                sort_by: "created_at",
-                sort_order: "desc"
-            });
-
-            const searchTerm = matriculaQuery || nomeQuery;
-            if (searchTerm) {
-                params.append("search", searchTerm);
-            }
-
-            try {
-                const response = await fetch("/api/occurrence/records?" + params.toString());
+            const fetchPage = async function (url) {
+                const response = await fetch(url);
                 const payload = await response.json().catch(function () {
                     return null;
                 });
@@ -1892,27 +1901,75 @@
                     throw new Error(message);
                 }
 
-                const items = payload && Array.isArray(payload.items) ? payload.items : [];
-                const normalizedMatricula = matriculaQuery.toLowerCase();
-                const normalizedNome = nomeQuery.toLowerCase();
-
-                const filteredItems = items.filter(function (item) {
-                    const recordMatricula = String(item.matricula || "").toLowerCase();
-                    const recordNome = String(item.nome || "").toLowerCase();
-
-                    const matchesMatricula = matriculaQuery
-                        ? recordMatricula.indexOf(normalizedMatricula) !== -1
-                        : true;
-                    const matchesNome = nomeQuery ? recordNome.indexOf(normalizedNome) !== -1 : true;
+                return payload;
+            };
 
-                    return matchesMatricula && matchesNome;
-                });
+            try {
+                let items = [];
+
+                if (matriculaQuery) {
+                    // The history endpoint filters by matricula in SQL and already
+                    // returns newest first, so every page is complete and ordered.
+                    const historyUrl =
+                        "/api/collaborators/" + encodeURIComponent(matriculaQuery) + "/history?";
+                    let page = 1;
+                    let totalPages = 1;
+
+                    do {
+                        const params = new URLSearchParams({
+                            dataset: "occurrence",
+                            include_archive: "true",
+                            page: String(page),
+                            page_size: "50"
+                        });
+                        const payload = await fetchPage(historyUrl + params.toString());
+                        const pageItems = payload && Array.isArray(payload.items) ? payload.items : [];
+                        items = items.concat(pageItems);
+                        totalPages =
+                            payload && payload.pagination
+                                ? Number(payload.pagination.total_pages) || 1
+                                : 1;
+                        page += 1;
+                    } while (page <= totalPages);
+                } else {
+                    // The search runs in SQL over the accent-folded index; follow the
+                    // cursor until every match has been read, not just the first page.
+                    let cursor = "";
+
+                    do {
+                        const params = new URLSearchParams({
+                            page_size: "50",
+                            sort_by: "created_at",
+                            sort_order: "desc",
+                            with_total: "false",
+                            search: nomeQuery,
+                            cursor: cursor
+                        });
+                        const payload = await fetchPage("/api/occurrence/records?" + params.toString());
+                        const pageItems = payload && Array.isArray(payload.items) ? payload.items : [];
+                        items = items.concat(pageItems);
+                        const pagination = payload && payload.pagination ? payload.pagination : {};
+                        cursor = pagination.has_more && pagination.next_cursor ? pagination.next_cursor : "";
+                    } while (cursor);
+                }
 
-                filteredItems.sort(function (a, b) {
-                    const timeA = new Date(a.created_at || 0).getTime();
-                    const timeB = new Date(b.created_at || 0).getTime();
-                    return timeB - timeA;
-                });
+                // The search also matches other columns; keep records whose name has
+                // every typed word, ignoring case and accents like the index does.
+                const foldText = function (value) {
+                    return String(value || "")
+                        .normalize("NFD")
+                        .replace(/[\u0300-\u036f]/g, "")
+                        .toLowerCase();
+                };
+                const nomeWords = foldText(nomeQuery).split(/\s+/).filter(Boolean);
+                const filteredItems = nomeWords.length
+                    ? items.filter(function (item) {
+                          const nome = foldText(item.nome);
+                          return nomeWords.every(function (word) {
+                              return nome.indexOf(word) !== -1;
+                          });
+                      })
+                    : items;
 
                 setOccurrenceSearchState({
                     loading: false,
@@ -83,6 +83,69 @@
         return null;
     };
 
+    const EXPORT_JOBS_ENDPOINT = "/api/exports";
+    const EXPORT_POLL_INTERVAL_MS = 800;
+
+    const EVENTS_ENDPOINT = "/api/events";
+    // Bursts of created/deleted events are folded into one reload of the page.
+    const LIVE_REFRESH_DELAY_MS = 600;
+
+    const parseChange = function (data) {
+        try {
+            return JSON.parse(data);
+        } catch (err) {
+            return null;
+        }
+    };
+
+    const wait = function (milliseconds) {
+        return new Promise(function (resolve) {
+            window.setTimeout(resolve, milliseconds);
+        });
+    };
+
+    const readExportJob = async function (response) {
+        const payload = await response.json().catch(function () {
+            return null;
+        });
+        if (!response.ok || !payload) {
+            const message = payload && payload.error ? payload.error : "Não foi possível gerar o arquivo de exportação.";
+            throw new Error(message);
+        }
+        return payload;
+    };
+
+    const resolveExportDownloadUrl = async function (definition, params) {
+        const endpoint = definition.exportEndpoint.replace(/\/$/, "");
+        if (!definition.exportDataset) {
+            return params.toString() ? endpoint + "?" + params.toString() : endpoint;
+        }
+
+        const body = { dataset: definition.exportDataset, format: "xlsx" };
+        params.forEach(function (value, key) {
+            body[key] = value;
+        });
+
+        let job = await readExportJob(
+            await fetch(EXPORT_JOBS_ENDPOINT, {
+                method: "POST",
+                headers: { "Content-Type": "application/json" },
+                body: JSON.stringify(body)
+            })
+        );
+
+        while (job.status === "queued" || job.status === "running") {
+            await wait(EXPORT_POLL_INTERVAL_MS);
+            job = await readExportJob(await fetch(job.status_url, { method: "GET" }));
+        }
+
+        if (job.status !== "done" || !job.download_url) {
+            throw new Error(job.error || "Não foi possível gerar o arquivo de exportação.");
+        }
+
+        return job.download_url;
+    };
+
     const sanitizeFilenameComponent = function (value) {
         if (!value) {
             return "";
@@ -451,6 +514,7 @@
             endpoint: "/api/integration/records",
             deleteEndpoint: "/api/integration/records",
             exportEndpoint: "/api/integration/export",
+            exportDataset: "integration",
             emptyMessage: "Nenhum registro de integração encontrado.",
             defaultSort: { field: "submitted_at", direction: "desc" },
             columns: [
@@ -524,6 +588,7 @@
             endpoint: "/api/occurrence/records",
             deleteEndpoint: "/api/occurrence/records",
             exportEndpoint: "/api/occurrence/export",
+            exportDataset: "occurrence",
             emptyMessage: "Nenhum registro de ocorrência encontrado.",
             defaultSort: { field: "created_at", direction: "desc" },
             columns: [
@@ -721,6 +786,63 @@
             [dataset]
         );
 
+        React.useEffect(
+            function () {
+                if (typeof window.EventSource !== "function") {
+                    return undefined;
+                }
+
+                const source = new window.EventSource(EVENTS_ENDPOINT + "?dataset=" + encodeURIComponent(dataset));
+                let refreshHandle = null;
+
+                const scheduleRefresh = function () {
+                    if (refreshHandle !== null) {
+                        return;
+                    }
+                    refreshHandle = window.setTimeout(function () {
+                        refreshHandle = null;
+                        setRefreshToken(function (previous) {
+                            return previous + 1;
+                        });
+                    }, LIVE_REFRESH_DELAY_MS);
+                };
+
+                source.onmessage = function (event) {
+                    const change = parseChange(event.data);
+                    if (!change || change.dataset !== dataset) {
+                        return;
+                    }
+
+                    // Edited rows are patched in place; anything that moves rows between pages reloads.
+                    if (change.action === "updated" && change.row) {
+                        setState(function (previous) {
+                            let found = false;
+                            const items = previous.items.map(function (item) {
+                                if (String(item.id) !== String(change.record_id)) {
+                                    return item;
+                                }
+                                found = true;
+                                return Object.assign({}, item, change.row);
+                            });
+                            return found ? Object.assign({}, previous, { items: items }) : previous;
+                        });
+                        return;
+                    }
+
+                    scheduleRefresh();
+                };
+                source.addEventListener("reset", scheduleRefresh);
+
+                return function () {
+                    source.close();
+                    if (refreshHandle !== null) {
+                        window.clearTimeout(refreshHandle);
+                    }
+                };
+            },
+            [dataset]
+        );
+
         React.useEffect(
             function () {
                 setPage(1);
@@ -1041,12 +1163,10 @@
                     params.set("search", debouncedSearch);
                 }
 
-                const endpoint = definition.exportEndpoint.replace(/\/$/, "");
-                const url = params.toString() ? endpoint + "?" + params.toString() : endpoint;
-
                 setExporting(true);
 
                 try {
+                    const url = await resolveExportDownloadUrl(definition, params);
                     const response = await fetch(url, { method: "GET" });
                     if (!response.ok) {
                         const errorPayload = await response.json().catch(function () {
@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
+import multiprocessing
 import os
 import sys
 import tempfile
 import threading
 import webbrowser
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 
 import tkinter as tk
@@ -15,15 +17,23 @@ from tkinter import ttk
 from werkzeug.serving import make_server
 
 from backend.app import create_app, _favicon_bytes
+from backend.app.serving import PreforkServer, StreamingRequestHandler
 
 
 class ServerController:
-    """Manage the Flask server lifecycle on a background thread."""
+    """Manage the Flask server lifecycle on a background thread.
 
-    def __init__(self, flask_app, host: str, port: int) -> None:
+    With ``workers > 1`` requests are served by a pre-forked process pool
+    instead of threads of the launcher process.
+    """
+
+    def __init__(self, flask_app, host: str, port: int, workers: int = 1, threads: int = 8, max_requests: int = 0) -> None:
         self._app = flask_app
         self._host = host
         self._port = port
+        self._workers = workers
+        self._threads = threads
+        self._max_requests = max_requests
         self._thread: threading.Thread | None = None
         self._server = None
 
@@ -34,8 +44,26 @@ class ServerController:
     def start(self) -> None:
         if self._thread and self._thread.is_alive():
             return
+        if isinstance(self._server, PreforkServer):
+            return
+
+        if self._workers > 1:
+            prefork = PreforkServer(
+                partial(create_app),
+                self._host,
+                self._port,
+                workers=self._workers,
+                threads=self._threads,
+                max_requests=self._max_requests,
+                app=self._app,
+            )
+            prefork.start()
+            self._server = prefork
+            return
 
-        server = make_server(self._host, self._port, self._app, threaded=True)
+        server = make_server(
+            self._host, self._port, self._app, threaded=True, request_handler=StreamingRequestHandler
+        )
         thread = threading.Thread(target=server.serve_forever, daemon=True)
         thread.start()
 
@@ -46,6 +74,11 @@ class ServerController:
         if self._server is None:
             return
 
+        if isinstance(self._server, PreforkServer):
+            self._server.stop()
+            self._server = None
+            return
+
         self._server.shutdown()
         if self._thread is not None:
             self._thread.join(timeout=3)
@@ -410,8 +443,11 @@ def criar_interface_servidor(
 def main() -> None:
     host = os.getenv("APP_HOST", "0.0.0.0")
     port = int(os.getenv("APP_PORT", "5000"))
+    workers = int(os.getenv("APP_WORKERS", "1"))
+    threads = int(os.getenv("APP_THREADS", "8"))
+    max_requests = int(os.getenv("APP_MAX_REQUESTS", "0"))
     app = create_app()
-    controller = ServerController(app, host, port)
+    controller = ServerController(app, host, port, workers=workers, threads=threads, max_requests=max_requests)
 
     inicio_servidor = datetime.now()
     erro_inicializacao = None
@@ -442,4 +478,5 @@ def main() -> None:
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()